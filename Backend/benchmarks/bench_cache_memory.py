@@ -0,0 +1,101 @@
+# backend/benchmarks/bench_cache_memory.py
+#
+# Bytes per cached window row: realism-enhanced window as a list of
+# dicts (previous cache) vs the whole UserEntry the cache keeps now
+# (columns + ledger + aggregates + keyset), plus the cost of turning
+# the columns back into dict rows at the API.
+#
+#   cd Backend
+#   python -m benchmarks.bench_cache_memory
+
+import gc
+import sys
+import time
+import tracemalloc
+
+from benchmarks.fake_plaid import make_transactions
+from benchmarks.results import write_results
+from engine.cleaning import clean_transaction
+from engine.ledger import Ledger
+from engine.plaid_service import (
+    ExpenseKeyset,
+    _build_entry,
+    add_behavior_realism,
+)
+from engine.user_store import store
+
+SIZES = [10_000, 100_000]
+
+
+def retained(build):
+    """(object, bytes allocated by build() and still alive)"""
+    gc.collect()
+    tracemalloc.start()
+    value = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, size
+
+
+def cached_entry(user_id, items):
+    """Everything the cache holds for one user after a fetch."""
+    entry = _build_entry(user_id, Ledger.from_items(items), "cursor")
+    store.set_keyset(entry, ExpenseKeyset.from_ledger(entry.ledger))
+    return entry
+
+
+def main(sizes=SIZES):
+
+    print(f"{'rows':>8} {'dicts B/row':>12} {'entry B/row':>12} "
+          f"{'size() B/row':>13} {'rows() ms':>10}")
+
+    results = []
+
+    for n in sizes:
+        items = [
+            (f"txn-{i}", row)
+            for i, row in enumerate(map(clean_transaction, make_transactions(n)))
+            if row is not None
+        ]
+
+        # realism output, as the cache used to hold it
+        rows, dict_bytes = retained(
+            lambda: add_behavior_realism([t for _, t in items])
+        )
+        rows.sort(key=lambda x: x["date"], reverse=True)
+
+        user_id = f"bench-{n}"
+        entry, entry_bytes = retained(lambda: cached_entry(user_id, items))
+
+        start = time.perf_counter()
+        assert entry.columns.rows() == rows
+        rows_ms = (time.perf_counter() - start) * 1000
+
+        window = len(entry.columns)
+
+        print(f"{window:>8} {dict_bytes / window:>12.0f} "
+              f"{entry_bytes / window:>12.0f} {entry.size() / window:>13.0f} "
+              f"{rows_ms:>10.1f}")
+
+        results.append({
+            "rows": window,
+            "dict_bytes_per_row": dict_bytes / window,
+            "entry_bytes_per_row": entry_bytes / window,
+            "entry_size_per_row": entry.size() / window,
+            "columns_bytes": entry.columns.nbytes(),
+            "ledger_bytes": entry.ledger.nbytes(),
+            "aggregates_bytes": entry.aggregates.nbytes(),
+            "keyset_bytes": entry.keyset.nbytes(),
+            "rows_ms": rows_ms,
+        })
+
+        store.evict(user_id)
+
+    write_results("cache_memory", results, {"sizes": sizes})
+
+    return results
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or SIZES)
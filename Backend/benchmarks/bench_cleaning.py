@@ -0,0 +1,112 @@
+# backend/benchmarks/bench_cleaning.py
+#
+# Cleaning stage per row: CPU and retained memory of the ledger,
+# compact CleanTransaction records vs the previous dict rows.
+#
+#   cd Backend
+#   python -m benchmarks.bench_cleaning
+
+import gc
+import sys
+import time
+import tracemalloc
+
+from benchmarks.fake_plaid import make_transactions
+from benchmarks.results import write_results
+from engine.cleaning import CATEGORY_MAP, clean_into
+
+SIZES = [10_000, 100_000]
+
+# previous implementation (list membership, dict rows, str(date) per row)
+DICT_ALLOWED = ["Housing", "Food", "Transport", "Shopping", "Lifestyle"]
+
+
+def clean_dict(t):
+
+    amount = t["amount"]
+
+    plaid_category = (
+        t["personal_finance_category"]["primary"]
+        if t.get("personal_finance_category")
+        else None
+    )
+
+    ui_category = CATEGORY_MAP.get(plaid_category)
+
+    if ui_category not in DICT_ALLOWED:
+        return None
+
+    merchant = t.get("merchant_name") or t.get("name")
+
+    return {
+        "date": str(t["date"]),
+        "receiver": merchant,
+        "amount": round(amount, 2),
+        "category": ui_category,
+    }
+
+
+def clean_into_dict(transactions, ledger):
+    for t in transactions:
+        row = clean_dict(t)
+        if row is not None:
+            ledger[t["transaction_id"]] = row
+
+
+def measure(clean, transactions):
+    """(ns per input row, retained bytes per ledger row)"""
+
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        clean(transactions, {})
+        best = min(best, time.perf_counter() - start)
+
+    # Plaid hands out fresh strings per row (no sharing with the input)
+    fresh = [
+        {**t, "merchant_name": (t["merchant_name"] + " ")[:-1]
+         if t["merchant_name"] else None}
+        for t in transactions
+    ]
+
+    gc.collect()
+    tracemalloc.start()
+    ledger = {}
+    clean(fresh, ledger)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return best / len(transactions) * 1e9, retained / len(ledger)
+
+
+def main(sizes=SIZES):
+
+    print(f"{'rows':>8} {'dict ns/row':>12} {'record ns/row':>14} "
+          f"{'dict B/row':>11} {'record B/row':>13}")
+
+    results = []
+
+    for n in sizes:
+        transactions = make_transactions(n)
+
+        dict_ns, dict_bytes = measure(clean_into_dict, transactions)
+        record_ns, record_bytes = measure(clean_into, transactions)
+
+        print(f"{n:>8} {dict_ns:>12.0f} {record_ns:>14.0f} "
+              f"{dict_bytes:>11.0f} {record_bytes:>13.0f}")
+
+        results.append({
+            "rows": n,
+            "dict_ns_per_row": dict_ns,
+            "record_ns_per_row": record_ns,
+            "dict_bytes_per_row": dict_bytes,
+            "record_bytes_per_row": record_bytes,
+        })
+
+    write_results("cleaning", results, {"sizes": sizes})
+
+    return results
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or SIZES)
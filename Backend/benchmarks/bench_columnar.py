@@ -0,0 +1,123 @@
+# backend/benchmarks/bench_columnar.py
+#
+# Dict-loop vs columnar aggregation (category totals, monthly trend,
+# roundups) at 10k / 100k / 1M rows.
+#
+#   cd Backend
+#   python -m benchmarks.bench_columnar
+
+import math
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+
+from engine.columnar import (
+    TransactionColumns,
+    category_totals,
+    monthly_totals,
+    roundups,
+)
+
+SIZES = [10_000, 100_000, 1_000_000]
+CATEGORIES = ["Housing", "Food", "Transport", "Shopping", "Lifestyle"]
+
+
+# -----------------------------------
+# SYNTHETIC ROWS
+# -----------------------------------
+def make_rows(n, seed=42):
+    rng = random.Random(seed)
+    start = date(2020, 1, 1)
+
+    return [
+        {
+            "date": str(start + timedelta(days=rng.randrange(2000))),
+            "receiver": "Merchant",
+            "amount": round(rng.uniform(-400, 900), 2),
+            "category": rng.choice(CATEGORIES),
+        }
+        for _ in range(n)
+    ]
+
+
+# -----------------------------------
+# PREVIOUS DICT-LOOP VERSION
+# -----------------------------------
+def loop_aggregates(transactions):
+
+    category = defaultdict(float)
+    monthly = defaultdict(float)
+    total_saved = 0
+
+    for t in transactions:
+        amount = t["amount"]
+        monthly[str(t["date"])[:7]] += amount
+
+        if amount <= 0:
+            continue
+
+        category[t["category"]] += amount
+
+        roundup = round(math.ceil(amount) - amount, 2)
+        if roundup == 0:
+            roundup = 0.01
+        total_saved += roundup
+
+    return category, monthly, total_saved
+
+
+def columnar_aggregates(cols):
+    roundup, valid = roundups(cols)
+    return category_totals(cols), monthly_totals(cols), roundup[valid].sum()
+
+
+def best_of(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+# -----------------------------------
+# MAIN
+# -----------------------------------
+def main(sizes=SIZES):
+
+    print(f"{'rows':>10} {'loop ms':>10} {'build ms':>10} "
+          f"{'columnar ms':>12} {'speedup':>8}")
+
+    results = []
+
+    for n in sizes:
+        rows = make_rows(n)
+
+        loop_s = best_of(lambda: loop_aggregates(rows))
+        build_s = best_of(lambda: TransactionColumns.from_rows(rows))
+
+        cols = TransactionColumns.from_rows(rows)
+        columnar_s = best_of(lambda: columnar_aggregates(cols))
+
+        # same numbers either way
+        loop_cat, _, _ = loop_aggregates(rows)
+        col_cat, _, _ = columnar_aggregates(cols)
+        assert all(abs(loop_cat[k] - col_cat[k]) < 1e-6 for k in loop_cat)
+
+        print(f"{n:>10} {loop_s * 1000:>10.1f} {build_s * 1000:>10.1f} "
+              f"{columnar_s * 1000:>12.2f} {loop_s / columnar_s:>7.1f}x")
+
+        results.append({
+            "rows": n,
+            "loop_ms": loop_s * 1000,
+            "build_ms": build_s * 1000,
+            "columnar_ms": columnar_s * 1000,
+        })
+
+    return results
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or SIZES)
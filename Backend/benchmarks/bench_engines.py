@@ -0,0 +1,95 @@
+# backend/benchmarks/bench_engines.py
+#
+# Micro-benchmarks of the per-request engine work on synthetic
+# transaction sets (FakePlaidApi data run through clean_transaction):
+#   add_behavior_realism, behavior_engine, microsavings_engine,
+#   predict_risk_ml
+# Engines get a fresh snapshot every call, so memoisation is not measured.
+#
+#   cd Backend
+#   python -m benchmarks.bench_engines [rows ...]
+#
+# Writes benchmarks/results/engines.json
+
+import os
+
+os.environ.setdefault("ENGINE_DEBUG", "0")
+
+import sys
+import time
+
+from benchmarks.fake_plaid import make_transactions
+from benchmarks.results import latency_summary, write_results
+from engine.behavior import behavior_engine
+from engine.cleaning import clean_transaction
+from engine.microsavings import microsavings_engine
+from engine.ml.risk_model import load_model, predict_risk_ml
+from engine.plaid_service import add_behavior_realism
+from engine.snapshot import AnalyticsSnapshot
+
+SIZES = [1_000, 10_000, 100_000]
+RUNS = 30
+RISK_CALLS = 5_000
+
+
+def timed(fn, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def cleaned_rows(n):
+    rows = (clean_transaction(t) for t in make_transactions(n))
+    return [t for t in rows if t is not None]
+
+
+def main(sizes=SIZES, runs=RUNS):
+
+    load_model()
+
+    results = []
+
+    for n in sizes:
+        cleaned = cleaned_rows(n)
+
+        enhanced = add_behavior_realism(cleaned)
+        enhanced.sort(key=lambda x: x["date"], reverse=True)
+
+        def snapshot():
+            return AnalyticsSnapshot(enhanced, "bench")
+
+        cases = {
+            "add_behavior_realism": lambda: add_behavior_realism(cleaned),
+            "behavior_engine": lambda: behavior_engine("bench", snapshot()),
+            "microsavings_engine": lambda: microsavings_engine(
+                "bench", snapshot()
+            ),
+        }
+
+        for name, fn in cases.items():
+            summary = latency_summary(timed(fn, runs))
+            results.append({"case": name, "rows": len(cleaned), **summary})
+
+    results.append({
+        "case": "predict_risk_ml",
+        "rows": 1,
+        **latency_summary(
+            timed(lambda: predict_risk_ml(22.5, 3100.0), RISK_CALLS)
+        ),
+    })
+
+    print(f"{'case':<22} {'rows':>8} {'p50 ms':>9} {'p99 ms':>9}")
+    for r in results:
+        print(f"{r['case']:<22} {r['rows']:>8} {r['p50_ms']:>9.3f} "
+              f"{r['p99_ms']:>9.3f}")
+
+    write_results("engines", results, {"sizes": sizes, "runs": runs})
+
+    return results
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or SIZES)
@@ -0,0 +1,103 @@
+# backend/benchmarks/bench_realism.py
+#
+# Realism engine throughput:
+#   array core    realism_keys + realism_arrays on ready-made columns
+#   ledger path   realism_columns(Ledger), what the fetch path runs:
+#                 keys, realism, impulse / shock rows, newest-first
+#                 TransactionColumns
+#   list path     add_behavior_realism on dict rows (batch scoring);
+#                 building a dict per output row dominates, over
+#                 a second per 1M rows
+#
+#   cd Backend
+#   python -m benchmarks.bench_realism
+
+import random
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.bench_columnar import CATEGORIES, make_rows
+from engine.cleaning import ALLOWED_CATEGORIES
+from engine.ledger import Ledger
+from engine.plaid_service import (
+    add_behavior_realism,
+    realism_arrays,
+    realism_columns,
+    realism_keys,
+)
+
+SIZES = [10_000, 100_000, 1_000_000]
+
+MERCHANTS = 500
+
+
+def make_ledger(n, seed=0):
+    """Ledger columns for `n` rows, no row objects."""
+
+    rng = np.random.default_rng(seed)
+
+    return Ledger(
+        np.char.add(b"txn-", np.arange(n).astype("S8")),
+        rng.integers(18000, 20000, n).astype(np.int32),
+        np.round(rng.uniform(-2000, 500, n), 2),
+        rng.integers(0, len(ALLOWED_CATEGORIES), n).astype(np.uint8),
+        rng.integers(0, MERCHANTS, n).astype(np.int32),
+        [f"Merchant {i}" for i in range(MERCHANTS)],
+    )
+
+
+def timed(run):
+    start = time.perf_counter()
+    value = run()
+    return value, time.perf_counter() - start
+
+
+def main(sizes=SIZES):
+
+    print(f"{'rows':>10} {'array core ms':>14} {'ledger path ms':>15} "
+          f"{'list path ms':>13}")
+
+    results = []
+
+    for n in sizes:
+        rows = make_rows(n)
+
+        rng = np.random.default_rng(0)
+        amount = np.array([t["amount"] for t in rows])
+        category = rng.integers(0, len(CATEGORIES), n)
+        day = rng.integers(18000, 20000, n)
+        merchant = rng.integers(0, 2 ** 32, n).astype(np.uint64)
+
+        _, core_s = timed(lambda: realism_arrays(
+            amount, category, CATEGORIES, realism_keys(day, amount, merchant)
+        ))
+
+        ledger = make_ledger(n)
+        columns, ledger_s = timed(lambda: realism_columns(ledger))
+
+        state = random.getstate()
+
+        first, list_s = timed(lambda: add_behavior_realism(rows))
+
+        # deterministic + global RNG untouched
+        assert add_behavior_realism(rows) == first
+        assert realism_columns(ledger).amount.tolist() == columns.amount.tolist()
+        assert random.getstate() == state
+
+        print(f"{n:>10} {core_s * 1000:>14.1f} {ledger_s * 1000:>15.1f} "
+              f"{list_s * 1000:>13.1f}")
+
+        results.append({
+            "rows": n,
+            "array_core_ms": core_s * 1000,
+            "ledger_path_ms": ledger_s * 1000,
+            "list_path_ms": list_s * 1000,
+        })
+
+    return results
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or SIZES)
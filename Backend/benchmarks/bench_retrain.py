@@ -0,0 +1,85 @@
+# backend/benchmarks/bench_retrain.py
+#
+# Retraining pipeline at growing dataset sizes: wall time, peak memory
+# and hold-out accuracy. Synthetic rows are sampled around dataset.csv.
+# Each size runs in a fresh interpreter so peak memory is per run.
+#
+#   cd Backend
+#   python -m benchmarks.bench_retrain [rows ...]
+#
+# Writes benchmarks/results/retrain.json
+
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from engine.ml import retrain
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+RESULTS_PATH = BACKEND_DIR / "benchmarks" / "results" / "retrain.json"
+
+SIZES = [10_000, 100_000, 1_000_000]
+
+PROBE = r"""
+import json, sys
+from engine.ml import retrain
+_, report = retrain.train(sys.argv[1])
+print("RESULT" + json.dumps(report))
+"""
+
+
+def make_dataset(n, path, seed=0):
+    """Resamples dataset.csv with jitter on the numeric columns."""
+
+    base = pd.read_csv(retrain.dataset_path)
+    rng = np.random.default_rng(seed)
+
+    df = base.iloc[rng.integers(0, len(base), n)].reset_index(drop=True)
+    df["monthly_savings"] += rng.normal(0, 25, n).round()
+    df["spending_score"] += rng.normal(0, 2, n).round()
+
+    df.to_csv(path, index=False)
+
+
+def run(path):
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE, str(path)],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+    ).stdout
+
+    line = next(l for l in out.splitlines() if l.startswith("RESULT"))
+    return json.loads(line[len("RESULT"):])
+
+
+def main(sizes=SIZES):
+
+    print(f"{'rows':>10} {'load s':>8} {'fit s':>8} {'wall s':>8} "
+          f"{'peak MB':>8} {'accuracy':>9}")
+
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            path = Path(tmp) / f"dataset-{n}.csv"
+            make_dataset(n, path)
+
+            report = run(path)
+            results.append(report)
+
+            print(f"{n:>10} {report['load_s']:>8.2f} {report['fit_s']:>8.2f} "
+                  f"{report['wall_s']:>8.2f} {report['peak_rss_mb'] or 0:>8.0f} "
+                  f"{report['accuracy']:>9.3f}")
+
+    retrain.write_report(results, RESULTS_PATH)
+    print("results ->", RESULTS_PATH)
+
+    return results
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or SIZES)
@@ -0,0 +1,74 @@
+# backend/benchmarks/bench_risk_model.py
+#
+# Risk model: sklearn RandomForest vs compiled lookup table,
+# single-row latency and batch throughput.
+#
+#   cd Backend
+#   python -m benchmarks.bench_risk_model
+
+import time
+
+import numpy as np
+
+from engine.ml import risk_model
+
+SINGLE_CALLS = 2_000
+BATCH_ROWS = 1_000_000
+
+
+def main():
+
+    loaded = risk_model.current_model()
+    model = loaded.model
+    compiled = loaded.compiled
+
+    if model is None or compiled is None:
+        print("Risk model not available")
+        return None
+
+    rng = np.random.default_rng(0)
+    spend = rng.uniform(0, 10_000, BATCH_ROWS)
+    rate = rng.uniform(0, 60, BATCH_ROWS)
+    X = np.column_stack([spend, rate])
+
+    # -------------------------
+    # SINGLE ROW LATENCY
+    # -------------------------
+    start = time.perf_counter()
+    for i in range(SINGLE_CALLS):
+        model.predict(np.array([[spend[i], rate[i]]]))
+    sklearn_us = (time.perf_counter() - start) / SINGLE_CALLS * 1e6
+
+    start = time.perf_counter()
+    for i in range(SINGLE_CALLS):
+        compiled.predict_one(spend[i], rate[i])
+    compiled_us = (time.perf_counter() - start) / SINGLE_CALLS * 1e6
+
+    # -------------------------
+    # BATCH THROUGHPUT
+    # -------------------------
+    start = time.perf_counter()
+    expected = model.predict(X)
+    sklearn_rows_s = BATCH_ROWS / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    got = risk_model.predict_risk_batch(rate, spend)
+    compiled_rows_s = BATCH_ROWS / (time.perf_counter() - start)
+
+    assert (got == expected).all()
+
+    print(f"single row  sklearn {sklearn_us:9.1f} us   compiled {compiled_us:7.2f} us")
+    print(f"batch       sklearn {sklearn_rows_s:9.0f} rows/s   "
+          f"compiled {compiled_rows_s:9.0f} rows/s")
+    print(f"table cells {compiled.table.size}")
+
+    return {
+        "single_sklearn_us": sklearn_us,
+        "single_compiled_us": compiled_us,
+        "batch_sklearn_rows_s": sklearn_rows_s,
+        "batch_compiled_rows_s": compiled_rows_s,
+    }
+
+
+if __name__ == "__main__":
+    main()
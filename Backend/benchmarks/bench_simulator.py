@@ -0,0 +1,52 @@
+# backend/benchmarks/bench_simulator.py
+#
+# Monte Carlo latency (uncached) per path count, budget is
+# 50 ms for 10k paths x 15 years of monthly steps.
+#
+#   cd Backend
+#   python -m benchmarks.bench_simulator
+
+import statistics
+import sys
+import time
+
+from engine import simulator
+
+SIZES = [1_000, 10_000, 50_000]
+RUNS = 7
+
+
+def main(sizes=SIZES):
+
+    print(f"{'paths':>8} {'median ms':>10} {'best ms':>8} {'cached us':>10}")
+
+    results = []
+
+    for paths in sizes:
+        timings = []
+
+        for run in range(RUNS):
+            simulator._monte_carlo.cache_clear()
+            start = time.perf_counter()
+            simulator.monte_carlo(500, paths=paths, seed=run)
+            timings.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        simulator.monte_carlo(500, paths=paths, seed=run)
+        cached_s = time.perf_counter() - start
+
+        print(f"{paths:>8} {statistics.median(timings) * 1000:>10.1f} "
+              f"{min(timings) * 1000:>8.1f} {cached_s * 1e6:>10.1f}")
+
+        results.append({
+            "paths": paths,
+            "median_ms": statistics.median(timings) * 1000,
+            "best_ms": min(timings) * 1000,
+            "cached_us": cached_s * 1e6,
+        })
+
+    return results
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or SIZES)
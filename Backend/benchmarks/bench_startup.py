@@ -0,0 +1,82 @@
+# backend/benchmarks/bench_startup.py
+#
+# Cold-start latency of the API process: time to import `main`
+# and time until the first /api/dashboard response, per warm-up mode.
+# Each run is a fresh interpreter.
+#
+#   cd Backend
+#   python -m benchmarks.bench_startup
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+RUNS = 5
+MODES = ["0", "1"]
+
+PROBE = r"""
+import asyncio, json, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+
+import httpx
+
+async def first_request():
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await main.startup()
+        ready = time.perf_counter()
+        await client.get("/api/dashboard", params={"user_id": "bench-cold-start"})
+        return ready
+
+ready = asyncio.run(first_request())
+done = time.perf_counter()
+print("RESULT" + json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "ready_ms": (ready - start) * 1000,
+    "first_response_ms": (done - start) * 1000,
+}))
+"""
+
+
+def run_once(mode):
+    env = dict(os.environ, ENGINE_WARMUP=mode, TXN_DB_PATH="")
+    out = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", PROBE],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+    line = next(l for l in out.splitlines() if l.startswith("RESULT"))
+    return json.loads(line[len("RESULT"):])
+
+
+def main(runs=RUNS):
+
+    print(f"{'warm-up':>8} {'import ms':>10} {'ready ms':>10} {'first resp ms':>14}")
+
+    results = {}
+
+    for mode in MODES:
+        samples = [run_once(mode) for _ in range(runs)]
+        median = {
+            k: statistics.median(s[k] for s in samples) for k in samples[0]
+        }
+        results[mode] = median
+
+        print(f"{mode:>8} {median['import_ms']:>10.0f} {median['ready_ms']:>10.0f} "
+              f"{median['first_response_ms']:>14.0f}")
+
+    return results
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else RUNS)
@@ -0,0 +1,198 @@
+# backend/benchmarks/fake_plaid.py
+#
+# Local stand-in for plaid_api.PlaidApi: synthetic, reproducible
+# transaction sets per access token, no network.
+#
+#   from benchmarks.fake_plaid import FakePlaidApi
+#   from engine.plaid_client import set_client
+#   set_client(FakePlaidApi(transactions_per_user=5000, latency_ms=20))
+
+import random
+import threading
+import time
+import zlib
+from datetime import date, timedelta
+
+
+# Plaid primary category -> share of transactions
+DEFAULT_MIX = {
+    "FOOD_AND_DRINK": 0.30,
+    "GENERAL_MERCHANDISE": 0.20,
+    "TRANSPORTATION": 0.15,
+    "RENT_AND_UTILITIES": 0.08,
+    "ENTERTAINMENT": 0.10,
+    "PERSONAL_CARE": 0.02,
+    "INCOME": 0.15,
+}
+
+# amount range per category (income is negative, Plaid convention)
+AMOUNT_RANGES = {
+    "FOOD_AND_DRINK": (4, 80),
+    "GENERAL_MERCHANDISE": (10, 300),
+    "TRANSPORTATION": (3, 60),
+    "RENT_AND_UTILITIES": (80, 2200),
+    "ENTERTAINMENT": (8, 120),
+    "PERSONAL_CARE": (10, 90),
+    "INCOME": (-3500, -400),
+}
+DEFAULT_RANGE = (5, 150)
+
+MERCHANTS = [
+    "Starbucks", "Uber", "Amazon", "Target", "Whole Foods", "Shell",
+    "Netflix", "Spotify", "Con Edison", "Lyft", None,
+]
+
+
+def make_transactions(n, mix=None, seed=0, days=90, today=None):
+    """`n` Plaid-shaped transactions over the last `days` days."""
+
+    mix = mix or DEFAULT_MIX
+    rng = random.Random(seed)
+    today = today or date.today()
+
+    categories = list(mix)
+    weights = list(mix.values())
+
+    transactions = []
+
+    for i, category in enumerate(rng.choices(categories, weights, k=n)):
+        low, high = AMOUNT_RANGES.get(category, DEFAULT_RANGE)
+        merchant = rng.choice(MERCHANTS)
+
+        transactions.append({
+            "transaction_id": f"txn-{seed}-{i}",
+            "amount": round(rng.uniform(low, high), 2),
+            "date": today - timedelta(days=rng.randrange(days)),
+            "personal_finance_category": {"primary": category},
+            "merchant_name": merchant,
+            "name": merchant or "POS Purchase",
+        })
+
+    return transactions
+
+
+class FakePlaidApi:
+    """
+    The subset of PlaidApi the backend calls. Each access token gets
+    its own reproducible transaction set; `latency_ms` is slept per
+    call to stand in for the network.
+
+    add / modify / remove change an item after the first pull:
+    /transactions/get returns the current set, /transactions/sync
+    replays the changes (cursor = position in the item's change log).
+    """
+
+    def __init__(self, transactions_per_user=1000, mix=None, seed=0,
+                 latency_ms=0):
+        self.transactions_per_user = transactions_per_user
+        self.mix = mix
+        self.seed = seed
+        self.latency_ms = latency_ms
+
+        self.calls = {}
+        self._items = {}
+        self._changes = {}
+        self._lock = threading.Lock()
+
+    # -------------------------------
+    # INTERNAL
+    # -------------------------------
+    def _call(self, name):
+        with self._lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+    def _item(self, access_token):
+        """(current transactions, change log); caller holds _lock"""
+
+        items = self._items.get(access_token)
+        if items is None:
+            items = self._items[access_token] = make_transactions(
+                self.transactions_per_user,
+                self.mix,
+                seed=self.seed ^ zlib.crc32(access_token.encode()),
+            )
+            self._changes[access_token] = [("added", t) for t in items]
+
+        return items, self._changes[access_token]
+
+    def transactions_for(self, access_token):
+        with self._lock:
+            return list(self._item(access_token)[0])
+
+    # -------------------------------
+    # CHANGES AFTER THE FIRST PULL
+    # -------------------------------
+    def add(self, access_token, transactions):
+        with self._lock:
+            items, changes = self._item(access_token)
+            for t in transactions:
+                items.append(t)
+                changes.append(("added", t))
+
+    def modify(self, access_token, transactions):
+        with self._lock:
+            items, changes = self._item(access_token)
+            at = {t["transaction_id"]: i for i, t in enumerate(items)}
+            for t in transactions:
+                items[at[t["transaction_id"]]] = t
+                changes.append(("modified", t))
+
+    def remove(self, access_token, transaction_ids):
+        removed = set(transaction_ids)
+        with self._lock:
+            items, changes = self._item(access_token)
+            items[:] = [t for t in items if t["transaction_id"] not in removed]
+            changes.extend(
+                ("removed", {"transaction_id": transaction_id})
+                for transaction_id in transaction_ids
+            )
+
+    # -------------------------------
+    # PLAID ENDPOINTS
+    # -------------------------------
+    def transactions_get(self, request):
+        self._call("transactions_get")
+
+        items = self.transactions_for(request["access_token"])
+
+        options = request.get("options") or {}
+        offset = options.get("offset", 0)
+        count = options.get("count", 100)
+
+        return {
+            "transactions": items[offset:offset + count],
+            "total_transactions": len(items),
+        }
+
+    def transactions_sync(self, request):
+        self._call("transactions_sync")
+
+        with self._lock:
+            changes = self._item(request["access_token"])[1]
+
+            # cursor = how many changes were already handed out
+            start = int(request.get("cursor") or 0)
+            end = min(len(changes), start + (request.get("count") or 100))
+            page = changes[start:end]
+
+        return {
+            "added": [t for kind, t in page if kind == "added"],
+            "modified": [t for kind, t in page if kind == "modified"],
+            "removed": [t for kind, t in page if kind == "removed"],
+            "has_more": end < len(changes),
+            "next_cursor": str(end),
+        }
+
+    def transactions_refresh(self, request):
+        self._call("transactions_refresh")
+        return {"request_id": "fake"}
+
+    def link_token_create(self, request):
+        self._call("link_token_create")
+        return {"link_token": "link-sandbox-fake"}
+
+    def item_public_token_exchange(self, request):
+        self._call("item_public_token_exchange")
+        return {"access_token": f"access-fake-{request['public_token']}"}
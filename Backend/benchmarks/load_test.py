@@ -0,0 +1,144 @@
+# backend/benchmarks/load_test.py
+#
+# Concurrent load against the API, in-process (ASGI transport),
+# with FakePlaidApi standing in for Plaid. Per endpoint:
+# p50 / p90 / p99 latency and throughput.
+#
+#   cd Backend
+#   python -m benchmarks.load_test
+#   python -m benchmarks.load_test --users 200 --transactions 5000 \
+#       --concurrency 64 --requests 2000 --plaid-latency-ms 50
+#
+# Writes benchmarks/results/load_test.json
+
+import os
+
+# quiet, memory-only engine (read at import time)
+os.environ.setdefault("ENGINE_DEBUG", "0")
+os.environ.setdefault("TXN_DB_PATH", "")
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from benchmarks.fake_plaid import FakePlaidApi
+from benchmarks.results import latency_summary, write_results
+
+ENDPOINTS = [
+    "/api/dashboard",
+    "/api/behavior",
+    "/api/microsavings",
+    "/api/insights",
+    "/api/transactions",
+]
+
+
+async def hammer(client, path, sessions, requests, concurrency):
+    """`requests` GETs spread over `concurrency` workers and users."""
+
+    latencies = []
+    errors = 0
+
+    async def worker(first):
+        nonlocal errors
+        for i in range(first, requests, concurrency):
+            start = time.perf_counter()
+            response = await client.get(
+                path, headers=sessions[i % len(sessions)]
+            )
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(w) for w in range(concurrency)))
+    wall = time.perf_counter() - start
+
+    return {
+        "endpoint": path,
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "wall_s": wall,
+        "throughput_rps": requests / wall,
+        **latency_summary(latencies),
+    }
+
+
+async def run(args):
+
+    import main
+    import engine.session as session
+    from engine.auth import issue_session
+    from engine.plaid_client import set_client
+
+    fake = FakePlaidApi(
+        transactions_per_user=args.transactions,
+        seed=args.seed,
+        latency_ms=args.plaid_latency_ms,
+    )
+    set_client(fake)
+
+    users = [f"load-user-{i}" for i in range(args.users)]
+    for user_id in users:
+        session.save_access_token(f"access-{user_id}", user_id)
+
+    sessions = [
+        {"Authorization": f"Bearer {issue_session(user_id)}"}
+        for user_id in users
+    ]
+
+    transport = httpx.ASGITransport(app=main.app)
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://load", timeout=None
+    ) as client:
+
+        results = []
+
+        # every user once: Plaid fetch + snapshot build
+        cold = await hammer(
+            client, "/api/dashboard", sessions, len(users), args.concurrency
+        )
+        cold["endpoint"] = "/api/dashboard (cold)"
+        results.append(cold)
+
+        for path in args.endpoints:
+            results.append(await hammer(
+                client, path, sessions, args.requests, args.concurrency
+            ))
+
+    print(f"{'endpoint':<28} {'rps':>8} {'p50 ms':>8} {'p99 ms':>8} {'err':>5}")
+    for r in results:
+        print(f"{r['endpoint']:<28} {r['throughput_rps']:>8.0f} "
+              f"{r['p50_ms']:>8.2f} {r['p99_ms']:>8.2f} {r['errors']:>5}")
+
+    results.append({"plaid_calls": dict(fake.calls)})
+
+    return results
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="API load test")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--transactions", type=int, default=1000,
+                        help="transactions per user")
+    parser.add_argument("--requests", type=int, default=1000,
+                        help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--plaid-latency-ms", type=float, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--endpoints", nargs="+", default=ENDPOINTS)
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run(args))
+    write_results("load_test", results, vars(args))
+
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# backend/benchmarks/results.py
+#
+# Machine-readable benchmark output: benchmarks/results/<name>.json,
+# with enough context to compare runs across commits.
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def latency_summary(seconds):
+    """p50 / p90 / p99 / max in ms of a list of durations in seconds."""
+
+    if not seconds:
+        return {"count": 0}
+
+    ms = np.asarray(seconds) * 1000
+
+    return {
+        "count": int(len(ms)),
+        "mean_ms": float(ms.mean()),
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p90_ms": float(np.percentile(ms, 90)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "max_ms": float(ms.max()),
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=RESULTS_DIR.parent, capture_output=True, text=True,
+            check=True,
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def write_results(name, results, params=None):
+
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    path = RESULTS_DIR / f"{name}.json"
+
+    document = {
+        "benchmark": name,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "params": params or {},
+        "results": results,
+    }
+
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2)
+
+    print("results ->", path)
+
+    return path
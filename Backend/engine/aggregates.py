@@ -0,0 +1,206 @@
+# backend/engine/aggregates.py
+
+import sys
+
+import numpy as np
+
+from engine.cleaning import ALLOWED_CATEGORIES
+from engine.columnar import month_label
+
+
+# ======================================
+# FROZEN TOTALS (one transaction-set version)
+# ======================================
+class AggregateTotals:
+    """
+    What AnalyticsSnapshot reads instead of recomputing group-bys.
+    Same meaning as the columnar functions:
+
+    category_totals = expense totals per category,
+                      first-appearance order (newest first)
+    monthly_totals  = net totals per "YYYY-MM" over all rows
+    """
+
+    __slots__ = (
+        "category_totals", "monthly_totals", "expense_total", "net_total",
+        "total_saved", "count",
+    )
+
+    def __init__(self, category_totals, monthly_totals, expense_total,
+                 net_total, total_saved, count):
+        self.category_totals = category_totals
+        self.monthly_totals = monthly_totals
+        self.expense_total = expense_total
+        self.net_total = net_total
+        self.total_saved = total_saved
+        self.count = count
+
+
+# ======================================
+# MATERIALISED AGGREGATES (one user)
+# ======================================
+class TransactionAggregates:
+    """
+    Per-user totals over the windowed, realism-enhanced rows,
+    updated from changed ledger rows instead of per call.
+
+    expand(ledger) -> realism rows of those ledger rows as arrays
+    (amount, category id, day, receiver), see realism_parts. It is
+    deterministic, so a row's contribution can be recomputed from
+    the old ledger to take it back out: nothing is stored per row.
+
+    Sums are integer cents, so adding and removing rows never drifts.
+    Only the fetch path mutates this (under the user's lock);
+    readers get an AggregateTotals from totals().
+    """
+
+    __slots__ = (
+        "_expand", "start", "_category_cents", "_category_rows",
+        "_month_cents", "_month_rows", "_expense_cents", "_net_cents",
+        "_saved_cents", "_count",
+    )
+
+    def __init__(self, expand, start_day):
+        self._expand = expand
+
+        # first day inside the window (days since 1970-01-01)
+        self.start = start_day
+
+        # category id / month id -> cents and row count
+        self._category_cents = {}
+        self._category_rows = {}
+        self._month_cents = {}
+        self._month_rows = {}
+
+        self._expense_cents = 0
+        self._net_cents = 0
+        self._saved_cents = 0
+        self._count = 0
+
+    @classmethod
+    def from_ledger(cls, ledger, start_day, expand):
+        aggregates = cls(expand, start_day)
+        aggregates._add(ledger.since(start_day), 1)
+        return aggregates
+
+    def nbytes(self):
+        tables = (
+            self._category_cents, self._category_rows,
+            self._month_cents, self._month_rows,
+        )
+        return sum(
+            sys.getsizeof(t) + sum(map(sys.getsizeof, t.values()))
+            for t in tables
+        )
+
+    # -------------------------------
+    # DELTAS
+    # -------------------------------
+    def apply(self, previous, upserts, deletes, start_day):
+        """
+        previous   = Ledger these totals were computed from
+        upserts    = Ledger of added / modified rows
+        deletes    = transaction_ids removed
+        start_day  = first day inside the window now
+
+        Rows of `previous` that changed, went or left the window are
+        taken out, upserts inside the window are added.
+        """
+
+        changed = np.isin(previous.ids, upserts.ids) | previous.isin(deletes)
+        counted = previous.day >= self.start
+
+        self._add(previous.select(
+            counted & (changed | (previous.day < start_day))
+        ), -1)
+
+        # window start moved back: older unchanged rows come in
+        if start_day < self.start:
+            self._add(previous.select(
+                ~changed & ~counted & (previous.day >= start_day)
+            ), 1)
+
+        self._add(upserts.since(start_day), 1)
+        self.start = start_day
+
+    def totals(self, columns):
+        """
+        Frozen totals. Category order = first appearance among the
+        expenses of `columns` (the enhanced window, newest first).
+        """
+
+        expense = columns.category[columns.amount > 0]
+        present, first_seen = np.unique(expense, return_index=True)
+        order = [
+            columns.categories[c] for c in present[np.argsort(first_seen)]
+        ]
+
+        cents = {
+            ALLOWED_CATEGORIES[c]: total
+            for c, total in self._category_cents.items()
+        }
+
+        return AggregateTotals(
+            {c: cents[c] / 100 for c in order if c in cents},
+            {
+                month_label(month): self._month_cents[month] / 100
+                for month in sorted(self._month_rows)
+            },
+            self._expense_cents / 100,
+            self._net_cents / 100,
+            self._saved_cents / 100,
+            self._count,
+        )
+
+    # -------------------------------
+    # INTERNAL
+    # -------------------------------
+    def _add(self, rows, sign):
+        """Adds (sign=1) or takes out (sign=-1) the realism rows of `rows`."""
+
+        if not len(rows):
+            return
+
+        amount, category, day, _ = self._expand(rows)
+
+        cents = np.round(amount * 100).astype(np.int64)
+        month = day.astype("datetime64[D]").astype("datetime64[M]")
+
+        self._count += sign * len(cents)
+        self._net_cents += sign * int(cents.sum())
+        _accumulate(
+            self._month_cents, self._month_rows,
+            month.astype(np.int64), cents, sign,
+        )
+
+        expense = cents > 0
+        spent = cents[expense]
+
+        # same as columnar.roundups: ceil - amount, 0 -> 0.01
+        saved = -spent % 100
+        saved[saved == 0] = 1
+
+        self._expense_cents += sign * int(spent.sum())
+        self._saved_cents += sign * int(saved.sum())
+        _accumulate(
+            self._category_cents, self._category_rows,
+            category[expense], spent, sign,
+        )
+
+
+def _accumulate(cents_by, rows_by, keys, cents, sign):
+    """Adds per-key cent sums / row counts; keys with no rows left go."""
+
+    keys, inverse, counts = np.unique(
+        keys, return_inverse=True, return_counts=True
+    )
+    sums = np.zeros(len(keys), dtype=np.int64)
+    np.add.at(sums, inverse, cents)
+
+    for key, total, rows in zip(keys.tolist(), sums.tolist(), counts.tolist()):
+        left = rows_by.get(key, 0) + sign * rows
+        if left:
+            rows_by[key] = left
+            cents_by[key] = cents_by.get(key, 0) + sign * total
+        else:
+            del rows_by[key], cents_by[key]
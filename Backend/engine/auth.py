@@ -0,0 +1,141 @@
+# backend/engine/auth.py
+#
+# Who is calling. Routes take the user id from a signed session token
+# (Authorization: Bearer <token>), never from a request parameter.
+#
+# /api/create_link_token issues the token; it is an HMAC-SHA256 over
+# (user id, expiry) keyed with SESSION_SECRET. Set SESSION_SECRET in
+# .env so every worker and restart accepts the same tokens (without
+# it a random per-process key is used).
+#
+# AUTH_DEMO_USER=0 (default): data routes need a token.
+# AUTH_DEMO_USER=1: data routes without a token act as the demo user
+# (DEFAULT_USER_ID), a single-account local setup only. Link tokens
+# always go to a new user when there is no session.
+#
+# Operator routes (bulk scoring, ...) take ADMIN_TOKEN as the bearer
+# token instead of a session; without ADMIN_TOKEN they are off.
+
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+import time
+from pathlib import Path
+from typing import Optional
+
+from dotenv import load_dotenv
+from fastapi import Header, HTTPException
+
+from engine.user_store import DEFAULT_USER_ID
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+load_dotenv(BASE_DIR / ".env")
+
+SESSION_SECRET = os.getenv("SESSION_SECRET", "")
+SESSION_TTL = float(os.getenv("SESSION_TTL_SECONDS", str(30 * 24 * 3600)))
+
+AUTH_DEMO_USER = os.getenv("AUTH_DEMO_USER", "0") == "1"
+
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+if not SESSION_SECRET:
+    print("SESSION_SECRET not set: sessions end on restart "
+          "and are not shared between workers")
+    SESSION_SECRET = secrets.token_hex(32)
+
+_key = SESSION_SECRET.encode()
+
+
+# -----------------------------------
+# SESSION TOKENS
+# "<base64url user id>.<expires>.<signature>"
+# -----------------------------------
+def _sign(payload):
+    digest = hmac.new(_key, payload.encode(), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).decode().rstrip("=")
+
+
+def issue_session(user_id, ttl=SESSION_TTL):
+    encoded = base64.urlsafe_b64encode(user_id.encode()).decode()
+    payload = f"{encoded}.{int(time.time() + ttl)}"
+    return f"{payload}.{_sign(payload)}"
+
+
+def read_session(token):
+    """User id of a valid, unexpired token, else None."""
+
+    try:
+        encoded, expires, signature = token.split(".")
+        payload = f"{encoded}.{expires}"
+
+        if not hmac.compare_digest(signature, _sign(payload)):
+            return None
+        if int(expires) < time.time():
+            return None
+
+        return base64.urlsafe_b64decode(encoded).decode()
+    except (ValueError, UnicodeError):
+        return None
+
+
+def new_user_id():
+    return f"user-{secrets.token_hex(8)}"
+
+
+# -----------------------------------
+# FASTAPI DEPENDENCIES
+# -----------------------------------
+def _unauthorized(detail):
+    return HTTPException(
+        status_code=401,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def optional_user(authorization: Optional[str] = Header(None)):
+    """
+    Caller's user id, or None when there is no token.
+    A token that is present but invalid is always a 401.
+    """
+
+    if authorization:
+        scheme, _, token = authorization.partition(" ")
+        user_id = read_session(token) if scheme.lower() == "bearer" else None
+
+        if user_id is None:
+            raise _unauthorized("Invalid or expired session")
+
+        return user_id
+
+    return None
+
+
+def current_user(authorization: Optional[str] = Header(None)):
+    """Caller's user id; 401 without a session (unless AUTH_DEMO_USER)."""
+
+    user_id = optional_user(authorization)
+
+    if user_id is None:
+        if not AUTH_DEMO_USER:
+            raise _unauthorized("Not authenticated")
+        user_id = DEFAULT_USER_ID
+
+    return user_id
+
+
+def require_admin(authorization: Optional[str] = Header(None)):
+    """Operator routes: 403 when ADMIN_TOKEN is unset, 401 without it."""
+
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin routes are disabled")
+
+    scheme, _, token = (authorization or "").partition(" ")
+
+    if scheme.lower() != "bearer" or not hmac.compare_digest(
+        token.encode(), ADMIN_TOKEN.encode()
+    ):
+        raise _unauthorized("Admin token required")
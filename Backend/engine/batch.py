@@ -0,0 +1,214 @@
+# backend/engine/batch.py
+#
+# Bulk behavior scoring for many users (nightly jobs).
+#
+# Input:  NDJSON, one user per line
+#         {"user_id": "...", "transactions": [{date, receiver, amount, category}, ...]}
+# Output: NDJSON, one /api/behavior response per line (+ "user_id"),
+#         in input order.
+#
+#   cd Backend
+#   python -m engine.batch users.ndjson -o scores.ndjson --workers 8
+#   cat users.ndjson | python -m engine.batch - > scores.ndjson
+
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import sys
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from engine.behavior import behavior_features, behavior_response
+from engine.ml.ml_controller import run_behavior_ml_batch
+from engine.plaid_service import add_behavior_realism
+from engine.snapshot import AnalyticsSnapshot
+
+
+# users per task sent to a worker (ML runs vectorised per chunk)
+CHUNK_SIZE = int(os.getenv("BATCH_CHUNK_SIZE", "256"))
+
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", str(os.cpu_count() or 1)))
+
+# largest request /api/batch/behavior accepts (the CLI has no limit)
+MAX_BATCH_USERS = int(os.getenv("BATCH_MAX_USERS", "10000"))
+MAX_BATCH_TRANSACTIONS = int(os.getenv("BATCH_MAX_TRANSACTIONS", "20000"))
+
+
+# ======================================
+# ONE CHUNK (runs inside a worker)
+# ======================================
+def score_chunk(users):
+    """
+    Same pipeline as /api/behavior for each user's transaction set,
+    with the ML step vectorised over the whole chunk.
+    """
+
+    results = [None] * len(users)
+    features = []
+    scored = []
+
+    for i, user in enumerate(users):
+
+        # one bad line must not end the stream
+        if not isinstance(user, dict):
+            results[i] = {"error": "Expected a user object"}
+            continue
+
+        try:
+            # same realism + ordering as the fetch path
+            rows = add_behavior_realism(list(user.get("transactions") or []))
+            rows.sort(key=lambda x: x["date"], reverse=True)
+
+            snapshot = AnalyticsSnapshot(rows, user.get("user_id"))
+            features.append(behavior_features(snapshot))
+            scored.append(i)
+        except Exception as e:
+            results[i] = {"user_id": user.get("user_id"), "error": str(e)}
+
+    ml_results = run_behavior_ml_batch(
+        [f["monthly_spend"] for f in features],
+        [f["spending_score"] for f in features],
+        [f["monthly_trend"] for f in features],
+    )
+
+    for i, f, ml_result in zip(scored, features, ml_results):
+        results[i] = {
+            "user_id": users[i].get("user_id"),
+            **behavior_response(f, ml_result),
+        }
+
+    return results
+
+
+def _worker_init():
+    # engine prints (model loads, debug) must not mix into NDJSON on stdout
+    sys.stdout = sys.stderr
+
+
+# ======================================
+# MANY USERS (process pool, streamed)
+# ======================================
+def _chunks(users, size):
+    chunk = []
+    for user in users:
+        chunk.append(user)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def score_users(users, workers=BATCH_WORKERS, chunk_size=CHUNK_SIZE,
+                executor=None):
+    """
+    Yields one result per user, in input order.
+
+    `users` may be any iterable (e.g. a file read line by line);
+    at most 2 chunks per worker are in flight, so memory stays
+    bounded however many users there are.
+    """
+
+    chunks = _chunks(users, chunk_size)
+
+    if executor is None and workers <= 1:
+        for chunk in chunks:
+            yield from score_chunk(chunk)
+        return
+
+    own_pool = executor is None
+    if own_pool:
+        executor = ProcessPoolExecutor(
+            max_workers=workers, initializer=_worker_init
+        )
+
+    try:
+        pending = deque()
+
+        for chunk in chunks:
+            pending.append(executor.submit(score_chunk, chunk))
+
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+
+        while pending:
+            yield from pending.popleft().result()
+
+    finally:
+        if own_pool:
+            executor.shutdown(cancel_futures=True)
+
+
+# ======================================
+# SHARED POOL (API process)
+# ======================================
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """
+    Lazily started pool for the API. Spawned, not forked:
+    the server process has live threads and sockets.
+    """
+
+    global _pool
+
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(
+                    max_workers=BATCH_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_worker_init,
+                )
+
+    return _pool
+
+
+def to_ndjson(results):
+    for result in results:
+        yield json.dumps(result, default=str) + "\n"
+
+
+def read_ndjson(lines):
+    for line in lines:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+# ======================================
+# CLI
+# ======================================
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Bulk behavior scoring")
+    parser.add_argument("input", help="NDJSON file of users, - for stdin")
+    parser.add_argument("-o", "--output", help="NDJSON output (default stdout)")
+    parser.add_argument("--workers", type=int, default=BATCH_WORKERS)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == "-" else open(args.input)
+    target = open(args.output, "w") if args.output else sys.stdout
+
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            results = score_users(
+                read_ndjson(source), args.workers, args.chunk_size
+            )
+            for line in to_ndjson(results):
+                target.write(line)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+
+
+if __name__ == "__main__":
+    main()
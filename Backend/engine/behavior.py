@@ -1,50 +1,68 @@
-from collections import defaultdict
-
 from engine.ml.ml_controller import run_behavior_ml
-from engine.plaid_service import get_plaid_transactions
+from engine.snapshot import get_snapshot
+from engine.user_store import DEFAULT_USER_ID
 from engine.ml.lifestyle_model import detect_lifestyle_inflation
+from engine.metrics import DEBUG
 
 
 # ======================================
 # BEHAVIOR ENGINE (REALISTIC VERSION)
 # ======================================
-def behavior_engine():
+def behavior_engine(user_id=DEFAULT_USER_ID, snapshot=None):
+
+    if snapshot is None:
+        snapshot = get_snapshot(user_id)
+
+    return snapshot.memo("behavior", _build_behavior)
+
+
+def _build_behavior(snapshot):
+
+    features = behavior_features(snapshot)
 
     # -------------------------------
-    # FETCH TRANSACTIONS
+    # DEBUG (only with ENGINE_DEBUG=1)
     # -------------------------------
-    try:
-        transactions = get_plaid_transactions()
-    except Exception as e:
-        print("Plaid fetch error:", e)
-        transactions = []
+    if DEBUG:
+        print("\n===== ML DEBUG =====")
+        print("Transactions count:", snapshot.count)
+        print("Monthly spend:", features["monthly_spend"])
+        print("Estimated income:", features["monthly_income"])
+        print("Savings rate:", features["savings_rate"])
+        print("Spending score:", features["spending_score"])
+        print("Monthly trend:", features["monthly_trend"])
+        print("====================\n")
 
     # -------------------------------
-    # CATEGORY TOTALS (EXPENSES ONLY)
+    # RUN ML PIPELINE
     # -------------------------------
-    category_totals = defaultdict(float)
+    ml_result = run_behavior_ml(
+        features["monthly_spend"],
+        features["spending_score"],
+        features["monthly_trend"]
+    )
 
-    for t in transactions:
-        amount = t["amount"]
+    return behavior_response(features, ml_result)
 
-        # only count expenses
-        if amount <= 0:
-            continue
 
-        category_totals[t["category"]] += amount
+def behavior_features(snapshot):
+    """
+    Everything the behavior response needs before the ML step
+    (no side effects, shared with batch scoring).
+    """
 
+    # -------------------------------
+    # CATEGORY TOTALS (EXPENSES ONLY)
+    # -------------------------------
     categories = [
         {"name": k, "value": round(v, 2)}
-        for k, v in category_totals.items()
+        for k, v in snapshot.category_totals.items()
     ]
 
     # -------------------------------
     # MONTHLY SPEND (TOTAL EXPENSES)
     # -------------------------------
-    monthly_spend = round(
-        sum(t["amount"] for t in transactions if t["amount"] > 0),
-        2
-    )
+    monthly_spend = round(snapshot.expense_total, 2)
 
     # =====================================================
     # REALISTIC INCOME ESTIMATION (SANDBOX FIX)
@@ -84,15 +102,9 @@ def behavior_engine():
     # -------------------------------
     # MONTHLY TREND (MULTI MONTH)
     # -------------------------------
-    monthly_totals = defaultdict(float)
-
-    for t in transactions:
-        month = str(t["date"])[:7]  # YYYY-MM
-        monthly_totals[month] += t["amount"]
-
     monthly_trend = [
         {"month": k, "value": round(v, 2)}
-        for k, v in sorted(monthly_totals.items())
+        for k, v in sorted(snapshot.monthly_totals.items())
     ]
 
     if not monthly_trend:
@@ -105,37 +117,29 @@ def behavior_engine():
         monthly_trend
     )
 
-    # -------------------------------
-    # DEBUG
-    # -------------------------------
-    print("\n===== ML DEBUG =====")
-    print("Transactions count:", len(transactions))
-    print("Monthly spend:", monthly_spend)
-    print("Estimated income:", monthly_income)
-    print("Savings rate:", savings_rate)
-    print("Spending score:", spending_score)
-    print("Monthly trend:", monthly_trend)
-    print("====================\n")
+    return {
+        "categories": categories,
+        "monthly_spend": monthly_spend,
+        "monthly_income": monthly_income,
+        "savings_rate": savings_rate,
+        "spending_score": spending_score,
+        "monthly_trend": monthly_trend,
+        "lifestyle_inflation": lifestyle_inflation,
+    }
 
-    # -------------------------------
-    # RUN ML PIPELINE
-    # -------------------------------
-    ml_result = run_behavior_ml(
-        monthly_spend,
-        spending_score,
-        monthly_trend
-    )
+
+def behavior_response(features, ml_result):
 
     # -------------------------------
     # FINAL RESPONSE
     # -------------------------------
     return {
-        "monthly_spend": monthly_spend,
-        "savings_rate": savings_rate,
-        "lifestyle_inflation": lifestyle_inflation,
+        "monthly_spend": features["monthly_spend"],
+        "savings_rate": features["savings_rate"],
+        "lifestyle_inflation": features["lifestyle_inflation"],
         "anomalies_count": ml_result["anomalies_count"],
-        "categories": categories,
-        "monthly_trend": monthly_trend,
+        "categories": features["categories"],
+        "monthly_trend": features["monthly_trend"],
         "anomalies": ml_result["anomalies"],
         "risk_level": ml_result["risk_level"],
         "personality": ml_result["personality"],
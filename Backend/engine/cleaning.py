@@ -0,0 +1,185 @@
+# backend/engine/cleaning.py
+#
+# One cleaning stage for Plaid transactions, shared by the fetch path
+# (plaid_service), the local store (txn_db) and /api/transactions.
+#
+# Rows are compact records instead of dicts: __slots__, category as a
+# small int, date as an ordinal, and date / receiver strings interned
+# (a 90-day window has ~90 distinct dates and a few hundred merchants).
+# They still read like the old dict rows (t["date"], t.get, t.copy()),
+# so the engines downstream are unchanged.
+
+import sys
+from datetime import date
+
+
+# -----------------------------------
+# CATEGORY MAP (UI categories)
+# -----------------------------------
+CATEGORY_MAP = {
+    "FOOD_AND_DRINK": "Food",
+    "TRANSPORTATION": "Transport",
+    "TRAVEL": "Transport",
+    "GENERAL_MERCHANDISE": "Shopping",
+    "GENERAL_SERVICES": "Shopping",
+    "LOAN_PAYMENTS": "Housing",
+    "RENT_AND_UTILITIES": "Housing",
+    "TRANSFER_OUT": "Housing",
+    "PERSONAL_CARE": "Lifestyle",
+    "ENTERTAINMENT": "Lifestyle",
+}
+
+ALLOWED_CATEGORIES = (
+    "Housing",
+    "Food",
+    "Transport",
+    "Shopping",
+    "Lifestyle",
+)
+
+# UI category -> id (index into ALLOWED_CATEGORIES)
+CATEGORY_IDS = {c: i for i, c in enumerate(ALLOWED_CATEGORIES)}
+
+# Plaid primary category -> UI category id, map + filter in one lookup
+PLAID_CATEGORY_IDS = {
+    plaid: CATEGORY_IDS[ui]
+    for plaid, ui in CATEGORY_MAP.items()
+    if ui in CATEGORY_IDS
+}
+
+
+# -----------------------------------
+# INTERNED DATES
+# date (or ISO string) -> (ISO string, ordinal), shared by every row
+# of the same day
+# -----------------------------------
+_days = {}
+
+
+def _day(value):
+
+    day = _days.get(value)
+
+    if day is None:
+        iso = sys.intern(str(value))
+        day = (iso, date.fromisoformat(iso).toordinal())
+        if len(_days) > 100_000:
+            _days.clear()
+        _days[value] = _days[iso] = day
+
+    return day
+
+
+def _receiver(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+# -----------------------------------
+# CLEANED ROW
+# -----------------------------------
+class CleanTransaction:
+    """
+    One cleaned transaction. Reads like the UI row dict
+    {date, receiver, amount, category}; copy() returns that dict.
+    """
+
+    __slots__ = ("date", "ordinal", "receiver", "amount", "category_id")
+
+    KEYS = ("date", "receiver", "amount", "category")
+
+    def __init__(self, day, receiver, amount, category_id):
+        self.date, self.ordinal = _day(day)
+        self.receiver = _receiver(receiver)
+        self.amount = amount
+        self.category_id = category_id
+
+    @classmethod
+    def from_row(cls, day, receiver, amount, category):
+        """From stored columns (category by name)."""
+        return cls(day, receiver, amount, CATEGORY_IDS[category])
+
+    @property
+    def category(self):
+        return ALLOWED_CATEGORIES[self.category_id]
+
+    # -------------------------------
+    # DICT-STYLE ACCESS
+    # -------------------------------
+    def __getitem__(self, key):
+        if key == "category":
+            return ALLOWED_CATEGORIES[self.category_id]
+        if key in self.KEYS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return self.KEYS
+
+    def copy(self):
+        return {
+            "date": self.date,
+            "receiver": self.receiver,
+            "amount": self.amount,
+            "category": ALLOWED_CATEGORIES[self.category_id],
+        }
+
+    as_dict = copy
+
+    def __eq__(self, other):
+        if not isinstance(other, CleanTransaction):
+            return NotImplemented
+        return (
+            self.ordinal == other.ordinal
+            and self.amount == other.amount
+            and self.category_id == other.category_id
+            and self.receiver == other.receiver
+        )
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"CleanTransaction({self.copy()!r})"
+
+
+# -----------------------------------
+# CLEAN ONE PLAID TRANSACTION
+# -----------------------------------
+def clean_transaction(t):
+    """
+    Maps one Plaid transaction to a CleanTransaction.
+    Returns None when the category is not shown in the UI.
+    """
+
+    pfc = t.get("personal_finance_category")
+
+    category_id = PLAID_CATEGORY_IDS.get(pfc["primary"]) if pfc else None
+
+    if category_id is None:
+        return None
+
+    return CleanTransaction(
+        t["date"],
+        t.get("merchant_name") or t.get("name"),
+        round(t["amount"], 2),  # KEEP SIGN
+        category_id,
+    )
+
+
+def clean_into(transactions, ledger):
+    """
+    Cleans Plaid transactions into `ledger` (transaction_id -> row).
+    Rows outside the UI categories are dropped from the ledger.
+    """
+
+    for t in transactions:
+        row = clean_transaction(t)
+        if row is None:
+            ledger.pop(t["transaction_id"], None)
+        else:
+            ledger[t["transaction_id"]] = row
@@ -0,0 +1,250 @@
+# backend/engine/columnar.py
+
+import sys
+
+import numpy as np
+
+
+# ======================================
+# COLUMNAR TRANSACTIONS
+# ======================================
+class TransactionColumns:
+    """
+    Column-per-field form of a transaction list, built once per fetch.
+    This is what the cache keeps per user (~20 bytes per row);
+    dict rows are only rebuilt for API responses (rows / row).
+
+    amount    = float64 (sign kept, expenses > 0)
+    category  = uint8 code into `categories`
+    day       = int32 days since 1970-01-01
+    month     = int32 months since 1970-01
+    receiver  = uint16 / int32 code into `receivers` (merchant table)
+    """
+
+    __slots__ = (
+        "amount", "category", "categories", "day", "month",
+        "receiver", "receivers",
+    )
+
+    def __init__(self, amount, category, categories, day, month,
+                 receiver=None, receivers=None):
+        self.amount = amount
+        self.category = category
+        self.categories = categories
+        self.day = day
+        self.month = month
+        self.receiver = receiver
+        self.receivers = receivers
+
+    def __len__(self):
+        return len(self.amount)
+
+    def nbytes(self):
+        arrays = (self.amount, self.category, self.day, self.month, self.receiver)
+        return (
+            sum(a.nbytes for a in arrays if a is not None)
+            + table_nbytes(self.categories)
+            + table_nbytes(self.receivers or [])
+        )
+
+    @classmethod
+    def from_rows(cls, transactions):
+
+        n = len(transactions)
+
+        amount = np.fromiter(
+            (t["amount"] for t in transactions), dtype=np.float64, count=n
+        )
+
+        # category codes in first-seen order
+        codes = {}
+        category = np.fromiter(
+            (codes.setdefault(t["category"], len(codes)) for t in transactions),
+            dtype=np.uint8,
+            count=n,
+        )
+
+        # merchant table, also in first-seen order
+        names = {}
+        receiver = np.fromiter(
+            (names.setdefault(t["receiver"], len(names)) for t in transactions),
+            dtype=np.int32,
+            count=n,
+        )
+        if len(names) <= np.iinfo(np.uint16).max:
+            receiver = receiver.astype(np.uint16)
+
+        # ISO dates parse in one vectorised call
+        dates = np.array([t["date"] for t in transactions], dtype="datetime64[D]")
+
+        day = dates.astype(np.int32)
+        month = dates.astype("datetime64[M]").astype(np.int32)
+
+        return cls(
+            amount, category, list(codes), day, month, receiver, list(names)
+        )
+
+    @classmethod
+    def from_codes(cls, amount, category, categories, day, receiver, receivers):
+        """
+        From code arrays into larger tables (e.g. a Ledger's). The
+        tables are cut down to the values used, in first-seen order,
+        so the result is the same as from_rows on the same rows.
+        """
+
+        category, categories = _first_seen(category, categories)
+        receiver, receivers = _first_seen(receiver, receivers)
+
+        if len(receivers) <= np.iinfo(np.uint16).max:
+            receiver = receiver.astype(np.uint16)
+
+        dates = day.astype("datetime64[D]")
+
+        return cls(
+            amount,
+            category.astype(np.uint8),
+            categories,
+            dates.astype(np.int32),
+            dates.astype("datetime64[M]").astype(np.int32),
+            receiver,
+            receivers,
+        )
+
+    # -------------------------------
+    # BACK TO UI ROWS (API boundary)
+    # -------------------------------
+    def rows(self, index=None):
+        """
+        {date, receiver, amount, category} dicts, for all rows
+        or the row numbers in `index`, in that order.
+        """
+
+        if index is None:
+            index = np.arange(len(self))
+
+        index = np.asarray(index, dtype=np.intp)
+
+        dates = iso_dates(self.day[index])
+        receivers = self.receivers
+        categories = self.categories
+
+        return [
+            {
+                "date": d,
+                "receiver": receivers[r],
+                "amount": a,
+                "category": categories[c],
+            }
+            for d, r, a, c in zip(
+                dates,
+                self.receiver[index].tolist(),
+                self.amount[index].tolist(),
+                self.category[index].tolist(),
+            )
+        ]
+
+    def row(self, i):
+        return self.rows([i])[0]
+
+
+def _first_seen(codes, table):
+    """
+    Recodes `codes` to a table of the values they use, in order of
+    first appearance (equal values share one code, like setdefault).
+    """
+
+    if len(codes) == 0:
+        return np.empty(0, dtype=np.int32), []
+
+    used, first, inverse = np.unique(
+        codes, return_index=True, return_inverse=True
+    )
+
+    names = {}
+    recode = np.empty(len(used), dtype=np.int32)
+    for i in np.argsort(first).tolist():
+        recode[i] = names.setdefault(table[used[i]], len(names))
+
+    return recode[inverse], list(names)
+
+
+def table_nbytes(table):
+    """Bytes of a lookup table (list of names) and its entries."""
+    return sys.getsizeof(table) + sum(sys.getsizeof(v) for v in table)
+
+
+def iso_dates(days):
+    """int32 day numbers -> "YYYY-MM-DD" strings (one per distinct day)."""
+
+    if len(days) == 0:
+        return []
+
+    unique, inverse = np.unique(days, return_inverse=True)
+    labels = np.datetime_as_string(unique.astype("datetime64[D]")).tolist()
+
+    return [labels[i] for i in inverse.tolist()]
+
+
+# ======================================
+# VECTORISED GROUP-BYS
+# ======================================
+def month_label(month_id):
+    """Months since 1970-01 -> "YYYY-MM"."""
+    year, month = divmod(int(month_id), 12)
+    return f"{1970 + year:04d}-{month + 1:02d}"
+
+
+def category_totals(cols):
+    """
+    Expense totals per category, in first-appearance order
+    among expenses (same order as the dict-loop version).
+    """
+
+    expense = cols.amount > 0
+
+    codes = cols.category[expense]
+    if len(codes) == 0:
+        return {}
+
+    sums = np.bincount(
+        codes, weights=cols.amount[expense], minlength=len(cols.categories)
+    )
+
+    present, first_seen = np.unique(codes, return_index=True)
+    order = present[np.argsort(first_seen)]
+
+    return {cols.categories[c]: float(sums[c]) for c in order}
+
+
+def monthly_totals(cols):
+    """Net totals per "YYYY-MM" over ALL rows."""
+
+    if len(cols) == 0:
+        return {}
+
+    base = int(cols.month.min())
+    sums = np.bincount(cols.month - base, weights=cols.amount)
+    seen = np.bincount(cols.month - base)
+
+    return {
+        month_label(base + m): float(sums[m])
+        for m in np.flatnonzero(seen)
+    }
+
+
+def roundups(cols):
+    """
+    Roundup per row (ceil(amount) - amount) and the mask of rows
+    that count towards micro-savings (expenses, 0 < roundup <= 1).
+    """
+
+    amount = cols.amount
+
+    roundup = np.round(np.ceil(amount) - amount, 2)
+
+    # avoid 0.00 values (UI issue)
+    roundup[roundup == 0] = 0.01
+
+    valid = (amount > 0) & (roundup >= 0) & (roundup <= 1)
+
+    return roundup, valid
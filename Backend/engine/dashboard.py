@@ -1,25 +1,27 @@
-from engine.plaid_service import get_plaid_transactions
+from engine.snapshot import get_snapshot
+from engine.user_store import DEFAULT_USER_ID
 from engine.ml.risk_model import predict_risk_ml
+from engine.simulator import linear_projection
+from engine.metrics import stage
 
 
 # ======================================
 # DASHBOARD ENGINE (PRO VERSION)
 # ======================================
-def dashboard_engine():
+def dashboard_engine(user_id=DEFAULT_USER_ID, snapshot=None):
 
-    # -----------------------------
-    # FETCH TRANSACTIONS
-    # -----------------------------
-    try:
-        transactions = get_plaid_transactions()
-    except Exception as e:
-        print("Plaid fetch error:", e)
-        transactions = []
+    if snapshot is None:
+        snapshot = get_snapshot(user_id)
+
+    return snapshot.memo("dashboard", _build_dashboard)
+
+
+def _build_dashboard(snapshot):
 
     # -----------------------------
     # BASIC TOTALS
     # -----------------------------
-    monthly_expenses = sum(t["amount"] for t in transactions)
+    monthly_expenses = snapshot.net_total
 
     # realistic demo income estimation
     monthly_income = monthly_expenses * 1.15 if monthly_expenses > 0 else 0
@@ -43,10 +45,11 @@ def dashboard_engine():
     # -----------------------------
     # RISK LEVEL (ML)
     # -----------------------------
-    risk_level = predict_risk_ml(
-        savings_rate,
-        monthly_expenses
-    )
+    with stage("ml_inference"):
+        risk_level = predict_risk_ml(
+            savings_rate,
+            monthly_expenses
+        )
 
     # -----------------------------
     # RETIREMENT SCORE (FIXED LOGIC)
@@ -89,18 +92,18 @@ def dashboard_engine():
     # -----------------------------
     # WEALTH PROJECTION
     # -----------------------------
-    projection = []
-
     base = monthly_savings * 12
 
-    for year in range(2026, 2041):
-        growth = base * (1 + 0.06 * (year - 2026))
+    years, growth = linear_projection(base, 0.06)
 
-        projection.append({
+    projection = [
+        {
             "year": year,
-            "current": round(growth * 0.75, 2),
-            "optimized": round(growth, 2)
-        })
+            "current": round(value * 0.75, 2),
+            "optimized": round(value, 2)
+        }
+        for year, value in zip(years, growth)
+    ]
 
     # -----------------------------
     # AI PRIORITY INSIGHTS (PRO)
@@ -1,6 +1,8 @@
 # backend/engine/insights.py
 
-from engine.behavior import behavior_engine
+from engine.behavior import _build_behavior
+from engine.snapshot import get_snapshot
+from engine.user_store import DEFAULT_USER_ID
 
 
 # ======================================
@@ -15,10 +17,18 @@ def add_unique(lst, text):
 # ======================================
 # INSIGHTS ENGINE (REAL DATA)
 # ======================================
-def insights_engine():
+def insights_engine(user_id=DEFAULT_USER_ID, snapshot=None):
 
-    # get behavior analysis (already ML powered)
-    behavior = behavior_engine()
+    if snapshot is None:
+        snapshot = get_snapshot(user_id)
+
+    return snapshot.memo("insights", _build_insights)
+
+
+def _build_insights(snapshot):
+
+    # get behavior analysis (already ML powered, memoised on the snapshot)
+    behavior = snapshot.memo("behavior", _build_behavior)
 
     insights = []
     behavioral_signals = []
@@ -0,0 +1,328 @@
+# backend/engine/ledger.py
+#
+# A user's cleaned ledger (every cleaned row, keyed by Plaid
+# transaction_id) as columns instead of a dict of row objects.
+#
+# Row order is the order a dict ledger would have: modified rows keep
+# their place, new rows go to the end. A Ledger is never changed in
+# place; update / drop / with_changes return a new one, so a cached
+# entry stays readable while the next version is built.
+
+from datetime import date
+
+import numpy as np
+
+from engine.cleaning import CATEGORY_IDS, CleanTransaction
+from engine.columnar import iso_dates, table_nbytes
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def day_number(iso_date):
+    """"YYYY-MM-DD" (or date) -> days since 1970-01-01."""
+    return date.fromisoformat(str(iso_date)).toordinal() - _EPOCH_ORDINAL
+
+
+def _encode(transaction_ids):
+    if not transaction_ids:
+        return np.empty(0, dtype="S1")
+    return np.array([i.encode() for i in transaction_ids], dtype=bytes)
+
+
+# ======================================
+# COLUMNAR LEDGER
+# ======================================
+class Ledger:
+    """
+    ids       = transaction_id (utf-8, fixed-width bytes)
+    day       = int32 days since 1970-01-01
+    amount    = float64 (sign kept, expenses > 0)
+    category  = uint8 id into ALLOWED_CATEGORIES
+    receiver  = int32 code into `receivers` (merchant table)
+    """
+
+    __slots__ = ("ids", "day", "amount", "category", "receiver", "receivers")
+
+    def __init__(self, ids, day, amount, category, receiver, receivers):
+        self.ids = ids
+        self.day = day
+        self.amount = amount
+        self.category = category
+        self.receiver = receiver
+        self.receivers = receivers
+
+    def __len__(self):
+        return len(self.ids)
+
+    def nbytes(self):
+        arrays = (self.ids, self.day, self.amount, self.category, self.receiver)
+        return sum(a.nbytes for a in arrays) + table_nbytes(self.receivers)
+
+    # -------------------------------
+    # BUILD
+    # -------------------------------
+    @classmethod
+    def empty(cls):
+        return cls.from_items(())
+
+    @classmethod
+    def from_items(cls, items):
+        """From (transaction_id, CleanTransaction) pairs, in that order."""
+
+        items = list(items)
+        n = len(items)
+
+        names = {}
+        receiver = np.fromiter(
+            (names.setdefault(t.receiver, len(names)) for _, t in items),
+            dtype=np.int32,
+            count=n,
+        )
+
+        return cls(
+            _encode([transaction_id for transaction_id, _ in items]),
+            np.fromiter(
+                (t.ordinal - _EPOCH_ORDINAL for _, t in items),
+                dtype=np.int32,
+                count=n,
+            ),
+            np.fromiter((t.amount for _, t in items), np.float64, count=n),
+            np.fromiter((t.category_id for _, t in items), np.uint8, count=n),
+            receiver,
+            list(names),
+        )
+
+    @classmethod
+    def from_records(cls, records):
+        """From stored (transaction_id, date, receiver, amount, category) rows."""
+
+        records = list(records)
+        if not records:
+            return cls.empty()
+
+        ids, dates, receivers, amounts, categories = zip(*records)
+
+        names = {}
+        receiver = np.fromiter(
+            (names.setdefault(r, len(names)) for r in receivers),
+            dtype=np.int32,
+            count=len(records),
+        )
+
+        return cls(
+            _encode(ids),
+            np.array(dates, dtype="datetime64[D]").astype(np.int32),
+            np.array(amounts, dtype=np.float64),
+            np.fromiter(
+                (CATEGORY_IDS[c] for c in categories),
+                dtype=np.uint8,
+                count=len(records),
+            ),
+            receiver,
+            list(names),
+        )
+
+    # -------------------------------
+    # READ
+    # -------------------------------
+    def transaction_ids(self, index=None):
+        ids = self.ids if index is None else self.ids[index]
+        return [i.decode() for i in ids.tolist()]
+
+    def rows(self, index=None):
+        """CleanTransaction per row, for all rows or the row numbers in `index`."""
+
+        if index is None:
+            index = np.arange(len(self))
+
+        index = np.asarray(index, dtype=np.intp)
+
+        receivers = self.receivers
+
+        return [
+            CleanTransaction(d, receivers[r], a, c)
+            for d, r, a, c in zip(
+                iso_dates(self.day[index]),
+                self.receiver[index].tolist(),
+                self.amount[index].tolist(),
+                self.category[index].tolist(),
+            )
+        ]
+
+    def items(self):
+        """(transaction_id, CleanTransaction) pairs, like dict.items()."""
+        return zip(self.transaction_ids(), self.rows())
+
+    def select(self, index):
+        """Rows at `index` (row numbers or mask); shares the merchant table."""
+        return Ledger(
+            self.ids[index],
+            self.day[index],
+            self.amount[index],
+            self.category[index],
+            self.receiver[index],
+            self.receivers,
+        )
+
+    def since(self, start_day):
+        return self.select(self.day >= start_day)
+
+    def before(self, start_day):
+        return self.select(self.day < start_day)
+
+    def isin(self, transaction_ids):
+        """Mask of the rows whose transaction_id is in `transaction_ids`."""
+        transaction_ids = list(transaction_ids)
+        if not transaction_ids:
+            return np.zeros(len(self), dtype=bool)
+        return np.isin(self.ids, _encode(transaction_ids))
+
+    def overlaps(self, other):
+        """True when any transaction_id of `other` is in this ledger."""
+        return bool(len(self) and np.isin(other.ids, self.ids).any())
+
+    # -------------------------------
+    # CHANGE (new Ledger every time)
+    # -------------------------------
+    def update(self, other):
+        """
+        {**self, **other}: rows of `other` replace the rows with the
+        same transaction_id in place, the rest are appended in order.
+        """
+
+        if not len(other):
+            return self
+        if not len(self):
+            return other
+
+        _, at, src = np.intersect1d(
+            self.ids, other.ids, assume_unique=True, return_indices=True
+        )
+
+        fresh = np.ones(len(other), dtype=bool)
+        fresh[src] = False
+
+        receivers, recode = _merge_tables(self.receivers, other.receivers)
+
+        def merged(mine, theirs):
+            mine = mine.astype(np.result_type(mine, theirs))
+            mine[at] = theirs[src]
+            return np.concatenate([mine, theirs[fresh]])
+
+        return Ledger(
+            merged(self.ids, other.ids),
+            merged(self.day, other.day),
+            merged(self.amount, other.amount),
+            merged(self.category, other.category),
+            merged(self.receiver, recode[other.receiver]),
+            receivers,
+        )._compacted()
+
+    def drop(self, transaction_ids):
+        mask = self.isin(transaction_ids)
+        return self.select(~mask) if mask.any() else self
+
+    def with_changes(self, changes):
+        """
+        Applies (transaction_id, row) upserts and (transaction_id, None)
+        removals in order; same result as doing it on a dict.
+        """
+
+        changes = list(changes)
+        if not changes:
+            return self
+
+        present = np.isin(
+            _encode([transaction_id for transaction_id, _ in changes]), self.ids
+        ).tolist()
+
+        deleted = set()   # rows of self that go (or move to the end)
+        replaced = {}     # rows of self that keep their place
+        appended = {}     # rows that go to the end, in order
+
+        for (transaction_id, row), known in zip(changes, present):
+            if transaction_id in appended:
+                if row is None:
+                    del appended[transaction_id]
+                else:
+                    appended[transaction_id] = row
+            elif known and transaction_id not in deleted:
+                if row is None:
+                    deleted.add(transaction_id)
+                    replaced.pop(transaction_id, None)
+                else:
+                    replaced[transaction_id] = row
+            elif row is not None:
+                appended[transaction_id] = row
+
+        return self.drop(deleted).update(
+            Ledger.from_items([*replaced.items(), *appended.items()])
+        )
+
+    def _compacted(self):
+        # the merchant table only grows on update; cut it back to the
+        # names in use once it is mostly dead weight
+        if len(self.receivers) <= 2 * len(self) + 64:
+            return self
+
+        used, receiver = np.unique(self.receiver, return_inverse=True)
+
+        return Ledger(
+            self.ids, self.day, self.amount, self.category,
+            receiver.astype(np.int32),
+            [self.receivers[r] for r in used.tolist()],
+        )
+
+
+def _merge_tables(mine, theirs):
+    """Merchant table with the names of `theirs` added, and their new codes."""
+
+    codes = {name: code for code, name in enumerate(mine)}
+    table = list(mine)
+
+    recode = []
+    for name in theirs:
+        code = codes.get(name)
+        if code is None:
+            code = codes[name] = len(table)
+            table.append(name)
+        recode.append(code)
+
+    return table, np.array(recode, dtype=np.int32)
+
+
+def diff(old, new):
+    """
+    RETURNS:
+        upserts = Ledger of the rows of `new` that are not in `old`
+                  or differ (order of `new`)
+        deletes = transaction_ids in `old` but not in `new` (order of `old`)
+    """
+
+    if not len(old):
+        return new, []
+
+    _, at_old, at_new = np.intersect1d(
+        old.ids, new.ids, assume_unique=True, return_indices=True
+    )
+
+    # same merchant = same name, whatever the codes
+    codes = {name: code for code, name in enumerate(new.receivers)}
+    recode = np.array(
+        [codes.get(name, -1) for name in old.receivers], dtype=np.int64
+    )
+
+    same = (
+        (old.day[at_old] == new.day[at_new])
+        & (old.amount[at_old] == new.amount[at_new])
+        & (old.category[at_old] == new.category[at_new])
+        & (recode[old.receiver[at_old]] == new.receiver[at_new])
+    )
+
+    changed = np.ones(len(new), dtype=bool)
+    changed[at_new[same]] = False
+
+    kept = np.zeros(len(old), dtype=bool)
+    kept[at_old] = True
+
+    return new.select(changed), old.transaction_ids(np.flatnonzero(~kept))
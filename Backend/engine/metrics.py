@@ -0,0 +1,162 @@
+# backend/engine/metrics.py
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+
+# -----------------------------------
+# DEBUG PRINTS
+# off by default, ENGINE_DEBUG=1 turns them on
+# (call sites check DEBUG before building the message)
+# -----------------------------------
+DEBUG = os.getenv("ENGINE_DEBUG", "0") == "1"
+
+
+# -----------------------------------
+# HISTOGRAMS (seconds)
+# -----------------------------------
+BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class Histogram:
+    """Cumulative-bucket histogram, Prometheus style."""
+
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        i = bisect_left(BUCKETS, seconds)
+        if i < len(BUCKETS):
+            self.counts[i] += 1
+        self.sum += seconds
+        self.count += 1
+
+
+_lock = threading.Lock()
+_histograms = {}   # (name, labels) -> Histogram
+_counters = {}     # (name, labels) -> int
+_collectors = []   # callables -> [(name, kind, labels, value)]
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+def observe(name, seconds, **labels):
+    key = _key(name, labels)
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = Histogram()
+        histogram.observe(seconds)
+
+
+def inc(name, amount=1, **labels):
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+
+def counter(name, label):
+    """{value of `label`: count} for counter `name`, read in-process."""
+    with _lock:
+        return {
+            dict(labels).get(label): value
+            for (n, labels), value in _counters.items()
+            if n == name
+        }
+
+
+@contextmanager
+def stage(name):
+    """
+    Times one hot-path stage:
+
+        with stage("realism"):
+            ...
+    """
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe("engine_stage_seconds", time.perf_counter() - start, stage=name)
+
+
+def register_collector(collect):
+    """
+    `collect()` -> iterable of (name, kind, labels dict, value), read
+    at scrape time (counters / gauges owned by other modules).
+    """
+    _collectors.append(collect)
+
+
+# -----------------------------------
+# PROMETHEUS TEXT FORMAT
+# -----------------------------------
+def _escape(value):
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\n", "\\n")
+    )
+
+
+def _labels(labels, extra=()):
+    items = [*labels, *extra]
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in items) + "}"
+
+
+def render():
+
+    with _lock:
+        histograms = {
+            key: (list(h.counts), h.sum, h.count)
+            for key, h in _histograms.items()
+        }
+        counters = dict(_counters)
+
+    lines = []
+    typed = set()
+
+    def type_line(name, kind):
+        if name not in typed:
+            typed.add(name)
+            lines.append(f"# TYPE {name} {kind}")
+
+    for (name, labels), (counts, total, count) in sorted(histograms.items()):
+        type_line(name, "histogram")
+
+        cumulative = 0
+        for bound, n in zip(BUCKETS, counts):
+            cumulative += n
+            lines.append(
+                f"{name}_bucket{_labels(labels, [('le', bound)])} {cumulative}"
+            )
+        lines.append(f"{name}_bucket{_labels(labels, [('le', '+Inf')])} {count}")
+        lines.append(f"{name}_sum{_labels(labels)} {total}")
+        lines.append(f"{name}_count{_labels(labels)} {count}")
+
+    for (name, labels), value in sorted(counters.items()):
+        type_line(name, "counter")
+        lines.append(f"{name}{_labels(labels)} {value}")
+
+    for collect in _collectors:
+        for name, kind, labels, value in collect():
+            type_line(name, kind)
+            lines.append(f"{name}{_labels(sorted(labels.items()))} {value}")
+
+    return "\n".join(lines) + "\n"
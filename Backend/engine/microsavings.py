@@ -1,74 +1,40 @@
-from datetime import datetime
-import math
-
-from engine.plaid_service import get_plaid_transactions
+from engine.snapshot import get_snapshot
+from engine.user_store import DEFAULT_USER_ID
+from engine.simulator import linear_projection
 
 
 # ======================================
 # MICRO SAVINGS ENGINE (REAL VERSION)
 # ======================================
-def microsavings_engine():
-
-    try:
-        transactions = get_plaid_transactions()
-    except Exception as e:
-        print("Plaid fetch error:", e)
-        transactions = []
-
-    roundups = []
-    total_saved = 0
-
-    # ----------------------------------
-    # CALCULATE ROUNDUPS (FIXED)
-    # ----------------------------------
-    for t in transactions:
-
-        amount = float(t["amount"])
-
-        # expenses only
-        if amount <= 0:
-            continue
+def microsavings_engine(user_id=DEFAULT_USER_ID, snapshot=None):
 
-        # proper roundup calculation
-        roundup = round(math.ceil(amount) - amount, 2)
+    if snapshot is None:
+        snapshot = get_snapshot(user_id)
 
-        # avoid 0.00 values (UI issue)
-        if roundup == 0:
-            roundup = 0.01
+    return snapshot.memo("microsavings", _build_microsavings)
 
-        # safety filter
-        if roundup < 0 or roundup > 1:
-            continue
 
-        total_saved += roundup
+def _build_microsavings(snapshot):
 
-        roundups.append({
-            "date": t["date"],
-            "merchant": t["receiver"],
-            "amount": round(amount, 2),
-            "roundup": roundup
-        })
-
-    # newest first
-    roundups.sort(key=lambda x: x["date"], reverse=True)
+    # roundups are computed once in the snapshot
+    total_saved = snapshot.total_saved
 
     # recent list (UI)
-    recent_roundups = roundups[:8]
+    recent_roundups = snapshot.recent_roundups(8)
 
     # ----------------------------------
     # SIMPLE PROJECTION
     # ----------------------------------
     monthly_auto = round(total_saved * 4, 2)
 
-    projection = []
     base = monthly_auto * 12
 
-    for year in range(2026, 2041):
-        growth = base * (1 + 0.07 * (year - 2026))
-        projection.append({
-            "year": year,
-            "value": round(growth, 2)
-        })
+    years, growth = linear_projection(base, 0.07)
+
+    projection = [
+        {"year": year, "value": round(value, 2)}
+        for year, value in zip(years, growth)
+    ]
 
     # ----------------------------------
     # FINAL RESPONSE
@@ -1,3 +1,11 @@
+import math
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
 # ==========================================
 # ANOMALY DETECTION MODEL
 # ==========================================
@@ -62,4 +70,219 @@ def detect_spending_anomalies_ml(monthly_trend):
     # --------------------------------------
     # RETURN RESULT
     # --------------------------------------
-    return anomalies, len(anomalies)
\ No newline at end of file
+    return anomalies, len(anomalies)
+
+def detect_spending_anomalies_batch(monthly_trends):
+    """
+    detect_spending_anomalies_ml over many users at once.
+    The spike test runs on one flat array of all users' months.
+
+    RETURNS:
+        list of (anomalies, anomalies_count), one per trend
+    """
+
+    lengths = np.fromiter(
+        (len(trend) for trend in monthly_trends), dtype=np.int64,
+        count=len(monthly_trends),
+    )
+
+    values = np.fromiter(
+        (m["value"] for trend in monthly_trends for m in trend),
+        dtype=np.float64,
+        count=int(lengths.sum()),
+    )
+
+    # same summation as the per-user model
+    avg = np.array(
+        [
+            sum(m["value"] for m in trend) / len(trend) if trend else 0.0
+            for trend in monthly_trends
+        ],
+        dtype=np.float64,
+    )
+
+    owner = np.repeat(np.arange(len(monthly_trends)), lengths)
+    usable = (lengths >= 2) & (avg != 0)
+
+    spike = usable[owner] & (values > avg[owner] * 1.3)
+
+    results = [([], 0) for _ in monthly_trends]
+
+    # only flagged months need the row dict
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+
+    for i in np.flatnonzero(spike):
+        user = owner[i]
+        item = monthly_trends[user][i - offsets[user]]
+        mean = float(avg[user])
+
+        percent = round(((item["value"] - mean) / mean) * 100, 1)
+        impact = f"+{percent}%" if percent > 0 else f"{percent}%"
+
+        results[user][0].append({
+            "month": item["month"],
+            "value": item["value"],
+            "impact": impact,
+            "type": "spike"
+        })
+
+    return [(anomalies, len(anomalies)) for anomalies, _ in results]
+
+
+# ==========================================
+# STREAMING ANOMALY DETECTION
+# (transaction granularity, online)
+# ==========================================
+# weight of the newest transaction in the running mean / variance
+EW_ALPHA = float(os.getenv("ANOMALY_EW_ALPHA", "0.1"))
+
+# flag when amount is this many std devs above the running mean ...
+Z_THRESHOLD = float(os.getenv("ANOMALY_Z_THRESHOLD", "3"))
+
+# ... and at least 30% above it (same rule as the monthly model)
+MIN_RATIO = 1.3
+
+# transactions seen in a category before it can flag anything
+WARMUP_COUNT = 5
+
+# anomalies kept per user for the API
+RECENT_LIMIT = 50
+
+MAX_TRACKED_USERS = int(os.getenv("MAX_CACHED_USERS", "5000"))
+
+
+class CategoryStats:
+    """
+    Exponentially weighted mean / variance of one (user, category).
+    O(1) memory, one update per transaction.
+    """
+
+    __slots__ = ("mean", "var", "count")
+
+    def __init__(self):
+        self.mean = 0.0
+        self.var = 0.0
+        self.count = 0
+
+    def score(self, amount):
+        """z-score of `amount` against the state BEFORE it is added."""
+
+        if self.count < WARMUP_COUNT:
+            return None
+
+        std = math.sqrt(self.var)
+        if std == 0:
+            return math.inf if amount > self.mean else 0.0
+
+        return (amount - self.mean) / std
+
+    def update(self, amount):
+
+        if self.count == 0:
+            self.mean = amount
+        else:
+            diff = amount - self.mean
+            incr = EW_ALPHA * diff
+            self.mean += incr
+            self.var = (1 - EW_ALPHA) * (self.var + diff * incr)
+
+        self.count += 1
+
+
+class StreamingAnomalyDetector:
+    """
+    Per-(user, category) online spike detector.
+
+    observe() -> feed new transactions as they arrive (sync path)
+    rebuild() -> replay a user's full history (batch recomputation,
+                 or after rows were modified / removed)
+    """
+
+    def __init__(self, max_users=MAX_TRACKED_USERS):
+        self._users = OrderedDict()  # user_id -> (stats by category, recent)
+        self._max_users = max_users
+        self._lock = threading.Lock()
+
+    def observe(self, user_id, transactions):
+        """
+        Scores then absorbs each expense (amount > 0), oldest first.
+        RETURNS the anomalies found in `transactions`.
+        """
+
+        with self._lock:
+            stats, recent = self._state(user_id)
+
+            found = []
+
+            for t in sorted(transactions, key=lambda t: t["date"]):
+
+                amount = t["amount"]
+                if amount <= 0:
+                    continue
+
+                category = stats.get(t["category"])
+                if category is None:
+                    category = stats[t["category"]] = CategoryStats()
+
+                z = category.score(amount)
+
+                if (
+                    z is not None
+                    and z > Z_THRESHOLD
+                    and amount > category.mean * MIN_RATIO
+                ):
+                    found.append(_anomaly(t, category.mean, z))
+
+                category.update(amount)
+
+            recent.extend(found)
+            del recent[:-RECENT_LIMIT]
+
+            return found
+
+    def rebuild(self, user_id, transactions):
+        """Drops the user's state and replays `transactions`."""
+
+        self.forget(user_id)
+        return self.observe(user_id, transactions)
+
+    def recent(self, user_id):
+        with self._lock:
+            state = self._users.get(user_id)
+            return list(reversed(state[1])) if state else []
+
+    def forget(self, user_id):
+        with self._lock:
+            self._users.pop(user_id, None)
+
+    def _state(self, user_id):
+
+        state = self._users.get(user_id)
+
+        if state is None:
+            state = self._users[user_id] = ({}, [])
+            while len(self._users) > self._max_users:
+                self._users.popitem(last=False)
+        else:
+            self._users.move_to_end(user_id)
+
+        return state
+
+
+def _anomaly(t, expected, z):
+
+    percent = round((t["amount"] - expected) / expected * 100, 1)
+
+    return {
+        "date": t["date"],
+        "receiver": t["receiver"],
+        "category": t["category"],
+        "value": t["amount"],
+        "expected": round(expected, 2),
+        "z_score": round(z, 2) if math.isfinite(z) else None,
+        "impact": f"+{percent}%",
+        "type": "spike",
+    }
+
+
+detector = StreamingAnomalyDetector()
@@ -0,0 +1,113 @@
+# backend/engine/ml/compiled_forest.py
+
+from bisect import bisect_left
+
+import numpy as np
+
+# grids bigger than this fall back to sklearn predict
+MAX_TABLE_CELLS = 1_000_000
+
+
+# -----------------------------
+# COMPILED FOREST (LOOKUP TABLE)
+# -----------------------------
+class CompiledForest:
+    """
+    A tree ensemble is piecewise constant over the grid formed by all
+    of its split thresholds, so every grid cell has exactly one answer.
+
+    The answers are computed once with sklearn; a prediction is then
+    one binary search per feature plus a table lookup.
+
+    sklearn compares float32(x) <= threshold, the cell lookup does
+    the same, so results match model.predict exactly.
+    """
+
+    def __init__(self, model, edges=None):
+
+        self.classes = [str(c) for c in model.classes_]
+        self.n_features = model.n_features_in_
+
+        self.edges = edges if edges is not None else _split_thresholds(model)
+        self.edge_lists = [e.tolist() for e in self.edges]
+        self.shape = tuple(len(e) + 1 for e in self.edges)
+
+        # -------------------------
+        # ONE REPRESENTATIVE PER CELL
+        # largest float32 <= threshold, plus one past the last threshold
+        # -------------------------
+        reps = []
+        for e in self.edges:
+            low = e.astype(np.float32)
+            low = np.where(low > e, np.nextafter(low, np.float32(-np.inf)), low)
+            top = np.nextafter(np.float32(e[-1]) if len(e) else np.float32(0),
+                               np.float32(np.inf))
+            reps.append(np.append(low, top).astype(np.float64))
+
+        grid = np.stack(
+            [g.ravel() for g in np.meshgrid(*reps, indexing="ij")], axis=1
+        )
+
+        labels = model.predict(grid)
+        label_index = {c: i for i, c in enumerate(model.classes_)}
+
+        table = np.zeros(int(np.prod(self.shape)), dtype=np.int8)
+        table[self._cells(grid)] = [label_index[c] for c in labels]
+
+        self.table = table
+        self.table_list = table.tolist()
+
+    @classmethod
+    def try_compile(cls, model):
+        try:
+            edges = _split_thresholds(model)
+
+            cells = 1
+            for e in edges:
+                cells *= len(e) + 1
+            if cells > MAX_TABLE_CELLS:
+                return None
+
+            return cls(model, edges)
+        except Exception as e:
+            print("⚠ Could not compile risk model:", e)
+            return None
+
+    # -------------------------
+    # CELL INDEX
+    # -------------------------
+    def _cells(self, X):
+        X = np.asarray(X, dtype=np.float64).astype(np.float32).astype(np.float64)
+        index = np.zeros(len(X), dtype=np.int64)
+        for f, e in enumerate(self.edges):
+            index = index * self.shape[f] + np.searchsorted(e, X[:, f], side="left")
+        return index
+
+    # -------------------------
+    # PREDICT
+    # -------------------------
+    def predict(self, X):
+        """Batch: (n, n_features) -> array of class labels."""
+        return np.array(self.classes)[self.table[self._cells(X)]]
+
+    def predict_one(self, *row):
+        """Single row, no array allocation."""
+        index = 0
+        for f, x in enumerate(row):
+            x = float(np.float32(x))
+            index = index * self.shape[f] + bisect_left(self.edge_lists[f], x)
+        return self.classes[self.table_list[index]]
+
+
+def _split_thresholds(model):
+    """Sorted unique split thresholds of every feature."""
+
+    per_feature = [[] for _ in range(model.n_features_in_)]
+
+    for tree in model.estimators_:
+        nodes = tree.tree_
+        split = nodes.feature >= 0
+        for f, t in zip(nodes.feature[split], nodes.threshold[split]):
+            per_feature[f].append(t)
+
+    return [np.unique(np.array(t, dtype=np.float64)) for t in per_feature]
@@ -1,6 +1,13 @@
-from engine.ml.risk_model import predict_risk_ml
-from engine.ml.personality_model import detect_personality_ml
-from engine.ml.anomaly_model import detect_spending_anomalies_ml
+from engine.metrics import stage
+from engine.ml.risk_model import predict_risk_ml, predict_risk_batch
+from engine.ml.personality_model import (
+    detect_personality_ml,
+    detect_personality_batch,
+)
+from engine.ml.anomaly_model import (
+    detect_spending_anomalies_ml,
+    detect_spending_anomalies_batch,
+)
 
 
 # ======================================
@@ -9,15 +16,47 @@ from engine.ml.anomaly_model import detect_spending_anomalies_ml
 
 def run_behavior_ml(monthly_spend, spending_score, monthly_trend):
 
-    risk = predict_risk_ml(monthly_spend, spending_score)
+    with stage("ml_inference"):
+        risk = predict_risk_ml(monthly_spend, spending_score)
 
-    personality = detect_personality_ml(spending_score)
+        personality = detect_personality_ml(spending_score)
 
-    anomalies, anomalies_count = detect_spending_anomalies_ml(monthly_trend)
+        anomalies, anomalies_count = detect_spending_anomalies_ml(
+            monthly_trend
+        )
 
     return {
         "risk_level": risk,
         "personality": personality,
         "anomalies": anomalies,
         "anomalies_count": anomalies_count,
-    }
\ No newline at end of file
+    }
+
+
+# ======================================
+# BATCH ML PIPELINE (many users)
+# ======================================
+
+def run_behavior_ml_batch(monthly_spends, spending_scores, monthly_trends):
+    """
+    run_behavior_ml over many users, one vectorised call per model.
+    Returns one result dict per user, in input order.
+    """
+
+    with stage("ml_inference"):
+        risks = predict_risk_batch(monthly_spends, spending_scores)
+
+        personalities = detect_personality_batch(spending_scores)
+
+        anomalies = detect_spending_anomalies_batch(monthly_trends)
+
+    return [
+        {
+            "risk_level": str(risk),
+            "personality": str(personality),
+            "anomalies": found,
+            "anomalies_count": count,
+        }
+        for risk, personality, (found, count)
+        in zip(risks, personalities, anomalies)
+    ]
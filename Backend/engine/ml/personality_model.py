@@ -1,5 +1,8 @@
 # backend/engine/ml/personality_model.py
 
+import numpy as np
+
+
 def detect_personality_ml(monthly_spend):
 
     if monthly_spend > 5500:
@@ -9,4 +12,15 @@ def detect_personality_ml(monthly_spend):
         return "Balanced Investor"
 
     else:
-        return "Disciplined Saver"
\ No newline at end of file
+        return "Disciplined Saver"
+
+def detect_personality_batch(monthly_spends):
+    """Vectorised detect_personality_ml over many users."""
+
+    monthly_spends = np.asarray(monthly_spends, dtype=np.float64)
+
+    return np.select(
+        [monthly_spends > 5500, monthly_spends > 4500],
+        ["Impulse Spender", "Balanced Investor"],
+        default="Disciplined Saver",
+    )
@@ -0,0 +1,339 @@
+# backend/engine/ml/registry.py
+#
+# Versioned risk model artifacts + hot reload in the serving process.
+#
+#   python -m engine.ml.registry list
+#   python -m engine.ml.registry pin 3
+#   python -m engine.ml.registry unpin
+#   python -m engine.ml.registry activate 2
+#   python -m engine.ml.registry rollback
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from engine.metrics import register_collector
+from engine.ml.compiled_forest import CompiledForest
+
+# -----------------------------
+# PATHS
+# -----------------------------
+BASE_DIR = os.path.dirname(__file__)
+
+MODELS_DIR = os.getenv("MODEL_REGISTRY_DIR", os.path.join(BASE_DIR, "models"))
+MANIFEST_PATH = os.path.join(MODELS_DIR, "manifest.json")
+
+# model used when the registry is empty
+LEGACY_MODEL_PATH = os.path.join(BASE_DIR, "risk_model.pkl")
+
+# how often the serving process looks for a new version
+POLL_SECONDS = float(os.getenv("MODEL_REGISTRY_POLL", "5"))
+
+
+# ======================================
+# MANIFEST (registry state on disk)
+# ======================================
+def _empty_manifest():
+    return {"active": None, "pinned": None, "versions": {}}
+
+
+def read_manifest():
+    try:
+        with open(MANIFEST_PATH) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return _empty_manifest()
+
+
+def _write_atomic(path, write):
+    """Write to a temp file in the same dir, then rename over `path`."""
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _write_manifest(manifest):
+    data = json.dumps(manifest, indent=2).encode()
+    _write_atomic(MANIFEST_PATH, lambda f: f.write(data))
+
+
+def serving_version(manifest):
+    """Pinned version wins over the latest active one."""
+    return manifest.get("pinned") or manifest.get("active")
+
+
+# ======================================
+# PUBLISH / PIN / ROLLBACK (retrain side)
+# ======================================
+def publish(model, metrics=None, activate=True):
+    """
+    Saves `model` as the next version and (by default) makes it active.
+    The artifact is fully written before the manifest points at it.
+    """
+
+    import joblib
+
+    manifest = read_manifest()
+
+    version = max((int(v) for v in manifest["versions"]), default=0) + 1
+    path = os.path.join(MODELS_DIR, f"risk_model-v{version}.pkl")
+
+    _write_atomic(path, lambda f: joblib.dump(model, f))
+
+    manifest["versions"][str(version)] = {
+        "path": os.path.basename(path),
+        "created_at": time.time(),
+        "metrics": metrics or {},
+    }
+
+    if activate:
+        manifest["active"] = version
+
+    _write_manifest(manifest)
+
+    return version
+
+
+def activate(version):
+    manifest = read_manifest()
+    if str(version) not in manifest["versions"]:
+        raise ValueError(f"Unknown model version: {version}")
+    manifest["active"] = int(version)
+    _write_manifest(manifest)
+
+
+def pin(version):
+    manifest = read_manifest()
+    if str(version) not in manifest["versions"]:
+        raise ValueError(f"Unknown model version: {version}")
+    manifest["pinned"] = int(version)
+    _write_manifest(manifest)
+
+
+def unpin():
+    manifest = read_manifest()
+    manifest["pinned"] = None
+    _write_manifest(manifest)
+
+
+def rollback():
+    """Makes the version before the active one active."""
+
+    manifest = read_manifest()
+
+    older = sorted(
+        int(v) for v in manifest["versions"]
+        if manifest["active"] is None or int(v) < manifest["active"]
+    )
+    if not older:
+        raise ValueError("No older model version to roll back to")
+
+    manifest["active"] = older[-1]
+    _write_manifest(manifest)
+
+    return older[-1]
+
+
+# ======================================
+# LOADED MODEL (one version in memory)
+# ======================================
+class LoadedModel:
+    """
+    One fully loaded + compiled version, with its inference latency.
+    """
+
+    def __init__(self, version, model):
+        self.version = version
+        self.model = model
+        self.compiled = CompiledForest.try_compile(model) if model else None
+        self.loaded_at = time.time()
+
+        self.calls = 0
+        self.rows = 0
+        self.seconds = 0.0
+        self._stats_lock = threading.Lock()
+
+    def record(self, rows, seconds):
+        with self._stats_lock:
+            self.calls += 1
+            self.rows += rows
+            self.seconds += seconds
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                "version": self.version,
+                "compiled": self.compiled is not None,
+                "calls": self.calls,
+                "rows": self.rows,
+                "avg_latency_us": (
+                    self.seconds / self.calls * 1e6 if self.calls else 0.0
+                ),
+            }
+
+
+def _manifest_mtime():
+    try:
+        return os.stat(MANIFEST_PATH).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def _load_version(version, manifest):
+
+    import joblib
+
+    if version is None:
+        path = LEGACY_MODEL_PATH
+        version = "legacy"
+    else:
+        path = os.path.join(
+            MODELS_DIR, manifest["versions"][str(version)]["path"]
+        )
+
+    return LoadedModel(version, joblib.load(path))
+
+
+# ======================================
+# SERVING SIDE (hot reload, double-buffered)
+# ======================================
+class ModelRegistry:
+    """
+    Holds the serving model. A new version is loaded and compiled
+    next to the old one and swapped in with one assignment, so no
+    request ever sees a half-loaded model.
+    """
+
+    def __init__(self):
+        self._current = None
+        self._history = {}
+        self._manifest_mtime = None
+        self._next_check = 0.0
+        self._load_lock = threading.Lock()
+
+    def current(self):
+
+        if self._current is None:
+            with self._load_lock:
+                if self._current is None:
+                    self._reload()
+            return self._current
+
+        now = time.monotonic()
+        if now >= self._next_check:
+            self._next_check = now + POLL_SECONDS
+
+            # new manifest -> load it off the request path,
+            # the old version keeps serving meanwhile
+            if self._manifest_changed() and self._load_lock.acquire(
+                blocking=False
+            ):
+                threading.Thread(
+                    target=self._reload_and_release, daemon=True
+                ).start()
+
+        return self._current
+
+    def stats(self):
+        current = self._current
+        return {
+            "serving": current.version if current else None,
+            "versions": [m.stats() for m in self._history.values()],
+        }
+
+    def _manifest_changed(self):
+        return _manifest_mtime() != self._manifest_mtime
+
+    def _reload_and_release(self):
+        try:
+            self._reload()
+        finally:
+            self._load_lock.release()
+
+    def _reload(self):
+
+        mtime = _manifest_mtime()
+
+        if self._current is not None and mtime == self._manifest_mtime:
+            return
+
+        manifest = read_manifest()
+        wanted = serving_version(manifest)
+
+        self._manifest_mtime = mtime
+
+        if self._current is not None and self._current.version == (
+            wanted if wanted is not None else "legacy"
+        ):
+            return
+
+        try:
+            loaded = _load_version(wanted, manifest)
+        except Exception as e:
+            print("❌ Could not load ML model:", e)
+            if self._current is None:
+                self._current = LoadedModel(None, None)
+            return
+
+        # swap (old version keeps serving until this line)
+        self._current = loaded
+        self._history[loaded.version] = loaded
+
+        print(f"✅ ML Risk Model Loaded (version {loaded.version})")
+
+
+registry = ModelRegistry()
+
+
+def _collect_metrics():
+    for loaded in list(registry._history.values()):
+        labels = {"version": loaded.version}
+        yield "risk_model_calls_total", "counter", labels, loaded.calls
+        yield "risk_model_rows_total", "counter", labels, loaded.rows
+        yield "risk_model_seconds_total", "counter", labels, loaded.seconds
+
+
+register_collector(_collect_metrics)
+
+
+# ======================================
+# CLI
+# ======================================
+def main(argv):
+
+    command = argv[0] if argv else "list"
+
+    if command == "list":
+        manifest = read_manifest()
+        print(json.dumps(manifest, indent=2))
+    elif command == "pin":
+        pin(int(argv[1]))
+    elif command == "unpin":
+        unpin()
+    elif command == "activate":
+        activate(int(argv[1]))
+    elif command == "rollback":
+        print("Active version:", rollback())
+    else:
+        print("usage: list | pin N | unpin | activate N | rollback")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,11 +1,25 @@
 # backend/engine/ml/retrain.py
+#
+# Offline retraining: streams the labelled dataset in chunks
+# (CSV or Parquet), builds features with the same feature_builder
+# used at serving time, trains in parallel and publishes the new
+# version to the model registry.
+#
+#   cd Backend
+#   python -m engine.ml.retrain
+#   python -m engine.ml.retrain --dataset big.parquet --n-jobs 8 \
+#       --report benchmarks/results/retrain.json
 
+import argparse
+import json
 import os
-import pandas as pd
-import joblib
+import sys
+import time
 
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
+import numpy as np
+
+from engine.feature_builder import build_features
+from engine.ml import registry
 
 
 # -----------------------------
@@ -14,36 +28,189 @@ from sklearn.model_selection import train_test_split
 BASE_DIR = os.path.dirname(__file__)
 
 dataset_path = os.path.join(BASE_DIR, "dataset.csv")
-model_path = os.path.join(BASE_DIR, "risk_model.pkl")
+
+# dataset column -> behavior key expected by build_features
+DATASET_COLUMNS = {
+    "monthly_savings": "monthly_spend",
+    "spending_score": "savings_rate",
+}
+LABEL_COLUMN = "risk_level"
+
+# same order the serving side feeds the model
+FEATURES = ["monthly_spend", "savings_rate"]
+
+CHUNK_ROWS = 250_000
 
 
 # -----------------------------
-# LOAD DATA
+# CHUNKED LOADING
 # -----------------------------
-df = pd.read_csv(dataset_path)
+def iter_chunks(path, chunk_rows=CHUNK_ROWS):
+    """Yields DataFrames of at most `chunk_rows` rows (CSV or Parquet)."""
+
+    columns = [*DATASET_COLUMNS, LABEL_COLUMN]
+
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(
+            batch_size=chunk_rows, columns=columns
+        ):
+            yield batch.to_pandas()
+        return
+
+    import pandas as pd
+
+    yield from pd.read_csv(
+        path,
+        usecols=columns,
+        dtype={c: np.float32 for c in DATASET_COLUMNS},
+        chunksize=chunk_rows,
+    )
+
+
+def load_dataset(path, chunk_rows=CHUNK_ROWS):
+    """
+    RETURNS:
+        X (float32, rows x FEATURES), y (label strings)
 
-X = df[["monthly_savings", "spending_score"]]
-y = df["risk_level"]
+    Only the feature arrays and integer label codes are kept per chunk,
+    so memory grows with the numeric data, not the raw file.
+    """
+
+    feature_chunks = []
+    label_chunks = []
+    labels = {}
+
+    for chunk in iter_chunks(path, chunk_rows):
+        features = build_features(chunk.rename(columns=DATASET_COLUMNS))
+
+        feature_chunks.append(np.column_stack([
+            np.asarray(features[name], dtype=np.float32) for name in FEATURES
+        ]))
+
+        # chunk-local codes -> codes shared across chunks
+        codes, uniques = chunk[LABEL_COLUMN].factorize()
+        remap = np.array(
+            [labels.setdefault(label, len(labels)) for label in uniques],
+            dtype=np.int16,
+        )
+        label_chunks.append(remap[codes])
+
+    if not feature_chunks:
+        raise ValueError(f"Dataset is empty: {path}")
+
+    X = np.concatenate(feature_chunks)
+    y = np.asarray(list(labels), dtype=object)[np.concatenate(label_chunks)]
+
+    return X, y
 
 
 # -----------------------------
-# TRAIN MODEL
+# PEAK MEMORY
 # -----------------------------
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, random_state=42
-)
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
 
-model = RandomForestClassifier(
-    n_estimators=100,
-    random_state=42
-)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
 
-model.fit(X_train, y_train)
+    # KiB on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
 
 
 # -----------------------------
-# SAVE MODEL
+# TRAIN MODEL
 # -----------------------------
-joblib.dump(model, model_path)
+def train(path=dataset_path, chunk_rows=CHUNK_ROWS, n_jobs=-1):
+    """
+    RETURNS:
+        model, report (timings, peak memory, hold-out accuracy)
+    """
+
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.model_selection import train_test_split
+
+    start = time.perf_counter()
+
+    X, y = load_dataset(path, chunk_rows)
+    loaded = time.perf_counter()
+
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=42
+    )
+
+    model = RandomForestClassifier(
+        n_estimators=100,
+        random_state=42,
+        n_jobs=n_jobs,
+    )
+
+    model.fit(X_train, y_train)
+    trained = time.perf_counter()
+
+    accuracy = float(model.score(X_test, y_test))
+
+    # serve single rows without the thread pool overhead
+    model.n_jobs = None
+
+    report = {
+        "dataset": os.path.basename(path),
+        "rows": int(len(X)),
+        "train_rows": int(len(X_train)),
+        "holdout_rows": int(len(X_test)),
+        "chunk_rows": chunk_rows,
+        "n_jobs": n_jobs,
+        "load_s": loaded - start,
+        "fit_s": trained - loaded,
+        "wall_s": time.perf_counter() - start,
+        "peak_rss_mb": peak_rss_mb(),
+        "accuracy": accuracy,
+    }
+
+    return model, report
+
+
+def write_report(report, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Retrain the risk model")
+    parser.add_argument("--dataset", default=dataset_path,
+                        help="labelled CSV or Parquet file")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    parser.add_argument("--report", help="write the JSON report here")
+    parser.add_argument("--no-publish", action="store_true",
+                        help="train + report only, keep the serving model")
+    args = parser.parse_args(argv)
+
+    model, report = train(args.dataset, args.chunk_rows, args.n_jobs)
+
+    print(json.dumps(report, indent=2))
+
+    if args.report:
+        write_report(report, args.report)
+
+    if args.no_publish:
+        return report
+
+    # -----------------------------
+    # PUBLISH NEW VERSION
+    # (serving processes pick it up without a restart)
+    # -----------------------------
+    version = registry.publish(model, metrics=report)
+
+    print(f"✅ Model v{version} saved at:", registry.MODELS_DIR)
+
+    return report
+
 
-print("✅ Model saved at:", model_path)
\ No newline at end of file
+if __name__ == "__main__":
+    main()
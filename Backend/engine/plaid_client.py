@@ -1,9 +1,7 @@
-from plaid.api import plaid_api
-from plaid.configuration import Configuration
-from plaid.api_client import ApiClient
 from pathlib import Path
 from dotenv import load_dotenv
 import os
+import threading
 
 # -------------------------
 # Load Environment Variables
@@ -16,16 +14,50 @@ load_dotenv(ENV_PATH)
 PLAID_CLIENT_ID = os.getenv("PLAID_CLIENT_ID")
 PLAID_SECRET = os.getenv("PLAID_SECRET")
 
+# one pooled keep-alive connection per concurrent Plaid call
+# (route threads + page workers share this pool)
+PLAID_POOL_SIZE = int(os.getenv("PLAID_POOL_SIZE", "32"))
+
+
 # -------------------------
-# Plaid Configuration
+# Plaid Client (created on first use)
+# importing plaid.api pulls in the whole model tree,
+# so it is kept out of process startup
 # -------------------------
-configuration = Configuration(
-    host="https://sandbox.plaid.com",
-    api_key={
-        "clientId": PLAID_CLIENT_ID,
-        "secret": PLAID_SECRET,
-    }
-)
-
-api_client = ApiClient(configuration)
-client = plaid_api.PlaidApi(api_client)
\ No newline at end of file
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    global _client
+
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = _create_client()
+
+    return _client
+
+
+def set_client(client):
+    """Swap the client (local Plaid stand-ins for benchmarks)."""
+    global _client
+    _client = client
+
+
+def _create_client():
+    from plaid.api import plaid_api
+    from plaid.configuration import Configuration
+    from plaid.api_client import ApiClient
+
+    configuration = Configuration(
+        host="https://sandbox.plaid.com",
+        api_key={
+            "clientId": PLAID_CLIENT_ID,
+            "secret": PLAID_SECRET,
+        }
+    )
+    configuration.connection_pool_maxsize = PLAID_POOL_SIZE
+
+    api_client = ApiClient(configuration)
+    return plaid_api.PlaidApi(api_client)
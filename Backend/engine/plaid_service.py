@@ -1,49 +1,216 @@
-from datetime import date, timedelta, datetime
-import random
-import hashlib
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
+import asyncio
+import os
+import threading
+import time
+import zlib
+
+import numpy as np
+
 import engine.session as session
 
-from engine.plaid_client import client
-from plaid.model.transactions_get_request import TransactionsGetRequest
+from engine.aggregates import TransactionAggregates
+from engine.cleaning import (
+    ALLOWED_CATEGORIES,
+    CATEGORY_IDS,
+    clean_into,
+    clean_transaction,
+)
+from engine.columnar import TransactionColumns
+from engine.ledger import Ledger, day_number, diff
+from engine.metrics import DEBUG, counter, inc, register_collector, stage
+from engine.ml.anomaly_model import detector
+from engine.plaid_client import get_client
+from engine.shared_cache import POLL_SECONDS, get_backend
+from engine.user_store import store, DEFAULT_USER_ID
+
+
+# -------------------------------
+# PER-USER MEMORY CACHE
+# soft TTL -> serve cached data, refresh in background
+# hard TTL -> too old to serve, block on a fresh fetch
+# -------------------------------
+CACHE_SOFT_TTL = float(os.getenv("PLAID_CACHE_SOFT_TTL", "30"))    # seconds
+CACHE_HARD_TTL = float(os.getenv("PLAID_CACHE_HARD_TTL", "900"))   # seconds
+
+REFRESH_WORKERS = int(os.getenv("PLAID_REFRESH_WORKERS", "4"))
+
+# counted as plaid_cache_events_total{event=...}
+CACHE_EVENTS = (
+    "hits",
+    "stale_hits",
+    "misses",
+    "disk_hits",
+    "refreshes",
+    "fetch_errors",
+    "shared_hits",
+    "lease_waits",
+)
 
 
 # -------------------------------
-# SIMPLE MEMORY CACHE
+# FETCH MODE
+# "sync" = incremental /transactions/sync (cursor per item)
+# "get"  = full 90-day /transactions/get re-pull
 # -------------------------------
-CACHE_TRANSACTIONS = None
-CACHE_TIME = None
-CACHE_DURATION = 30   # seconds
+TRANSACTIONS_MODE = os.getenv("PLAID_TRANSACTIONS_MODE", "sync")
+
+WINDOW_DAYS = 90
+SYNC_PAGE_SIZE = 500
+SYNC_MAX_RESTARTS = 3
+
+# /transactions/get pagination (Plaid max count = 500)
+GET_PAGE_SIZE = 500
+GET_PAGE_WORKERS = int(os.getenv("PLAID_PAGE_WORKERS", "4"))
+
+_page_pool = ThreadPoolExecutor(
+    max_workers=GET_PAGE_WORKERS,
+    thread_name_prefix="plaid-page",
+)
 
 
 # -----------------------------------
-# CATEGORY MAP (UI categories)
+# GLOBAL DEMO SCALING
 # -----------------------------------
-CATEGORY_MAP = {
-    "FOOD_AND_DRINK": "Food",
-    "TRANSPORTATION": "Transport",
-    "TRAVEL": "Transport",
-    "GENERAL_MERCHANDISE": "Shopping",
-    "GENERAL_SERVICES": "Shopping",
-    "LOAN_PAYMENTS": "Housing",
-    "RENT_AND_UTILITIES": "Housing",
-    "TRANSFER_OUT": "Housing",
-    "PERSONAL_CARE": "Lifestyle",
-    "ENTERTAINMENT": "Lifestyle",
+DEMO_SCALE_FACTOR = 0.35
+
+
+# -----------------------------------
+# REALISM RULES
+# -----------------------------------
+# variance range per category (anything else = default)
+REALISM_VARIANCE = {
+    "Housing": (0.97, 1.03),
+    "Food": (0.90, 1.12),
+    "Transport": (0.92, 1.10),
 }
+REALISM_DEFAULT_VARIANCE = (0.88, 1.15)
 
-ALLOWED_CATEGORIES = [
-    "Housing",
-    "Food",
-    "Transport",
-    "Shopping",
-    "Lifestyle",
-]
+IMPULSE_CHANCE = 0.08
+IMPULSE_RANGE = (8, 40)
+IMPULSE_CATEGORIES = ["Food", "Shopping", "Lifestyle"]
+
+SHOCK_CHANCE = 0.02
+SHOCK_RANGE = (120, 600)
 
 
 # -----------------------------------
-# GLOBAL DEMO SCALING
+# COUNTER-BASED RANDOMNESS
+# each row gets its own key, draw k of that row is
+# mix(key + k * GOLDEN) -> no global RNG state, fully vectorised
 # -----------------------------------
-DEMO_SCALE_FACTOR = 0.35
+_GOLDEN = 0x9E3779B97F4A7C15
+
+# k * GOLDEN mod 2**64 for every draw realism_arrays makes
+_DRAW_OFFSETS = np.array(
+    [k * _GOLDEN % 2 ** 64 for k in range(6)], dtype=np.uint64
+)
+
+
+def _mix64(x):
+    """SplitMix64 finaliser (uint64 arithmetic wraps)."""
+    x = x ^ (x >> np.uint64(30))
+    x = x * np.uint64(0xBF58476D1CE4E5B9)
+    x = x ^ (x >> np.uint64(27))
+    x = x * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def _uniform(keys, draw, low=0.0, high=1.0):
+    """Draw number `draw` for every row, uniform in [low, high)."""
+    bits = _mix64(keys + _DRAW_OFFSETS[draw])
+    unit = (bits >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+    return low + (high - low) * unit
+
+
+def realism_keys(day, amount, merchant_hash):
+    """
+    Stable per-row key from (date, amount, merchant),
+    so a row gets the same variation on every refresh.
+    """
+    cents = np.round(amount * 100).astype(np.int64).view(np.uint64)
+
+    key = _mix64(day.astype(np.int64).view(np.uint64))
+    key = _mix64(key ^ cents)
+    return _mix64(key ^ merchant_hash.astype(np.uint64))
+
+
+def realism_arrays(amount, category, categories, keys):
+    """
+    Vectorised realism over whole columns.
+
+    RETURNS:
+        scaled amounts,
+        impulse mask / amounts / category index (IMPULSE_CATEGORIES),
+        shock mask / amounts
+    """
+
+    # -------------------------
+    # CATEGORY BASED VARIANCE
+    # -------------------------
+    bounds = np.array(
+        [REALISM_VARIANCE.get(c, REALISM_DEFAULT_VARIANCE) for c in categories],
+        dtype=np.float64,
+    ).reshape(-1, 2)
+
+    low = bounds[category, 0]
+    high = bounds[category, 1]
+
+    variance = _uniform(keys, 0, low, high)
+
+    # preserve sign (income stays negative)
+    scaled = amount * variance * DEMO_SCALE_FACTOR
+
+    # prevent tiny values while keeping sign
+    scaled = np.where(
+        scaled > 0,
+        np.maximum(1, scaled),
+        np.minimum(-1, scaled),
+    )
+
+    expense = amount > 0
+
+    # -------------------------
+    # IMPULSE MICRO SPEND
+    # -------------------------
+    impulse = expense & (_uniform(keys, 1) < IMPULSE_CHANCE)
+    impulse_amount = _uniform(keys, 2, *IMPULSE_RANGE)
+    impulse_category = (
+        _uniform(keys, 3) * len(IMPULSE_CATEGORIES)
+    ).astype(np.int64)
+
+    # -------------------------
+    # RARE SHOCK EXPENSE
+    # -------------------------
+    shock = expense & (_uniform(keys, 4) < SHOCK_CHANCE)
+    shock_amount = _uniform(keys, 5, *SHOCK_RANGE)
+
+    return (
+        np.round(scaled, 2),
+        impulse,
+        np.round(impulse_amount, 2),
+        impulse_category,
+        shock,
+        np.round(shock_amount, 2),
+    )
+
+
+def _merchant_hashes(receivers):
+    table = {m: zlib.crc32(str(m).encode()) for m in set(receivers)}
+    return np.fromiter(
+        (table[m] for m in receivers), dtype=np.uint64, count=len(receivers)
+    )
+
+
+# realism rows for ledger columns (realism_columns)
+IMPULSE_RECEIVER = "Impulse Purchase"
+SHOCK_RECEIVER = "Unexpected Expense"
+
+_IMPULSE_IDS = np.array(
+    [CATEGORY_IDS[c] for c in IMPULSE_CATEGORIES], dtype=np.uint8
+)
 
 
 # -----------------------------------
@@ -54,168 +221,841 @@ def add_behavior_realism(cleaned):
     Adds realistic financial variation
     WITHOUT changing results every refresh.
     Works for BOTH income and expenses.
+
+    Randomness is derived per row from a stable key,
+    the global `random` module is never touched.
     """
 
     if not cleaned:
         return cleaned
 
-    enhanced = []
+    return [t for group in realism_groups(cleaned) for t in group]
 
-    for t in cleaned:
 
-        new_t = t.copy()
+def realism_groups(cleaned):
+    """
+    Same as add_behavior_realism, grouped per input row:
+    [[row, impulse?, shock?], ...]. Each group depends only on
+    its own row, so groups can be computed for changed rows alone.
+    """
 
-        # deterministic randomness
-        seed = hashlib.md5(
-            f"{t['date']}-{t['receiver']}-{t['amount']}".encode()
-        ).hexdigest()
-
-        random.seed(seed)
-
-        amount = new_t["amount"]
-        category = new_t["category"]
-
-        # -------------------------
-        # CATEGORY BASED VARIANCE
-        # -------------------------
-        if category == "Housing":
-            variance = random.uniform(0.97, 1.03)
-        elif category == "Food":
-            variance = random.uniform(0.90, 1.12)
-        elif category == "Transport":
-            variance = random.uniform(0.92, 1.10)
-        else:
-            variance = random.uniform(0.88, 1.15)
+    if not cleaned:
+        return []
 
-        # preserve sign (income stays negative)
-        scaled = amount * variance * DEMO_SCALE_FACTOR
+    n = len(cleaned)
 
-        # prevent tiny values while keeping sign
-        if scaled > 0:
-            scaled = max(1, scaled)
-        else:
-            scaled = min(-1, scaled)
+    amount = np.fromiter((t["amount"] for t in cleaned), np.float64, count=n)
 
-        new_t["amount"] = round(scaled, 2)
+    codes = {}
+    category = np.fromiter(
+        (codes.setdefault(t["category"], len(codes)) for t in cleaned),
+        dtype=np.int64,
+        count=n,
+    )
 
-        enhanced.append(new_t)
+    day = np.array(
+        [t["date"] for t in cleaned], dtype="datetime64[D]"
+    ).astype(np.int64)
 
-        # -------------------------
-        # IMPULSE MICRO SPEND
-        # -------------------------
-        if amount > 0 and random.random() < 0.08:
-            enhanced.append({
+    keys = realism_keys(
+        day, amount, _merchant_hashes([t["receiver"] for t in cleaned])
+    )
+
+    (
+        scaled,
+        impulse,
+        impulse_amount,
+        impulse_category,
+        shock,
+        shock_amount,
+    ) = realism_arrays(amount, category, list(codes), keys)
+
+    scaled = scaled.tolist()
+    impulse_at = set(np.flatnonzero(impulse).tolist())
+    shock_at = set(np.flatnonzero(shock).tolist())
+
+    groups = []
+
+    for i, t in enumerate(cleaned):
+
+        new_t = t.copy()
+        new_t["amount"] = scaled[i]
+        group = [new_t]
+        groups.append(group)
+
+        if i in impulse_at:
+            group.append({
                 "date": new_t["date"],
-                "receiver": "Impulse Purchase",
-                "amount": round(random.uniform(8, 40), 2),
-                "category": random.choice(
-                    ["Food", "Shopping", "Lifestyle"]
-                ),
+                "receiver": IMPULSE_RECEIVER,
+                "amount": float(impulse_amount[i]),
+                "category": IMPULSE_CATEGORIES[impulse_category[i]],
             })
 
-        # -------------------------
-        # RARE SHOCK EXPENSE
-        # -------------------------
-        if amount > 0 and random.random() < 0.02:
-            enhanced.append({
+        if i in shock_at:
+            group.append({
                 "date": new_t["date"],
-                "receiver": "Unexpected Expense",
-                "amount": round(random.uniform(120, 600), 2),
+                "receiver": SHOCK_RECEIVER,
+                "amount": float(shock_amount[i]),
                 "category": "Lifestyle",
             })
 
-    return enhanced
+    return groups
+
+
+def realism_parts(ledger):
+    """
+    Same rows as add_behavior_realism, straight from Ledger columns:
+    every row followed by its impulse / shock rows, in ledger order.
+
+    RETURNS amount, category (ALLOWED_CATEGORIES ids), day,
+            receiver (codes into ledger.receivers + [impulse, shock])
+    """
+
+    hashes = np.array(
+        [zlib.crc32(str(m).encode()) for m in ledger.receivers],
+        dtype=np.uint64,
+    )
+    keys = realism_keys(ledger.day, ledger.amount, hashes[ledger.receiver])
+
+    (
+        scaled,
+        impulse,
+        impulse_amount,
+        impulse_category,
+        shock,
+        shock_amount,
+    ) = realism_arrays(ledger.amount, ledger.category, ALLOWED_CATEGORIES, keys)
+
+    # row i -> 1 + impulse + shock output rows, starting at first[i]
+    size = 1 + impulse.astype(np.intp) + shock
+    first = np.cumsum(size) - size
+    total = int(size.sum())
+
+    amount = np.empty(total, dtype=np.float64)
+    category = np.empty(total, dtype=np.uint8)
+    receiver = np.empty(total, dtype=np.int32)
+
+    amount[first] = scaled
+    category[first] = ledger.category
+    receiver[first] = ledger.receiver
+
+    at = first[impulse] + 1
+    amount[at] = impulse_amount[impulse]
+    category[at] = _IMPULSE_IDS[impulse_category[impulse]]
+    receiver[at] = len(ledger.receivers)
+
+    at = first[shock] + 1 + impulse[shock]
+    amount[at] = shock_amount[shock]
+    category[at] = CATEGORY_IDS["Lifestyle"]
+    receiver[at] = len(ledger.receivers) + 1
+
+    return amount, category, np.repeat(ledger.day, size), receiver
+
+
+def realism_columns(ledger):
+    """
+    Realism-enhanced rows of `ledger` as TransactionColumns, newest
+    first (same day = ledger order), without building row objects.
+    """
+
+    amount, category, day, receiver = realism_parts(ledger)
+
+    order = np.argsort(-day, kind="stable")
+
+    return TransactionColumns.from_codes(
+        amount[order],
+        category[order],
+        ALLOWED_CATEGORIES,
+        day[order],
+        receiver[order],
+        [*ledger.receivers, IMPULSE_RECEIVER, SHOCK_RECEIVER],
+    )
 
 
 # -----------------------------------
-# MAIN FUNCTION
+# CACHE METRICS
+# -----------------------------------
+def _count(event):
+    inc("plaid_cache_events_total", event=event)
+
+
+def _count_call(endpoint):
+    inc("plaid_api_calls_total", endpoint=endpoint)
+
+
+def cache_stats():
+    counts = counter("plaid_cache_events_total", "event")
+    return {event: counts.get(event, 0) for event in CACHE_EVENTS}
+
+
+def _collect_metrics():
+    for name, value in store.stats().items():
+        yield f"user_store_{name}", "gauge", {}, value
+
+
+register_collector(_collect_metrics)
+
+
+# -----------------------------------
+# CACHE LOOKUP (stale-while-revalidate)
 # -----------------------------------
-def get_plaid_transactions():
+def _cached(user_id):
+    """
+    Entry that can be served right now, or None.
+    Past the soft TTL it is still served and refreshed in the background.
+    """
+
+    entry = store.get(user_id)
+    if entry is None:
+        return None
+
+    age = entry.age()
+
+    if age < CACHE_SOFT_TTL:
+        _count("hits")
+        return entry
+
+    if age < CACHE_HARD_TTL:
+        _count("stale_hits")
+        _schedule_refresh(user_id)
+        return entry
+
+    return None
+
+
+def _fresh(user_id):
+    entry = store.get(user_id)
+    if entry is not None and entry.age() < CACHE_SOFT_TTL:
+        return entry
+    return None
+
+
+# -----------------------------------
+# BACKGROUND REFRESH
+# -----------------------------------
+_refresh_pool = ThreadPoolExecutor(
+    max_workers=REFRESH_WORKERS,
+    thread_name_prefix="plaid-refresh",
+)
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+
+def _schedule_refresh(user_id):
+
+    # at most one queued refresh per user
+    with _refreshing_lock:
+        if user_id in _refreshing:
+            return
+        _refreshing.add(user_id)
 
-    global CACHE_TRANSACTIONS, CACHE_TIME
+    _refresh_pool.submit(_refresh, user_id)
+
+
+def _refresh(user_id):
+    try:
+        access_token = session.get_access_token(user_id)
+        if not access_token:
+            return
+
+        with store.lock(user_id):
+
+            # a request may have refreshed it already
+            if _fresh(user_id) is not None:
+                return
+
+            _count("refreshes")
+            _fetch_shared(user_id, access_token)
+
+    finally:
+        with _refreshing_lock:
+            _refreshing.discard(user_id)
+
+
+def get_transaction_entry(user_id=DEFAULT_USER_ID):
+    """
+    Cache entry for the user (fetching if needed), or None
+    when the user has no linked account.
+    """
 
     # -------------------------------
     # CACHE CHECK
     # -------------------------------
-    if CACHE_TRANSACTIONS and CACHE_TIME:
-        elapsed = (datetime.now() - CACHE_TIME).seconds
-        if elapsed < CACHE_DURATION:
+    entry = _cached(user_id)
+    if entry is not None:
+        if DEBUG:
             print("⚡ Using cached Plaid data")
-            return CACHE_TRANSACTIONS
+        return entry
 
     # -------------------------------
-    # ACCESS TOKEN CHECK
+    # ONE FETCH PER USER AT A TIME
     # -------------------------------
-    if not hasattr(session, "SAVED_ACCESS_TOKEN") or not session.SAVED_ACCESS_TOKEN:
-        print("No Plaid access token found")
-        return []
+    with store.lock(user_id):
+
+        # another request may have filled the cache while we waited
+        entry = _fresh(user_id)
+        if entry is not None:
+            return entry
+
+        # -------------------------------
+        # COLD START -> LOCAL DISK READ
+        # (served as stale, refreshed in background;
+        # past the hard TTL it only seeds the sync below)
+        # -------------------------------
+        if store.get(user_id) is None:
+            entry = _load_from_disk(user_id)
+            if entry is not None and entry.age() < CACHE_HARD_TTL:
+                _count("disk_hits")
+                _schedule_refresh(user_id)
+                return entry
+
+        # -------------------------------
+        # ACCESS TOKEN CHECK
+        # -------------------------------
+        access_token = session.get_access_token(user_id)
+        if not access_token:
+            if DEBUG:
+                print("No Plaid access token found")
+            return None
+
+        _count("misses")
+        return _fetch_shared(user_id, access_token)
+
+
+# -----------------------------------
+# ACROSS WORKER PROCESSES (shared cache)
+# -----------------------------------
+def _fetch_shared(user_id, access_token):
+    """
+    _fetch_and_cache, coordinated with the other workers: a newer
+    copy saved by another worker is loaded instead of calling Plaid,
+    and only the lease holder fetches; the rest wait for its result.
+    Caller holds store.lock(user_id).
+    """
+
+    backend = get_backend()
+    if not backend.shared:
+        return _fetch_and_cache(user_id, access_token)
+
+    while not backend.acquire(user_id):
+        _count("lease_waits")
+        time.sleep(POLL_SECONDS)
+
+        entry = _load_shared(user_id)
+        if entry is not None and entry.age() < CACHE_SOFT_TTL:
+            return entry
 
     try:
+        # the previous holder may have saved just before we got the lease
+        entry = _load_shared(user_id)
+        if entry is not None and entry.age() < CACHE_SOFT_TTL:
+            return entry
 
-        today = date.today()
-        start_date = today - timedelta(days=90)
+        return _fetch_and_cache(user_id, access_token)
 
-        request = TransactionsGetRequest(
-            access_token=session.SAVED_ACCESS_TOKEN,
-            start_date=start_date,
-            end_date=today,
-        )
+    finally:
+        backend.release(user_id)
+
+
+def _load_shared(user_id):
+    """Cached entry, reloaded first when another worker saved a newer one."""
 
-        response = client.transactions_get(request)
-        transactions = response.to_dict()["transactions"]
+    entry = store.get(user_id)
 
+    try:
+        stamp = get_backend().stamp(user_id)
     except Exception as e:
-        print("Plaid fetch error:", e)
+        print("Shared cache read error:", e)
+        return entry
+
+    if stamp is None:
+        return entry
+
+    if entry is not None and entry.stamp is not None and entry.stamp >= stamp:
+        return entry
+
+    loaded = _load_from_disk(user_id, entry)
+    if loaded is None:
+        return entry
+
+    _count("shared_hits")
+    return loaded
+
+
+# -----------------------------------
+# ASYNC PATH (FastAPI routes)
+# -----------------------------------
+_inflight = {}
+
+
+async def get_transaction_entry_async(user_id=DEFAULT_USER_ID):
+    """
+    Non-blocking version of get_transaction_entry.
+
+    The Plaid round trip runs in a worker thread, and concurrent
+    cache misses for the same user share one upstream call.
+    """
+
+    entry = _cached(user_id)
+    if entry is not None:
+        return entry
+
+    task = _inflight.get(user_id)
+
+    if task is None:
+        task = asyncio.ensure_future(
+            asyncio.to_thread(get_transaction_entry, user_id)
+        )
+        _inflight[user_id] = task
+        task.add_done_callback(lambda _: _inflight.pop(user_id, None))
+
+    # one cancelled waiter must not cancel the shared fetch
+    return await asyncio.shield(task)
+
+
+# -----------------------------------
+# MAIN FUNCTION
+# -----------------------------------
+def get_plaid_transactions(user_id=DEFAULT_USER_ID):
+    """
+    Cleaned + realism-enhanced transactions, newest first.
+    """
+
+    entry = get_transaction_entry(user_id)
+    if entry is None:
         return []
 
-    cleaned = []
+    # dict rows are rebuilt from the cached columns
+    return entry.columns.rows()
+
+
+def get_cleaned_transactions(user_id=DEFAULT_USER_ID):
+    """
+    Cleaned transactions in the window, BEFORE the realism engine.
+    Shares the cache (and the sync cursor) with get_plaid_transactions.
+    """
+
+    entry = get_transaction_entry(user_id)
+    if entry is None:
+        return []
+
+    return entry.ledger.since(_window_start_day()).rows()
+
+
+def get_expense_keyset(user_id=DEFAULT_USER_ID):
+    """
+    Expenses in the window in (date, transaction_id) order,
+    for keyset pagination. Built once per cached version.
+    """
+
+    entry = get_transaction_entry(user_id)
+    if entry is None:
+        return ExpenseKeyset.from_ledger(Ledger.empty())
+
+    keyset = entry.keyset
+    if keyset is None:
+        keyset = store.set_keyset(entry, ExpenseKeyset.from_ledger(entry.ledger))
+
+    return keyset
+
+
+class ExpenseKeyset:
+    """
+    Expenses in the window sorted by (date, transaction_id):
+    index = their row numbers in `ledger`, day = their dates.
+    Pages walk it newest first; a cursor is the last key served.
+    """
+
+    __slots__ = ("ledger", "index", "day")
+
+    def __init__(self, ledger, index, day):
+        self.ledger = ledger
+        self.index = index
+        self.day = day
+
+    @classmethod
+    def from_ledger(cls, ledger):
+
+        rows = np.flatnonzero(
+            (ledger.amount > 0) & (ledger.day >= _window_start_day())
+        )
+        index = rows[np.lexsort((ledger.ids[rows], ledger.day[rows]))]
+
+        return cls(ledger, index.astype(np.int32), ledger.day[index])
+
+    def nbytes(self):
+        return self.index.nbytes + self.day.nbytes
+
+    def page(self, before=None, limit=100):
+        """
+        Up to `limit` rows older than key `before` (None = newest),
+        newest first. RETURNS rows, key of the last row (or None at the end).
+        """
+
+        end = len(self.index) if before is None else self._position(before)
+        start = max(0, end - limit)
+
+        rows = self.ledger.rows(self.index[start:end][::-1])
+        last = self._key(start) if start > 0 and rows else None
+
+        return rows, last
+
+    def _position(self, before):
+        """bisect_left of key (date, transaction_id)."""
+
+        day = day_number(before[0])
+        low, high = np.searchsorted(self.day, [day, day + 1])
+
+        # same date -> by transaction_id, a few rows at most
+        same_day = self.ledger.ids[self.index[low:high]].tolist()
+
+        return int(low) + bisect_left(same_day, before[1].encode())
+
+    def _key(self, i):
+        return (
+            str(date(1970, 1, 1) + timedelta(days=int(self.day[i]))),
+            self.ledger.transaction_ids(self.index[i:i + 1])[0],
+        )
+
+
+def _window_start():
+    return str(date.today() - timedelta(days=WINDOW_DAYS))
+
+
+def _window_start_day():
+    return day_number(_window_start())
+
+
+# -----------------------------------
+# FULL 90-DAY PULL (/transactions/get)
+# -----------------------------------
+def _get_page(access_token, start_date, end_date, offset):
+    from plaid.model.transactions_get_request import TransactionsGetRequest
+    from plaid.model.transactions_get_request_options import (
+        TransactionsGetRequestOptions,
+    )
+
+    request = TransactionsGetRequest(
+        access_token=access_token,
+        start_date=start_date,
+        end_date=end_date,
+        options=TransactionsGetRequestOptions(
+            count=GET_PAGE_SIZE,
+            offset=offset,
+        ),
+    )
+
+    _count_call("transactions_get")
+    return get_client().transactions_get(request)
+
+
+def _clean_page(transactions, ledger):
 
     # -------------------------------
     # CLEAN + FILTER
     # KEEP BOTH income + expenses
     # -------------------------------
-    for t in transactions:
+    with stage("clean"):
+        clean_into(transactions, ledger)
 
-        amount = t["amount"]
 
-        plaid_category = (
-            t["personal_finance_category"]["primary"]
-            if t.get("personal_finance_category")
-            else None
-        )
+def _fetch_full(access_token):
+    """
+    First page reveals total_transactions, the remaining pages
+    are fetched concurrently and cleaned as each one arrives.
+    """
+
+    today = date.today()
+    start_date = today - timedelta(days=WINDOW_DAYS)
+
+    ledger = {}
 
-        ui_category = CATEGORY_MAP.get(plaid_category)
+    with stage("plaid_fetch"):
+        first = _get_page(access_token, start_date, today, 0)
+    _clean_page(first["transactions"], ledger)
 
-        if ui_category not in ALLOWED_CATEGORIES:
-            continue
+    total = first["total_transactions"]
 
-        merchant = t.get("merchant_name") or t.get("name")
+    futures = [
+        _page_pool.submit(_get_page, access_token, start_date, today, offset)
+        for offset in range(GET_PAGE_SIZE, total, GET_PAGE_SIZE)
+    ]
 
-        cleaned.append(
-            {
-                "date": str(t["date"]),
-                "receiver": merchant,
-                "amount": round(amount, 2),  # KEEP SIGN
-                "category": ui_category,
-            }
+    # fetch time = waiting for the pages still in flight
+    pending = as_completed(futures)
+    while True:
+        with stage("plaid_fetch"):
+            future = next(pending, None)
+        if future is None:
+            break
+        _clean_page(future.result()["transactions"], ledger)
+
+    return Ledger.from_items(ledger.items()), None
+
+
+# -----------------------------------
+# INCREMENTAL SYNC (/transactions/sync)
+# -----------------------------------
+def _fetch_sync(access_token, ledger, cursor):
+    """
+    Pulls only the changes since `cursor` and applies them
+    to `ledger` (a new Ledger is returned). Empty cursor = initial
+    full sync.
+    """
+
+    for attempt in range(SYNC_MAX_RESTARTS):
+        try:
+            with stage("plaid_fetch"):
+                added, modified, removed, next_cursor = _sync_pages(
+                    access_token, cursor
+                )
+            break
+        except Exception as e:
+            # Plaid asks to restart from the first cursor
+            # when data changes mid-pagination
+            if "TRANSACTIONS_SYNC_MUTATION_DURING_PAGINATION" not in str(e):
+                raise
+            if attempt == SYNC_MAX_RESTARTS - 1:
+                raise
+
+    # -------------------------------
+    # APPLY DELTAS
+    # (rows outside the UI categories count as removed)
+    # -------------------------------
+    with stage("clean"):
+        changes = [
+            (t["transaction_id"], clean_transaction(t))
+            for t in (*added, *modified)
+        ]
+        changes += [(t["transaction_id"], None) for t in removed]
+
+        ledger = ledger.with_changes(changes)
+
+    if DEBUG:
+        print(
+            f"Plaid sync: +{len(added)} ~{len(modified)} -{len(removed)}"
         )
 
+    return ledger, next_cursor
+
+
+def _sync_pages(access_token, cursor):
+    from plaid.model.transactions_sync_request import TransactionsSyncRequest
+
+    added, modified, removed = [], [], []
+
+    has_more = True
+
+    while has_more:
+
+        if cursor:
+            request = TransactionsSyncRequest(
+                access_token=access_token,
+                cursor=cursor,
+                count=SYNC_PAGE_SIZE,
+            )
+        else:
+            request = TransactionsSyncRequest(
+                access_token=access_token,
+                count=SYNC_PAGE_SIZE,
+            )
+
+        _count_call("transactions_sync")
+        response = get_client().transactions_sync(request)
+
+        added.extend(response["added"])
+        modified.extend(response["modified"])
+        removed.extend(response["removed"])
+
+        has_more = response["has_more"]
+        cursor = response["next_cursor"]
+
+    return added, modified, removed, cursor
+
+
+# -----------------------------------
+# FETCH + BUILD CACHE ENTRY
+# -----------------------------------
+def _fetch_and_cache(user_id, access_token):
+
+    base = store.get(user_id)
+    old_ledger = base.ledger if base else Ledger.empty()
+
+    try:
+
+        if TRANSACTIONS_MODE == "sync":
+            ledger, cursor = _fetch_sync(
+                access_token, old_ledger, base.cursor if base else None
+            )
+        else:
+            ledger, cursor = _fetch_full(access_token)
+
+            # keep history older than the pulled window
+            if base is not None:
+                ledger = old_ledger.before(_window_start_day()).update(ledger)
+
+    except Exception as e:
+        print("Plaid fetch error:", e)
+        _count("fetch_errors")
+        return base
+
+    upserts, deletes = diff(old_ledger, ledger)
+
+    # no-op sync: nothing to write, and the shared stamp stays put
+    # so other workers keep their copies (and versions)
+    if (
+        base is not None
+        and not len(upserts)
+        and not deletes
+        and cursor == base.cursor
+    ):
+        stamp = base.stamp
+    else:
+        stamp = _persist(user_id, upserts, deletes, cursor)
+
     # -------------------------------
-    # APPLY REALISM ENGINE
+    # STREAMING ANOMALIES
+    # new rows only -> O(delta) update,
+    # edits / removals -> replay the ledger
     # -------------------------------
-    cleaned = add_behavior_realism(cleaned)
+    if base is None or deletes or old_ledger.overlaps(upserts):
+        detector.rebuild(user_id, ledger.rows())
+    elif len(upserts):
+        detector.observe(user_id, upserts.rows())
 
     # -------------------------------
-    # SORT NEWEST FIRST
+    # NOTHING CHANGED -> KEEP VERSION
+    # (a moved window start re-windows the columns below)
     # -------------------------------
-    cleaned.sort(key=lambda x: x["date"], reverse=True)
+    start_day = _window_start_day()
+
+    if _unchanged(base, upserts, deletes, start_day):
+        return _keep(base, ledger, cursor, stamp)
+
+    # -------------------------------
+    # AGGREGATES: O(delta) on sync,
+    # full rebuild when the ledger was re-pulled
+    # -------------------------------
+    aggregates = None
+    if (
+        TRANSACTIONS_MODE == "sync"
+        and base is not None
+        and base.aggregates is not None
+    ):
+        aggregates = base.aggregates
+        with stage("aggregation"):
+            aggregates.apply(old_ledger, upserts, deletes, start_day)
+
+    entry = _build_entry(user_id, ledger, cursor, aggregates, stamp)
+
+    if DEBUG:
+        print(f"Plaid transactions fetched: {len(entry.columns)}")
+
+    return entry
+
+
+def _unchanged(base, upserts, deletes, start_day):
+    """True when `base` still holds the right rows for this window."""
+    return (
+        base is not None
+        and not len(upserts)
+        and not deletes
+        and base.aggregates is not None
+        and base.aggregates.start == start_day
+    )
+
+
+def _keep(base, ledger, cursor, stamp):
+    """`base` refreshed in place: same version, columns and aggregates."""
+    return store.put(
+        base.user_id,
+        base.columns,
+        ledger,
+        cursor,
+        base.version,
+        base.aggregates,
+        base.totals,
+        stamp,
+    )
+
+
+def _build_entry(user_id, ledger, cursor, aggregates=None, stamp=None):
+
+    # same window as the aggregates were moved to
+    start_day = aggregates.start if aggregates else _window_start_day()
+
+    # -------------------------------
+    # APPLY REALISM ENGINE
+    # (columns, newest first)
+    # -------------------------------
+    with stage("realism"):
+        columns = realism_columns(ledger.since(start_day))
+
+    with stage("aggregation"):
+        if aggregates is None:
+            aggregates = TransactionAggregates.from_ledger(
+                ledger, start_day, realism_parts
+            )
+
+        totals = aggregates.totals(columns)
 
     # -------------------------------
     # SAVE CACHE
     # -------------------------------
-    CACHE_TRANSACTIONS = cleaned
-    CACHE_TIME = datetime.now()
+    return store.put(
+        user_id,
+        columns,
+        ledger,
+        cursor,
+        aggregates=aggregates,
+        totals=totals,
+        stamp=stamp,
+    )
+
+
+# -----------------------------------
+# LOCAL PERSISTENT STORE
+# -----------------------------------
+def _load_from_disk(user_id, current=None):
+    """
+    Entry from the backend. When `current` (the cached entry) already
+    holds the same rows, it is kept under its version instead of being
+    rebuilt, so snapshots and ETags stay valid.
+    """
+
+    backend = get_backend()
+
+    try:
+        ledger, cursor, stamp = backend.load(user_id)
+    except Exception as e:
+        print("Transaction DB read error:", e)
+        return None
+
+    if ledger is None:
+        return None
+
+    if current is not None and _unchanged(
+        current, *diff(current.ledger, ledger), _window_start_day()
+    ):
+        entry = _keep(current, current.ledger, cursor, stamp)
+    else:
+        entry = _build_entry(user_id, ledger, cursor, stamp=stamp)
+        detector.rebuild(user_id, ledger.rows())
+
+    if backend.shared:
+        # saved by a worker's fetch: as old as that fetch
+        entry.fetched_at -= max(0.0, time.time() - stamp)
+    else:
+        # treat as stale: serve now, refresh from Plaid next
+        entry.fetched_at -= CACHE_SOFT_TTL
 
-    print(f"Plaid transactions fetched: {len(cleaned)}")
+    return entry
 
-    return cleaned
\ No newline at end of file
+
+def _persist(user_id, upserts, deletes, cursor):
+
+    try:
+        return get_backend().save(user_id, upserts, deletes, cursor)
+    except Exception as e:
+        print("Transaction DB write error:", e)
+        return None
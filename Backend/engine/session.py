@@ -2,5 +2,47 @@
 
 # engine/session.py
 
-# Global runtime storage for Plaid token
-SAVED_ACCESS_TOKEN = None
\ No newline at end of file
+import time
+
+from engine.shared_cache import TOKEN_TTL, get_backend
+from engine.user_store import store, DEFAULT_USER_ID
+
+
+# user_id -> time.monotonic() of the last shared-cache token read
+_token_checked = {}
+
+
+# Runtime storage for Plaid tokens (one per user)
+def get_access_token(user_id=DEFAULT_USER_ID):
+    token = store.get_token(user_id)
+
+    backend = get_backend()
+    if not backend.shared:
+        return token
+
+    # another worker may have linked (or re-linked) the user
+    now = time.monotonic()
+    checked = _token_checked.get(user_id)
+    if token is not None and checked is not None and now - checked < TOKEN_TTL:
+        return token
+
+    shared = backend.get_token(user_id)
+    _token_checked[user_id] = now
+
+    if shared is None or shared == token:
+        return token
+
+    # first sight keeps any cached rows, a new item drops them
+    store.set_token(user_id, shared, keep_cache=token is None)
+
+    return shared
+
+
+def save_access_token(access_token, user_id=DEFAULT_USER_ID):
+    store.set_token(user_id, access_token)
+
+    backend = get_backend()
+
+    # stored rows + cursor belonged to the previously linked item
+    backend.forget(user_id)
+    backend.set_token(user_id, access_token)
@@ -0,0 +1,133 @@
+# backend/engine/shared_cache.py
+#
+# Cache state shared between worker processes.
+#
+# Each worker keeps its own in-process copy (user_store = L1). The
+# backend here is what the workers share: access tokens, each user's
+# cleaned ledger + sync cursor, a write stamp and a fetch lease.
+#
+#   local  (default) nothing is shared; rows still go to txn_db so
+#          a restart is a local read
+#   sqlite tokens / ledgers / leases in the txn_db file (TXN_DB_PATH),
+#          for `uvicorn main:app --workers N`
+#
+#   SHARED_CACHE=sqlite uvicorn main:app --workers 4
+#
+# Other stores plug in through set_backend().
+
+import os
+import threading
+import uuid
+
+import engine.txn_db as txn_db
+
+
+SHARED_CACHE = os.getenv("SHARED_CACHE", "local")
+
+# how long one process may hold a user's fetch before others take over
+LEASE_SECONDS = float(os.getenv("SHARED_CACHE_LEASE_SECONDS", "30"))
+
+# how often a waiting process checks for another process's result
+POLL_SECONDS = float(os.getenv("SHARED_CACHE_POLL_SECONDS", "0.05"))
+
+# how long a worker trusts its copy of a token before re-reading it
+TOKEN_TTL = float(os.getenv("SHARED_CACHE_TOKEN_TTL", "5"))
+
+
+# ======================================
+# BACKENDS
+# ======================================
+class LocalCache:
+    """
+    Backend interface, and the single-process implementation:
+    rows + cursor persist to txn_db, nothing else leaves the process.
+
+    load(user_id)   -> (ledger, cursor, stamp) or (None, None, None)
+    save(...)       -> stamp of the write
+    stamp(user_id)  -> stamp of the last write (None = not shared)
+    acquire / release: lease so one process fetches a user at a time
+    """
+
+    shared = False
+
+    def load(self, user_id):
+        return txn_db.load_ledger(user_id)
+
+    def save(self, user_id, upserts, deletes, cursor):
+        return txn_db.save_changes(user_id, upserts, deletes, cursor)
+
+    def forget(self, user_id):
+        txn_db.forget_user(user_id)
+
+    def stamp(self, user_id):
+        return None
+
+    def get_token(self, user_id):
+        return None
+
+    def set_token(self, user_id, access_token):
+        pass
+
+    def acquire(self, user_id):
+        return True
+
+    def release(self, user_id):
+        pass
+
+
+class SQLiteCache(LocalCache):
+    """Everything in the txn_db file, one WAL database for all workers."""
+
+    shared = True
+
+    def __init__(self):
+        if not txn_db.enabled():
+            raise RuntimeError("SHARED_CACHE=sqlite needs TXN_DB_PATH")
+
+        # lease owner: this process
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+    def stamp(self, user_id):
+        return txn_db.updated_at(user_id)
+
+    def get_token(self, user_id):
+        return txn_db.load_token(user_id)
+
+    def set_token(self, user_id, access_token):
+        txn_db.save_token(user_id, access_token)
+
+    def acquire(self, user_id):
+        return txn_db.acquire_lease(user_id, self.owner, LEASE_SECONDS)
+
+    def release(self, user_id):
+        txn_db.release_lease(user_id, self.owner)
+
+
+BACKENDS = {
+    "local": LocalCache,
+    "sqlite": SQLiteCache,
+}
+
+
+# ======================================
+# ACTIVE BACKEND
+# ======================================
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    global _backend
+
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = BACKENDS[SHARED_CACHE]()
+
+    return _backend
+
+
+def set_backend(backend):
+    """Swap the backend (another store, or tests)."""
+    global _backend
+    _backend = backend
@@ -0,0 +1,202 @@
+# backend/engine/snapshot.py
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from engine.columnar import (
+    TransactionColumns,
+    category_totals,
+    monthly_totals,
+    roundups,
+)
+
+from engine.plaid_service import (
+    get_transaction_entry,
+    get_transaction_entry_async,
+)
+from engine.metrics import stage
+from engine.user_store import DEFAULT_USER_ID, MAX_CACHED_USERS
+
+
+# ======================================
+# ANALYTICS SNAPSHOT
+# ======================================
+class AnalyticsSnapshot:
+    """
+    Everything the four engines need from one transaction set,
+    computed once with vectorised group-bys over its columns.
+
+    Engine responses (and the ML calls inside them) are memoised
+    on the snapshot, so they run once per transaction-set version.
+
+    With `totals` (materialised by the fetch path) nothing here
+    scales with history length; row-level roundups are built lazily.
+
+    Built from dict rows (`transactions`) or straight from the
+    cached TransactionColumns (`columns`).
+    """
+
+    def __init__(self, transactions=None, user_id=DEFAULT_USER_ID, version=0,
+                 columns=None, totals=None):
+
+        if columns is None:
+            columns = TransactionColumns.from_rows(transactions or [])
+
+        self.user_id = user_id
+        self.version = version
+        self.count = len(columns)
+
+        self._columns = columns
+        self._roundup_rows = None
+
+        self._memo = {}
+        self._memo_lock = threading.RLock()
+
+        if totals is not None:
+            self.category_totals = totals.category_totals
+            self.monthly_totals = totals.monthly_totals
+            self.expense_total = totals.expense_total
+            self.net_total = totals.net_total
+            self.total_saved = totals.total_saved
+            return
+
+        cols = self._columns
+        amount = cols.amount
+
+        self.category_totals = category_totals(cols)
+        self.monthly_totals = monthly_totals(cols)
+        self.expense_total = float(amount[amount > 0].sum())
+        self.net_total = float(amount.sum())
+
+        roundup, index = self._roundups()
+        self.total_saved = float(roundup[index].sum())
+
+    def _roundups(self):
+        """Roundup per row + valid rows newest first (expenses only)."""
+
+        if self._roundup_rows is None:
+            cols = self._columns
+            roundup, valid = roundups(cols)
+
+            index = np.flatnonzero(valid)
+
+            # newest first, ties keep list order
+            index = index[np.argsort(-cols.day[index], kind="stable")]
+
+            self._roundup_rows = (roundup, index)
+
+        return self._roundup_rows
+
+    def recent_roundups(self, limit):
+        """Newest `limit` roundups as UI rows."""
+
+        roundup, index = self._roundups()
+
+        index = index[:limit]
+
+        return [
+            {
+                "date": t["date"],
+                "merchant": t["receiver"],
+                "amount": round(t["amount"], 2),
+                "roundup": r,
+            }
+            for t, r in zip(
+                self._columns.rows(index), roundup[index].tolist()
+            )
+        ]
+
+    # -------------------------------
+    # MEMOISED RESULTS
+    # -------------------------------
+    def memoised(self, key):
+        return key in self._memo
+
+    def memo(self, key, build):
+        """Returns build(self), computing it once per snapshot."""
+
+        if key in self._memo:
+            return self._memo[key]
+
+        with self._memo_lock:
+            if key not in self._memo:
+                self._memo[key] = build(self)
+            return self._memo[key]
+
+
+# ======================================
+# SNAPSHOT CACHE (one per user)
+# ======================================
+_snapshots = OrderedDict()
+_snapshots_lock = threading.Lock()
+_build_locks = {}
+
+
+def get_snapshot(user_id=DEFAULT_USER_ID):
+    """
+    Snapshot for the user's current transaction set.
+    Rebuilt only when the set's version changes.
+    """
+
+    try:
+        entry = get_transaction_entry(user_id)
+    except Exception as e:
+        print("Plaid fetch error:", e)
+        entry = None
+
+    return _snapshot_for(user_id, entry)
+
+
+async def get_snapshot_async(user_id=DEFAULT_USER_ID):
+    """Same as get_snapshot, without blocking the event loop on Plaid."""
+
+    try:
+        entry = await get_transaction_entry_async(user_id)
+    except Exception as e:
+        print("Plaid fetch error:", e)
+        entry = None
+
+    return _snapshot_for(user_id, entry)
+
+
+def _snapshot_for(user_id, entry):
+
+    if entry is None:
+        return AnalyticsSnapshot([], user_id)
+
+    # keyed by (user, transaction-set version)
+    with _snapshots_lock:
+        snapshot = _snapshots.get(user_id)
+        if snapshot is not None and snapshot.version == entry.version:
+            _snapshots.move_to_end(user_id)
+            return snapshot
+
+        build_lock = _build_locks.setdefault(user_id, threading.Lock())
+
+    # one build per user at a time
+    with build_lock:
+
+        with _snapshots_lock:
+            snapshot = _snapshots.get(user_id)
+            if snapshot is not None and snapshot.version == entry.version:
+                return snapshot
+
+        with stage("aggregation"):
+            snapshot = AnalyticsSnapshot(
+                None,
+                user_id,
+                entry.version,
+                entry.columns,
+                entry.totals,
+            )
+
+        with _snapshots_lock:
+            _snapshots[user_id] = snapshot
+            _snapshots.move_to_end(user_id)
+            while len(_snapshots) > MAX_CACHED_USERS:
+                evicted, _ = _snapshots.popitem(last=False)
+                _build_locks.pop(evicted, None)
+
+    return snapshot
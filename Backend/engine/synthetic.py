@@ -0,0 +1,411 @@
+# backend/engine/synthetic.py
+#
+# Seeded synthetic transaction histories for capacity testing.
+#
+# Per user: biweekly payroll (with yearly raises), monthly rent,
+# recurring bills, daily discretionary spend, and the impulse / shock
+# rows and category variance of the realism engine (plaid_service).
+#
+# Output: a directory of part files (Parquet or NDJSON), one part per
+# block of users, written by a process pool. Each user has its own
+# seed, so the output is identical whatever the worker count.
+# The run summary goes to _manifest.json: dataset readers skip "_"
+# files, so pd.read_parquet(output) reads the directory as is.
+#
+#   cd Backend
+#   python -m engine.synthetic -o data/synthetic --users 30000 --years 3
+#   python -m engine.synthetic -o data/synthetic --format ndjson --workers 8
+#
+# Row: user_id, transaction_id, date, receiver, amount (Plaid sign:
+#      income negative), plaid_category, category (UI, null for income)
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from engine.cleaning import ALLOWED_CATEGORIES, CATEGORY_MAP
+from engine.plaid_service import (
+    IMPULSE_CHANCE,
+    IMPULSE_RANGE,
+    REALISM_DEFAULT_VARIANCE,
+    REALISM_VARIANCE,
+    SHOCK_CHANCE,
+    SHOCK_RANGE,
+)
+
+
+# users per part file / per write (row group)
+USERS_PER_PART = 1000
+USERS_PER_WRITE = 100
+
+FORMATS = ("parquet", "ndjson")
+
+# leading "_": ignored by pyarrow / Spark when reading the directory
+MANIFEST_NAME = "_manifest.json"
+
+
+# -----------------------------------
+# CATEGORIES & MERCHANTS
+# -----------------------------------
+PLAID_CATEGORIES = [
+    "INCOME",
+    "RENT_AND_UTILITIES",
+    "LOAN_PAYMENTS",
+    "FOOD_AND_DRINK",
+    "TRANSPORTATION",
+    "GENERAL_MERCHANDISE",
+    "ENTERTAINMENT",
+    "PERSONAL_CARE",
+]
+_CODE = {c: i for i, c in enumerate(PLAID_CATEGORIES)}
+
+# Plaid category code -> UI category code (-1 = income, no UI category)
+_UI_CODE = np.array([
+    ALLOWED_CATEGORIES.index(CATEGORY_MAP[c]) if c in CATEGORY_MAP else -1
+    for c in PLAID_CATEGORIES
+], dtype=np.int8)
+
+# variance bounds per Plaid category, via its UI category
+_VARIANCE = np.array([
+    REALISM_VARIANCE.get(CATEGORY_MAP.get(c), REALISM_DEFAULT_VARIANCE)
+    for c in PLAID_CATEGORIES
+])
+
+# (merchant, category, monthly amount range, subscribe probability)
+RECURRING_BILLS = [
+    ("Con Edison", "RENT_AND_UTILITIES", (60, 180), 0.9),
+    ("Verizon", "RENT_AND_UTILITIES", (40, 110), 0.8),
+    ("Comcast", "RENT_AND_UTILITIES", (50, 90), 0.6),
+    ("Student Loan", "LOAN_PAYMENTS", (150, 450), 0.4),
+    ("Netflix", "ENTERTAINMENT", (10, 23), 0.6),
+    ("Spotify", "ENTERTAINMENT", (10, 17), 0.5),
+    ("Planet Fitness", "PERSONAL_CARE", (10, 60), 0.3),
+]
+
+# category -> (share of daily spend, amount range, merchants)
+DISCRETIONARY = {
+    "FOOD_AND_DRINK": (0.45, (4, 70), [
+        "Starbucks", "Whole Foods", "Trader Joe's", "Chipotle",
+        "McDonald's", "DoorDash",
+    ]),
+    "TRANSPORTATION": (0.20, (3, 60), ["Uber", "Lyft", "Shell", "MTA"]),
+    "GENERAL_MERCHANDISE": (0.20, (10, 250), ["Amazon", "Target", "Walmart"]),
+    "ENTERTAINMENT": (0.10, (8, 120), ["AMC Theatres", "Steam", "Ticketmaster"]),
+    "PERSONAL_CARE": (0.05, (10, 90), ["CVS", "Sephora"]),
+}
+
+# realism engine's impulse categories (Food, Shopping, Lifestyle)
+IMPULSE_PLAID = ["FOOD_AND_DRINK", "GENERAL_MERCHANDISE", "ENTERTAINMENT"]
+
+RECEIVERS = [
+    "Payroll", "Rent",
+    *(bill[0] for bill in RECURRING_BILLS),
+    *(m for _, _, merchants in DISCRETIONARY.values() for m in merchants),
+    "Impulse Purchase", "Unexpected Expense",
+]
+_RECEIVER = {r: i for i, r in enumerate(RECEIVERS)}
+
+_SPEND_CODES = np.array([_CODE[c] for c in DISCRETIONARY])
+_SPEND_SHARE = np.array([v[0] for v in DISCRETIONARY.values()])
+_SPEND_RANGE = np.array([v[1] for v in DISCRETIONARY.values()], dtype=float)
+_SPEND_MERCHANTS = [
+    np.array([_RECEIVER[m] for m in v[2]]) for v in DISCRETIONARY.values()
+]
+_IMPULSE_CODES = np.array([_CODE[c] for c in IMPULSE_PLAID])
+
+# mean discretionary purchase, to turn a monthly budget into a daily rate
+_SPEND_MEAN = float(_SPEND_SHARE @ _SPEND_RANGE.mean(axis=1))
+
+
+# ======================================
+# ONE USER
+# ======================================
+def _vary(rng, amount, codes):
+    """Category variance of the realism engine."""
+    bounds = _VARIANCE[codes]
+    return amount * rng.uniform(bounds[:, 0], bounds[:, 1])
+
+
+def generate_user(index, seed=0, years=3, end=None):
+    """
+    Columns of one user's history over `years` years up to `end`
+    (default today), oldest first:
+    day (int, days since epoch), amount, category code, receiver code.
+    """
+
+    rng = np.random.default_rng([seed, index])
+
+    end = np.datetime64(end or date.today(), "D")
+    start = end - np.timedelta64(int(365.25 * years), "D")
+    first, last = start.astype(np.int64), end.astype(np.int64)
+
+    days, amounts, categories, receivers = [], [], [], []
+
+    def add(day, amount, code, receiver):
+        days.append(day)
+        amounts.append(amount)
+        categories.append(np.broadcast_to(code, day.shape))
+        receivers.append(np.broadcast_to(receiver, day.shape))
+
+    # -------------------------
+    # PAYROLL (biweekly, yearly raise)
+    # -------------------------
+    salary = rng.lognormal(np.log(4500), 0.35)   # monthly net
+    raise_rate = rng.uniform(0.0, 0.05)
+
+    pay_days = np.arange(first + rng.integers(14), last + 1, 14)
+    elapsed = (pay_days - first) // 365
+    pay = salary * 12 / 26 * (1 + raise_rate) ** elapsed
+    add(pay_days, -pay * rng.uniform(0.97, 1.03, len(pay_days)),
+        _CODE["INCOME"], _RECEIVER["Payroll"])
+
+    # -------------------------
+    # MONTHLY: RENT + RECURRING BILLS
+    # -------------------------
+    months = np.arange(
+        start.astype("datetime64[M]"), end.astype("datetime64[M]") + 1
+    ).astype("datetime64[D]").astype(np.int64)
+
+    def monthly(base, code, receiver, day_of_month):
+        due = months + day_of_month
+        due = due[(due >= first) & (due <= last)]
+        codes = np.full(len(due), code)
+        add(due, _vary(rng, np.full(len(due), base), codes), code, receiver)
+
+    monthly(salary * rng.uniform(0.25, 0.40), _CODE["RENT_AND_UTILITIES"],
+            _RECEIVER["Rent"], 0)
+
+    for merchant, category, (low, high), chance in RECURRING_BILLS:
+        if rng.random() < chance:
+            monthly(rng.uniform(low, high), _CODE[category],
+                    _RECEIVER[merchant], rng.integers(28))
+
+    # -------------------------
+    # DAILY DISCRETIONARY SPEND
+    # -------------------------
+    # 25-55% of net pay goes to day-to-day spending
+    budget = salary * rng.uniform(0.25, 0.55)
+    per_day = rng.poisson(budget * 12 / 365 / _SPEND_MEAN, last - first + 1)
+    spend_days = np.repeat(np.arange(first, last + 1), per_day)
+    n = len(spend_days)
+
+    kind = rng.choice(len(_SPEND_CODES), size=n, p=_SPEND_SHARE)
+    codes = _SPEND_CODES[kind]
+    spend = rng.uniform(_SPEND_RANGE[kind, 0], _SPEND_RANGE[kind, 1])
+
+    merchant = np.empty(n, dtype=np.int64)
+    for k, pool in enumerate(_SPEND_MERCHANTS):
+        at = kind == k
+        merchant[at] = pool[rng.integers(len(pool), size=int(at.sum()))]
+
+    add(spend_days, _vary(rng, spend, codes), codes, merchant)
+
+    # -------------------------
+    # IMPULSE / SHOCK (realism engine rates, per expense row)
+    # -------------------------
+    expense_days = np.concatenate(days[1:])
+
+    impulse_days = expense_days[rng.random(len(expense_days)) < IMPULSE_CHANCE]
+    add(impulse_days,
+        rng.uniform(*IMPULSE_RANGE, len(impulse_days)),
+        _IMPULSE_CODES[rng.integers(len(_IMPULSE_CODES), size=len(impulse_days))],
+        _RECEIVER["Impulse Purchase"])
+
+    shock_days = expense_days[rng.random(len(expense_days)) < SHOCK_CHANCE]
+    add(shock_days,
+        rng.uniform(*SHOCK_RANGE, len(shock_days)),
+        _CODE["ENTERTAINMENT"],
+        _RECEIVER["Unexpected Expense"])
+
+    # -------------------------
+    # ASSEMBLE (oldest first)
+    # -------------------------
+    day = np.concatenate(days)
+    order = np.argsort(day, kind="stable")
+
+    return (
+        day[order],
+        np.round(np.concatenate(amounts)[order], 2),
+        np.concatenate(categories)[order].astype(np.int8),
+        np.concatenate(receivers)[order].astype(np.int16),
+    )
+
+
+def generate_frame(user_indices, seed=0, years=3, end=None):
+    """One DataFrame for a block of users (categoricals, no per-row objects)."""
+
+    parts = [generate_user(i, seed, years, end) for i in user_indices]
+
+    lengths = np.array([len(p[0]) for p in parts])
+    users = np.repeat(np.asarray(user_indices, dtype=np.int64), lengths)
+
+    # transaction ids: user index in the high bits, row number below
+    row = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+
+    category = np.concatenate([p[2] for p in parts])
+
+    return pd.DataFrame({
+        "user_id": pd.Categorical.from_codes(
+            np.repeat(np.arange(len(parts)), lengths),
+            [f"user-{i}" for i in user_indices],
+        ),
+        "transaction_id": (users << 24) | row,
+        "date": np.concatenate([p[0] for p in parts]).astype("datetime64[D]"),
+        "receiver": pd.Categorical.from_codes(
+            np.concatenate([p[3] for p in parts]), RECEIVERS
+        ),
+        "amount": np.concatenate([p[1] for p in parts]),
+        "plaid_category": pd.Categorical.from_codes(category, PLAID_CATEGORIES),
+        "category": pd.Categorical.from_codes(
+            _UI_CODE[category], ALLOWED_CATEGORIES
+        ),
+    })
+
+
+# ======================================
+# ONE PART FILE (runs inside a worker)
+# ======================================
+def write_part(path, user_indices, fmt="parquet", seed=0, years=3, end=None):
+    """Writes one block of users in slices of USERS_PER_WRITE; returns rows."""
+
+    rows = 0
+    blocks = (
+        user_indices[i:i + USERS_PER_WRITE]
+        for i in range(0, len(user_indices), USERS_PER_WRITE)
+    )
+
+    if fmt == "parquet":
+        # optional dependency, only needed for Parquet output
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        try:
+            for block in blocks:
+                table = pa.Table.from_pandas(
+                    generate_frame(block, seed, years, end), preserve_index=False
+                )
+                # dates as date32; user ids as plain strings so every
+                # block has the same schema (Parquet dictionary-encodes)
+                for name, type_ in (("date", pa.date32()),
+                                    ("user_id", pa.string())):
+                    table = table.set_column(
+                        table.schema.get_field_index(name), name,
+                        table[name].cast(type_),
+                    )
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+                rows += table.num_rows
+        finally:
+            if writer is not None:
+                writer.close()
+
+    elif fmt == "ndjson":
+        with open(path, "w") as f:
+            for block in blocks:
+                frame = generate_frame(block, seed, years, end)
+                frame["date"] = np.datetime_as_string(frame["date"].to_numpy(), "D")
+                text = frame.to_json(orient="records", lines=True)
+                f.write(text if text.endswith("\n") else text + "\n")
+                rows += len(frame)
+
+    else:
+        raise ValueError(f"unknown format: {fmt}")
+
+    return rows
+
+
+# ======================================
+# MANY USERS (process pool)
+# ======================================
+def generate(output, users, fmt="parquet", seed=0, years=3, end=None,
+             workers=None, users_per_part=USERS_PER_PART):
+    """
+    Writes `users` users to `output`/part-NNNNN.<fmt> plus MANIFEST_NAME.
+    Returns the manifest.
+    """
+
+    output = Path(output)
+    output.mkdir(parents=True, exist_ok=True)
+
+    end = str(end or date.today())
+    workers = workers or os.cpu_count() or 1
+
+    parts = [
+        (output / f"part-{n:05d}.{fmt}",
+         list(range(first, min(users, first + users_per_part))))
+        for n, first in enumerate(range(0, users, users_per_part))
+    ]
+
+    started = time.perf_counter()
+    rows = {}
+
+    if workers <= 1:
+        for path, indices in parts:
+            rows[path.name] = write_part(path, indices, fmt, seed, years, end)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(write_part, path, indices, fmt, seed, years, end):
+                    path.name
+                for path, indices in parts
+            }
+            for future in as_completed(futures):
+                rows[futures[future]] = future.result()
+
+    manifest = {
+        "format": fmt,
+        "users": users,
+        "years": years,
+        "end": end,
+        "seed": seed,
+        "rows": sum(rows.values()),
+        "parts": dict(sorted(rows.items())),
+        "seconds": round(time.perf_counter() - started, 2),
+    }
+
+    with open(output / MANIFEST_NAME, "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    return manifest
+
+
+# ======================================
+# CLI
+# ======================================
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Synthetic transaction data")
+    parser.add_argument("-o", "--output", required=True, help="output directory")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--years", type=float, default=3)
+    parser.add_argument("--end", help="last date, YYYY-MM-DD (default today)")
+    parser.add_argument("--format", choices=FORMATS, default="parquet")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--users-per-part", type=int, default=USERS_PER_PART)
+    args = parser.parse_args(argv)
+
+    manifest = generate(
+        args.output, args.users, args.format, args.seed, args.years,
+        args.end, args.workers, args.users_per_part,
+    )
+
+    print(
+        f"{manifest['rows']:,} rows, {len(manifest['parts'])} parts "
+        f"in {manifest['seconds']}s -> {args.output}"
+    )
+
+    return manifest
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+# backend/engine/txn_db.py
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from engine.ledger import Ledger
+
+
+# -----------------------------------
+# LOCAL PERSISTENT STORE (SQLite)
+# cleaned transactions + sync cursor per user,
+# so a restart is a local read instead of a Plaid fetch.
+# TXN_DB_PATH="" disables it.
+# -----------------------------------
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+TXN_DB_PATH = os.getenv(
+    "TXN_DB_PATH", str(BASE_DIR / "data" / "transactions.db")
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    user_id        TEXT NOT NULL,
+    transaction_id TEXT NOT NULL,
+    date           TEXT NOT NULL,
+    receiver       TEXT,
+    amount         REAL NOT NULL,
+    category       TEXT NOT NULL,
+    PRIMARY KEY (user_id, transaction_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_transactions_user_date
+    ON transactions (user_id, date);
+
+CREATE INDEX IF NOT EXISTS idx_transactions_user_category
+    ON transactions (user_id, category);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    user_id    TEXT PRIMARY KEY,
+    cursor     TEXT,
+    updated_at REAL NOT NULL
+);
+
+-- shared cache (SHARED_CACHE=sqlite): tokens + cross-process fetch leases
+CREATE TABLE IF NOT EXISTS access_tokens (
+    user_id      TEXT PRIMARY KEY,
+    access_token TEXT NOT NULL,
+    updated_at   REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS fetch_leases (
+    user_id    TEXT PRIMARY KEY,
+    owner      TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+_local = threading.local()
+
+
+def enabled():
+    return bool(TXN_DB_PATH)
+
+
+# -----------------------------------
+# CONNECTION (one per thread)
+# -----------------------------------
+def _connect():
+
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        return conn
+
+    # holds access tokens when the shared cache is on: the database
+    # and its -wal / -shm files are created owner-only
+    previous = os.umask(0o077)
+    try:
+        if TXN_DB_PATH != ":memory:":
+            Path(TXN_DB_PATH).parent.mkdir(parents=True, exist_ok=True)
+
+        conn = sqlite3.connect(TXN_DB_PATH, timeout=30)
+
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+    finally:
+        os.umask(previous)
+
+    # files created before this version may still be world-readable
+    if TXN_DB_PATH != ":memory:":
+        for suffix in ("", "-wal", "-shm"):
+            path = TXN_DB_PATH + suffix
+            if os.path.exists(path) and os.stat(path).st_mode & 0o077:
+                os.chmod(path, 0o600)
+
+    _local.conn = conn
+    return conn
+
+
+# -----------------------------------
+# READ
+# -----------------------------------
+def load_ledger(user_id):
+    """
+    RETURNS:
+        ledger (Ledger), cursor (str or None),
+        updated_at (time.time() of the last save)
+        or (None, None, None) when nothing is stored for the user.
+    """
+
+    if not enabled():
+        return None, None, None
+
+    conn = _connect()
+
+    state = conn.execute(
+        "SELECT cursor, updated_at FROM sync_state WHERE user_id = ?",
+        (user_id,),
+    ).fetchone()
+
+    if state is None:
+        return None, None, None
+
+    rows = conn.execute(
+        "SELECT transaction_id, date, receiver, amount, category "
+        "FROM transactions WHERE user_id = ? ORDER BY date DESC",
+        (user_id,),
+    )
+
+    ledger = Ledger.from_records(rows)
+
+    # updated_at read before the rows: a save in between only makes
+    # the ledger newer than its stamp, never older
+    return ledger, state[0], state[1]
+
+
+def updated_at(user_id):
+    """time.time() of the user's last save, or None."""
+
+    if not enabled():
+        return None
+
+    row = _connect().execute(
+        "SELECT updated_at FROM sync_state WHERE user_id = ?", (user_id,)
+    ).fetchone()
+
+    return row[0] if row else None
+
+
+# -----------------------------------
+# WRITE (one transaction per change set)
+# -----------------------------------
+def save_changes(user_id, upserts, deletes, cursor):
+    """
+    upserts = Ledger (or dict transaction_id -> CleanTransaction)
+    deletes = iterable of transaction_id
+    RETURNS the new updated_at (None when disabled)
+    """
+
+    if not enabled():
+        return None
+
+    conn = _connect()
+    now = time.time()
+
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO transactions "
+            "(user_id, transaction_id, date, receiver, amount, category) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (user_id, transaction_id, t.date, t.receiver,
+                 t.amount, t.category)
+                for transaction_id, t in upserts.items()
+            ],
+        )
+
+        conn.executemany(
+            "DELETE FROM transactions WHERE user_id = ? AND transaction_id = ?",
+            [(user_id, transaction_id) for transaction_id in deletes],
+        )
+
+        conn.execute(
+            "INSERT OR REPLACE INTO sync_state (user_id, cursor, updated_at) "
+            "VALUES (?, ?, ?)",
+            (user_id, cursor, now),
+        )
+
+    return now
+
+
+def forget_user(user_id):
+    """Drops everything stored for the user (e.g. a new item was linked)."""
+
+    if not enabled():
+        return
+
+    conn = _connect()
+
+    with conn:
+        conn.execute("DELETE FROM transactions WHERE user_id = ?", (user_id,))
+        conn.execute("DELETE FROM sync_state WHERE user_id = ?", (user_id,))
+
+
+# -----------------------------------
+# ACCESS TOKENS (shared cache)
+# -----------------------------------
+def load_token(user_id):
+
+    if not enabled():
+        return None
+
+    row = _connect().execute(
+        "SELECT access_token FROM access_tokens WHERE user_id = ?", (user_id,)
+    ).fetchone()
+
+    return row[0] if row else None
+
+
+def save_token(user_id, access_token):
+
+    if not enabled():
+        return
+
+    conn = _connect()
+
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO access_tokens "
+            "(user_id, access_token, updated_at) VALUES (?, ?, ?)",
+            (user_id, access_token, time.time()),
+        )
+
+
+# -----------------------------------
+# FETCH LEASES (one process fetches a user at a time)
+# -----------------------------------
+def acquire_lease(user_id, owner, seconds):
+    """
+    True when `owner` now holds the user's lease: it was free,
+    expired, or already held by `owner`.
+    """
+
+    if not enabled():
+        return True
+
+    conn = _connect()
+    now = time.time()
+
+    with conn:
+        cursor = conn.execute(
+            "INSERT INTO fetch_leases (user_id, owner, expires_at) "
+            "VALUES (?, ?, ?) "
+            "ON CONFLICT (user_id) DO UPDATE SET "
+            "owner = excluded.owner, expires_at = excluded.expires_at "
+            "WHERE fetch_leases.expires_at < ? "
+            "OR fetch_leases.owner = excluded.owner",
+            (user_id, owner, now + seconds, now),
+        )
+
+    return cursor.rowcount == 1
+
+
+def release_lease(user_id, owner):
+
+    if not enabled():
+        return
+
+    conn = _connect()
+
+    with conn:
+        conn.execute(
+            "DELETE FROM fetch_leases WHERE user_id = ? AND owner = ?",
+            (user_id, owner),
+        )
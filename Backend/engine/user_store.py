@@ -0,0 +1,199 @@
+# backend/engine/user_store.py
+
+import itertools
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from engine.ledger import Ledger
+
+
+# -----------------------------------
+# DEFAULTS
+# -----------------------------------
+DEFAULT_USER_ID = "user-123"
+
+MAX_CACHED_USERS = int(os.getenv("MAX_CACHED_USERS", "5000"))
+MAX_CACHED_BYTES = int(os.getenv("MAX_CACHED_BYTES", str(512 << 20)))
+
+# every distinct transaction set gets a new version number
+_versions = itertools.count(1)
+
+
+# -----------------------------------
+# ONE CACHED USER
+# -----------------------------------
+class UserEntry:
+    """
+    Cached transactions of one user plus the time they were fetched.
+
+    columns = realism-enhanced window as TransactionColumns, newest
+              first (the cached transaction set; rows() at the API)
+    ledger  = cleaned rows as a Ledger (columns keyed by transaction_id)
+    cursor  = /transactions/sync cursor the ledger is current to
+    version = changes only when the transaction set changes
+    aggregates = TransactionAggregates kept up to date by the fetch path
+    totals  = AggregateTotals of this version (read by snapshots)
+    keyset  = ExpenseKeyset for paginated reads, built on first use
+    stamp   = shared-cache write this entry reflects (shared_cache)
+    """
+
+    __slots__ = (
+        "user_id", "columns", "fetched_at", "ledger", "cursor",
+        "version", "aggregates", "totals", "keyset", "stamp",
+    )
+
+    def __init__(self, user_id, columns, ledger=None, cursor=None,
+                 version=None, aggregates=None, totals=None, stamp=None):
+        self.user_id = user_id
+        self.columns = columns
+        self.aggregates = aggregates
+        self.totals = totals
+        self.keyset = None
+        self.stamp = stamp
+        self.fetched_at = time.monotonic()
+        self.ledger = ledger if ledger is not None else Ledger.empty()
+        self.cursor = cursor
+        self.version = version if version is not None else next(_versions)
+
+    def age(self):
+        return time.monotonic() - self.fetched_at
+
+    def size(self):
+        """Bytes held: columns, ledger, keyset and aggregates."""
+
+        size = self.columns.nbytes() + self.ledger.nbytes()
+
+        if self.keyset is not None:
+            size += self.keyset.nbytes()
+        if self.aggregates is not None:
+            size += self.aggregates.nbytes()
+
+        return size
+
+
+# -----------------------------------
+# PER-USER STORE (LRU)
+# -----------------------------------
+class UserStore:
+    """
+    Keyed per-user store.
+
+    - access tokens are small and kept for every linked user
+    - cached transactions are bounded by user count and total bytes,
+      least recently used users are evicted first
+    - one lock per user so a slow fetch only blocks that user
+    """
+
+    def __init__(self, max_users=MAX_CACHED_USERS, max_bytes=MAX_CACHED_BYTES):
+        self.max_users = max_users
+        self.max_bytes = max_bytes
+
+        self._tokens = {}
+        self._entries = OrderedDict()
+        self._locks = {}
+        self._bytes = 0
+        self._guard = threading.Lock()
+
+    # -------------------------------
+    # ACCESS TOKENS
+    # -------------------------------
+    def get_token(self, user_id):
+        return self._tokens.get(user_id)
+
+    def set_token(self, user_id, access_token, keep_cache=False):
+        with self._guard:
+            self._tokens[user_id] = access_token
+
+            # new item -> old cache belongs to another account
+            if not keep_cache:
+                self._drop(user_id)
+
+    # -------------------------------
+    # PER-USER LOCK
+    # -------------------------------
+    def lock(self, user_id):
+        with self._guard:
+            user_lock = self._locks.get(user_id)
+            if user_lock is None:
+                user_lock = threading.Lock()
+                self._locks[user_id] = user_lock
+            return user_lock
+
+    # -------------------------------
+    # CACHED TRANSACTIONS
+    # -------------------------------
+    def get(self, user_id):
+        with self._guard:
+            entry = self._entries.get(user_id)
+            if entry is not None:
+                self._entries.move_to_end(user_id)
+            return entry
+
+    def put(self, user_id, columns, ledger=None, cursor=None,
+            version=None, aggregates=None, totals=None, stamp=None):
+        entry = UserEntry(
+            user_id, columns, ledger, cursor, version, aggregates, totals,
+            stamp,
+        )
+
+        with self._guard:
+            self._drop(user_id)
+            self._entries[user_id] = entry
+            self._bytes += entry.size()
+            self._evict()
+
+        return entry
+
+    def set_keyset(self, entry, keyset):
+        """Attaches a keyset built after put(), counted against the budget."""
+
+        with self._guard:
+            if entry.keyset is not None:
+                return entry.keyset
+
+            entry.keyset = keyset
+
+            # evicted or replaced entries are no longer counted
+            if self._entries.get(entry.user_id) is entry:
+                self._bytes += keyset.nbytes()
+                self._evict()
+
+        return keyset
+
+    def evict(self, user_id):
+        with self._guard:
+            self._drop(user_id)
+
+    def stats(self):
+        with self._guard:
+            return {
+                "users": len(self._entries),
+                "bytes": self._bytes,
+                "tokens": len(self._tokens),
+            }
+
+    # -------------------------------
+    # INTERNAL (caller holds _guard)
+    # -------------------------------
+    def _drop(self, user_id):
+        entry = self._entries.pop(user_id, None)
+        if entry is not None:
+            self._bytes -= entry.size()
+
+    def _evict(self):
+        while self._entries and (
+            len(self._entries) > self.max_users
+            or self._bytes > self.max_bytes
+        ):
+            user_id, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size()
+
+            # keep locks of linked users, forget idle ones
+            user_lock = self._locks.get(user_id)
+            if user_id not in self._tokens and user_lock and not user_lock.locked():
+                del self._locks[user_id]
+
+
+store = UserStore()
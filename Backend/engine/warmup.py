@@ -0,0 +1,30 @@
+# backend/engine/warmup.py
+
+import time
+
+from engine.ml.risk_model import load_model
+from engine.plaid_client import get_client
+
+
+# ======================================
+# WARM-UP HOOK
+# ======================================
+def warm_up():
+    """
+    Loads everything a first request would otherwise pay for:
+    the risk model (joblib + sklearn), the Plaid client and
+    the request models used by plaid_service.
+    """
+
+    start = time.perf_counter()
+
+    load_model()
+    get_client()
+
+    from plaid.model.transactions_get_request import TransactionsGetRequest  # noqa: F401
+    from plaid.model.transactions_sync_request import TransactionsSyncRequest  # noqa: F401
+
+    elapsed = time.perf_counter() - start
+    print(f"🔥 Warm-up done in {elapsed:.2f}s")
+
+    return elapsed
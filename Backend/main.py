@@ -1,38 +1,118 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
 
 # -------------------------
 # ML ENGINES
 # -------------------------
+import engine.metrics as metrics
 import engine.session as session
+from engine.auth import (
+    current_user,
+    issue_session,
+    new_user_id,
+    optional_user,
+    require_admin,
+)
 from engine.dashboard import dashboard_engine
 from engine.behavior import behavior_engine
 from engine.insights import insights_engine
 from engine.microsavings import microsavings_engine
+from engine.plaid_service import (
+    get_cleaned_transactions,
+    get_expense_keyset,
+    get_transaction_entry_async,
+)
+from engine.snapshot import get_snapshot_async
+from engine.ml.registry import registry
+from engine.ml.anomaly_model import detector
+from engine.batch import (
+    CHUNK_SIZE,
+    MAX_BATCH_TRANSACTIONS,
+    MAX_BATCH_USERS,
+    get_pool,
+    score_users,
+    to_ndjson,
+)
+from engine.simulator import (
+    ANNUAL_RETURN,
+    ANNUAL_VOLATILITY,
+    MAX_STEPS,
+    PATHS,
+    YEARS,
+    compound_projection,
+    monte_carlo,
+)
 
 # 🔥 ENHANCER (NEW)
 from engine.enhancer.behavior_enhancer import enhance_transactions
 
 # -------------------------
-# PLAID
+# PLAID (client + request models load on first use)
 # -------------------------
-from engine.plaid_client import client
-
-from plaid.model.link_token_create_request import LinkTokenCreateRequest
-from plaid.model.link_token_create_request_user import LinkTokenCreateRequestUser
-from plaid.model.item_public_token_exchange_request import ItemPublicTokenExchangeRequest
-from plaid.model.products import Products
-from plaid.model.country_code import CountryCode
-from plaid.model.transactions_get_request import TransactionsGetRequest
-from plaid.model.transactions_refresh_request import TransactionsRefreshRequest
-
-from datetime import date, timedelta
+from engine.plaid_client import get_client
+from engine.warmup import warm_up
+
+import asyncio
+import base64
+import hashlib
+import json
+import math
+import os
+import threading
 import time
 import urllib3
 import http.client
+from datetime import date
+from typing import Optional
 
 app = FastAPI()
 
+# -------------------------
+# WARM-UP
+# "0"          = everything loads lazily on first use (fastest boot)
+# "1"          = load before serving
+# "background" = serve immediately, load in a background thread
+# -------------------------
+ENGINE_WARMUP = os.getenv("ENGINE_WARMUP", "0")
+
+
+@app.on_event("startup")
+async def startup():
+    if ENGINE_WARMUP == "1":
+        await asyncio.to_thread(warm_up)
+    elif ENGINE_WARMUP == "background":
+        threading.Thread(target=warm_up, daemon=True).start()
+
+# -------------------------
+# REQUEST TIMING
+# labelled by route template, not raw path (bounded label set)
+# -------------------------
+@app.middleware("http")
+async def time_requests(request: Request, call_next):
+    start = time.perf_counter()
+    response = await call_next(request)
+
+    route = request.scope.get("route")
+    metrics.observe(
+        "http_request_seconds",
+        time.perf_counter() - start,
+        route=route.path if route else "unmatched",
+        method=request.method,
+        status=response.status_code,
+    )
+
+    return response
+
+
+# scraped with the admin token (Prometheus: authorization.credentials)
+@app.get("/metrics", dependencies=[Depends(require_admin)])
+def get_metrics():
+    return PlainTextResponse(
+        metrics.render(), media_type="text/plain; version=0.0.4"
+    )
+
 # -------------------------
 # CORS
 # -------------------------
@@ -45,70 +125,213 @@ app.add_middleware(
 )
 
 # -------------------------
-# CATEGORY MAP
+# RESPONSE CACHE (ETag / 304)
+# body + strong ETag are memoised on the snapshot,
+# so a new transaction-set version invalidates them
 # -------------------------
-CATEGORY_MAP = {
-    "FOOD_AND_DRINK": "Food",
-    "TRANSPORTATION": "Transport",
-    "TRAVEL": "Transport",
-    "GENERAL_MERCHANDISE": "Shopping",
-    "GENERAL_SERVICES": "Shopping",
-    "LOAN_PAYMENTS": "Housing",
-    "RENT_AND_UTILITIES": "Housing",
-    "TRANSFER_OUT": "Housing",
-    "PERSONAL_CARE": "Lifestyle",
-    "ENTERTAINMENT": "Lifestyle"
-}
-
-ALLOWED_CATEGORIES = [
-    "Housing",
-    "Food",
-    "Transport",
-    "Shopping",
-    "Lifestyle"
-]
+def _serialise(content):
+    # same bytes FastAPI's JSONResponse would produce
+    with metrics.stage("serialisation"):
+        body = json.dumps(
+            jsonable_encoder(content),
+            ensure_ascii=False,
+            allow_nan=False,
+            indent=None,
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+    etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+    return body, etag
+
+
+def _etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+
+    return "*" in candidates or etag in (
+        tag[2:] if tag.startswith("W/") else tag for tag in candidates
+    )
+
+
+async def _cached_response(request, snapshot, engine):
+
+    key = (engine.__name__, "response")
+
+    def build(s):
+        return _serialise(engine(s.user_id, s))
+
+    # first call per version runs the engine (and may load its
+    # models) -> worker thread, repeats are a dict lookup
+    if snapshot.memoised(key):
+        body, etag = snapshot.memo(key, build)
+    else:
+        body, etag = await asyncio.to_thread(snapshot.memo, key, build)
+
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(body, media_type="application/json", headers=headers)
 
 # ===================================================
 # ML ROUTES
 # ===================================================
 
 @app.get("/api/dashboard")
-async def get_dashboard():
-    return dashboard_engine()
+async def get_dashboard(request: Request, user_id: str = Depends(current_user)):
+    snapshot = await get_snapshot_async(user_id)
+    return await _cached_response(request, snapshot, dashboard_engine)
 
 @app.get("/api/behavior")
-async def get_behavior():
-    return behavior_engine()
+async def get_behavior(request: Request, user_id: str = Depends(current_user)):
+    snapshot = await get_snapshot_async(user_id)
+    return await _cached_response(request, snapshot, behavior_engine)
 
 @app.get("/api/microsavings")
-async def get_microsavings():
-    return microsavings_engine()
+async def get_microsavings(request: Request, user_id: str = Depends(current_user)):
+    snapshot = await get_snapshot_async(user_id)
+    return await _cached_response(request, snapshot, microsavings_engine)
 
 @app.get("/api/insights")
-async def get_insights():
-    return insights_engine()
+async def get_insights(request: Request, user_id: str = Depends(current_user)):
+    snapshot = await get_snapshot_async(user_id)
+    return await _cached_response(request, snapshot, insights_engine)
+
+@app.get("/api/simulation")
+async def get_simulation(
+    user_id: str = Depends(current_user),
+    monthly_contribution: Optional[float] = None,
+    years: int = YEARS,
+    paths: int = PATHS,
+    annual_return: float = ANNUAL_RETURN,
+    annual_volatility: float = ANNUAL_VOLATILITY,
+    initial: float = 0.0,
+):
+    if not 1 <= years <= 60 or not 100 <= paths <= 100_000:
+        raise HTTPException(status_code=400, detail="years / paths out of range")
+
+    if paths * years * 12 > MAX_STEPS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"paths * years * 12 must be at most {MAX_STEPS}",
+        )
+
+    amounts = [annual_return, annual_volatility, initial]
+    if monthly_contribution is not None:
+        amounts.append(monthly_contribution)
+
+    if not all(math.isfinite(v) for v in amounts):
+        raise HTTPException(status_code=400, detail="values must be finite")
+
+    if annual_return <= -1 or annual_volatility < 0:
+        raise HTTPException(
+            status_code=400,
+            detail="annual_return must be > -1, annual_volatility >= 0",
+        )
+
+    # default plan = what the dashboard says the user saves today
+    if monthly_contribution is None:
+        snapshot = await get_snapshot_async(user_id)
+        dashboard = await asyncio.to_thread(dashboard_engine, user_id, snapshot)
+        monthly_contribution = dashboard["monthly_savings"]
+
+    # up to MAX_STEPS of numpy work -> off the event loop
+    bands = await asyncio.to_thread(
+        monte_carlo,
+        monthly_contribution, years, paths,
+        annual_return, annual_volatility, initial,
+    )
+
+    return {
+        "monthly_contribution": monthly_contribution,
+        "expected": compound_projection(
+            monthly_contribution, years, annual_return, initial
+        ),
+        "monte_carlo": bands,
+    }
+
+@app.get("/api/anomalies")
+async def get_anomalies(user_id: str = Depends(current_user)):
+    # detector is fed by the sync path, this only makes sure it ran
+    await get_transaction_entry_async(user_id)
+    anomalies = detector.recent(user_id)
+    return {"anomalies": anomalies, "anomalies_count": len(anomalies)}
+
+@app.post("/api/batch/behavior", dependencies=[Depends(require_admin)])
+def batch_behavior(data: dict):
+    # {"users": [{"user_id": ..., "transactions": [...]}, ...]}
+    users = data.get("users")
+    if not isinstance(users, list):
+        raise HTTPException(status_code=400, detail="Missing users")
+
+    # bounded work per request (it fans out to the process pool)
+    if len(users) > MAX_BATCH_USERS:
+        raise HTTPException(
+            status_code=413, detail=f"At most {MAX_BATCH_USERS} users"
+        )
+
+    for user in users:
+        transactions = user.get("transactions") if isinstance(user, dict) else None
+        if (
+            isinstance(transactions, list)
+            and len(transactions) > MAX_BATCH_TRANSACTIONS
+        ):
+            raise HTTPException(
+                status_code=413,
+                detail=f"At most {MAX_BATCH_TRANSACTIONS} transactions per user",
+            )
+
+    # small batches are faster without the process hop
+    executor = get_pool() if len(users) > CHUNK_SIZE else None
+
+    return StreamingResponse(
+        to_ndjson(score_users(users, executor=executor)),
+        media_type="application/x-ndjson",
+    )
+
+@app.get("/api/models", dependencies=[Depends(require_admin)])
+def get_models():
+    return registry.stats()
 
 # ===================================================
 # PLAID ROUTES
 # ===================================================
 
 @app.get("/api/create_link_token")
-def create_link_token():
+def create_link_token(user_id: Optional[str] = Depends(optional_user)):
+    from plaid.model.link_token_create_request import LinkTokenCreateRequest
+    from plaid.model.link_token_create_request_user import LinkTokenCreateRequestUser
+    from plaid.model.products import Products
+    from plaid.model.country_code import CountryCode
+
+    # no session: always a new user (never the demo user),
+    # its session comes back with the link token
+    if user_id is None:
+        user_id = new_user_id()
 
     request = LinkTokenCreateRequest(
-        user=LinkTokenCreateRequestUser(client_user_id="user-123"),
+        user=LinkTokenCreateRequestUser(client_user_id=user_id),
         products=[Products("transactions")],
         client_name="Longevity Finance",
         country_codes=[CountryCode("US")],
         language="en"
     )
 
-    response = client.link_token_create(request)
-    return {"link_token": response["link_token"]}
+    metrics.inc("plaid_api_calls_total", endpoint="link_token_create")
+    response = get_client().link_token_create(request)
+    return {
+        "link_token": response["link_token"],
+        "session_token": issue_session(user_id),
+    }
 
 
 @app.post("/api/exchange_public_token")
-def exchange_public_token(data: dict):
+def exchange_public_token(data: dict, user_id: str = Depends(current_user)):
+    from plaid.model.item_public_token_exchange_request import ItemPublicTokenExchangeRequest
 
     public_token = data.get("public_token")
     if not public_token:
@@ -122,7 +345,10 @@ def exchange_public_token(data: dict):
 
     for attempt in range(3):
         try:
-            response = client.item_public_token_exchange(exchange_request)
+            metrics.inc(
+                "plaid_api_calls_total", endpoint="item_public_token_exchange"
+            )
+            response = get_client().item_public_token_exchange(exchange_request)
             break
         except (
             urllib3.exceptions.ProtocolError,
@@ -139,7 +365,7 @@ def exchange_public_token(data: dict):
                     detail="Plaid connection failed"
                 ) from last_error
 
-    session.SAVED_ACCESS_TOKEN = response["access_token"]
+    session.save_access_token(response["access_token"], user_id)
 
     return {"message": "Access token saved successfully"}
 
@@ -148,59 +374,105 @@ def exchange_public_token(data: dict):
 # 90 DAY TRANSACTIONS (ENHANCED)
 # ===================================================
 
-@app.get("/api/transactions")
-def get_transactions():
+TRANSACTIONS_MAX_PAGE = 1000
+TRANSACTIONS_STREAM_PAGE = 500
+
+
+def _encode_cursor(key):
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+
+def _decode_cursor(cursor):
+    try:
+        day, transaction_id = json.loads(base64.urlsafe_b64decode(cursor))
+        return date.fromisoformat(day).isoformat(), str(transaction_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
-    if not session.SAVED_ACCESS_TOKEN:
+
+def _stream_transactions(keyset, before, limit):
+    """
+    NDJSON rows newest first, one enhanced page at a time.
+    With a limit, the last line is {"next_cursor": ...} (null at the end).
+    """
+
+    remaining = limit
+
+    while remaining is None or remaining > 0:
+        size = TRANSACTIONS_STREAM_PAGE
+        if remaining is not None:
+            size = min(size, remaining)
+            remaining -= size
+
+        rows, before = keyset.page(before, size)
+
+        for t in enhance_transactions(rows):
+            yield json.dumps(t) + "\n"
+
+        if before is None:
+            break
+
+    if limit is not None:
+        cursor = _encode_cursor(before) if before else None
+        yield json.dumps({"next_cursor": cursor}) + "\n"
+
+
+@app.get("/api/transactions")
+def get_transactions(
+    user_id: str = Depends(current_user),
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fmt: str = Query("json", alias="format"),
+):
+    """
+    No limit / cursor -> full 90 day list (unchanged).
+    limit / cursor    -> one page newest first + "next_cursor"
+                         (keyset on date + transaction_id).
+    format=ndjson     -> rows streamed one per line; with a limit the
+                         last line is {"next_cursor": ...}.
+    """
+    from plaid.model.transactions_refresh_request import TransactionsRefreshRequest
+
+    access_token = session.get_access_token(user_id)
+    if not access_token:
         return {"error": "No access token found"}
 
     try:
         refresh_request = TransactionsRefreshRequest(
-            access_token=session.SAVED_ACCESS_TOKEN
+            access_token=access_token
         )
         #client.transactions_refresh(refresh_request)
     except Exception as e:
         print("Refresh skipped:", e)
 
-    today = date.today()
-    start_date = today - timedelta(days=90)
-
-    request = TransactionsGetRequest(
-        access_token=session.SAVED_ACCESS_TOKEN,
-        start_date=start_date,
-        end_date=today
-    )
-
-    response = client.transactions_get(request)
-    transactions = response.to_dict()["transactions"]
-
-    cleaned = []
-
-    for t in transactions:
+    if limit is not None and not 1 <= limit <= TRANSACTIONS_MAX_PAGE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"limit must be 1..{TRANSACTIONS_MAX_PAGE}",
+        )
 
-        amount = t["amount"]
-        if amount <= 0:
-            continue
+    before = _decode_cursor(cursor) if cursor else None
 
-        plaid_category = (
-            t["personal_finance_category"]["primary"]
-            if t["personal_finance_category"]
-            else None
+    if fmt == "ndjson":
+        return StreamingResponse(
+            _stream_transactions(get_expense_keyset(user_id), before, limit),
+            media_type="application/x-ndjson",
         )
 
-        ui_category = CATEGORY_MAP.get(plaid_category)
-
-        if ui_category not in ALLOWED_CATEGORIES:
-            continue
+    if limit is not None or cursor:
+        rows, last = get_expense_keyset(user_id).page(before, limit or 100)
 
-        merchant = t["merchant_name"] or t["name"]
+        return {
+            "period": "last_90_days",
+            "transactions": enhance_transactions(rows),
+            "next_cursor": _encode_cursor(last) if last else None,
+        }
 
-        cleaned.append({
-            "date": str(t["date"]),
-            "receiver": merchant,
-            "amount": round(amount, 2),
-            "category": ui_category
-        })
+    # shared cache + incremental sync (no extra Plaid pull)
+    cleaned = [
+        t for t in get_cleaned_transactions(user_id)
+        if t["amount"] > 0
+    ]
 
     cleaned.sort(key=lambda x: x["date"], reverse=True)
 
@@ -0,0 +1,80 @@
+# backend/tests/conftest.py
+#
+#   cd Backend
+#   python -m pytest -q
+
+import os
+
+# read at import time: no local store unless a test opts in,
+# no debug prints on the fetch path
+os.environ["TXN_DB_PATH"] = ""
+os.environ.setdefault("ENGINE_DEBUG", "0")
+
+import asyncio
+import uuid
+
+import httpx
+import pytest
+
+from benchmarks.fake_plaid import FakePlaidApi
+from engine import plaid_client
+
+
+@pytest.fixture
+def plaid():
+    """FakePlaidApi as the Plaid client for one test."""
+
+    previous = plaid_client._client
+    client = FakePlaidApi(transactions_per_user=200)
+    plaid_client.set_client(client)
+
+    yield client
+
+    plaid_client.set_client(previous)
+
+
+@pytest.fixture
+def user_id():
+    """Fresh user per test (the per-user store is process-wide)."""
+    return f"user-{uuid.uuid4().hex[:8]}"
+
+
+class Api:
+    """Calls the FastAPI app in-process (httpx ASGI transport)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    def request(self, method, url, **kwargs):
+
+        async def call():
+            async with httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=self.app),
+                base_url="http://test",
+            ) as client:
+                return await client.request(method, url, **kwargs)
+
+        return asyncio.run(call())
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+
+@pytest.fixture(scope="session")
+def api():
+    import main
+    return Api(main.app)
+
+
+@pytest.fixture
+def bearer():
+    """bearer(user_id) -> Authorization header of a session for the user."""
+    from engine.auth import issue_session
+
+    def headers(user_id):
+        return {"Authorization": f"Bearer {issue_session(user_id)}"}
+
+    return headers
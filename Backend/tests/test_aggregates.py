@@ -0,0 +1,181 @@
+# backend/tests/test_aggregates.py
+#
+# Incremental TransactionAggregates == a full recompute, and a moved
+# window start gives a new version even when Plaid has no changes.
+
+import pytest
+
+import engine.plaid_service as plaid_service
+import engine.session as session
+from benchmarks.fake_plaid import make_transactions
+from engine.aggregates import TransactionAggregates
+from engine.cleaning import clean_transaction
+from engine.columnar import category_totals, monthly_totals
+from engine.ledger import Ledger, diff
+from engine.plaid_service import realism_columns, realism_parts
+
+
+def ledger_of(rows):
+    return Ledger.from_items(rows.items())
+
+
+def cleaned(n, seed=0, prefix="txn"):
+    rows = {}
+    for i, t in enumerate(make_transactions(n, seed=seed)):
+        row = clean_transaction(t)
+        if row is not None:
+            rows[f"{prefix}-{i}"] = row
+    return rows
+
+
+def fields(totals):
+    return (
+        list(totals.category_totals.items()),
+        list(totals.monthly_totals.items()),
+        totals.expense_total,
+        totals.net_total,
+        totals.total_saved,
+        totals.count,
+    )
+
+
+def assert_matches_full_recompute(aggregates, ledger):
+    full = TransactionAggregates.from_ledger(
+        ledger, aggregates.start, realism_parts
+    )
+    columns = realism_columns(ledger.since(aggregates.start))
+
+    assert fields(aggregates.totals(columns)) == fields(full.totals(columns))
+
+    # and the same as grouping the enhanced window directly
+    totals = full.totals(columns)
+    assert totals.count == len(columns)
+    assert list(totals.category_totals) == list(category_totals(columns))
+    assert totals.category_totals == pytest.approx(category_totals(columns))
+    assert totals.monthly_totals == pytest.approx(monthly_totals(columns))
+
+
+def step(aggregates, old, new, start_day=None):
+    upserts, deletes = diff(old, new)
+    aggregates.apply(
+        old, upserts, deletes,
+        aggregates.start if start_day is None else start_day,
+    )
+    assert_matches_full_recompute(aggregates, new)
+
+
+@pytest.fixture
+def start():
+    return plaid_service._window_start_day()
+
+
+@pytest.fixture
+def rows():
+    return cleaned(600)
+
+
+def test_from_ledger_matches_columns(rows, start):
+    aggregates = TransactionAggregates.from_ledger(
+        ledger_of(rows), start, realism_parts
+    )
+    assert_matches_full_recompute(aggregates, ledger_of(rows))
+
+
+def test_added_rows(rows, start):
+    old = ledger_of(rows)
+    aggregates = TransactionAggregates.from_ledger(old, start, realism_parts)
+
+    step(aggregates, old, ledger_of({**rows, **cleaned(50, 1, "new")}))
+
+
+def test_modified_rows(rows, start):
+    old = ledger_of(rows)
+    aggregates = TransactionAggregates.from_ledger(old, start, realism_parts)
+
+    edited = dict(rows)
+    for transaction_id in list(rows)[::7]:
+        t = rows[transaction_id]
+        edited[transaction_id] = clean_transaction({
+            "date": t.date, "name": "Edited", "amount": t.amount * 2 + 1,
+            "personal_finance_category": {"primary": "TRAVEL"},
+        })
+
+    step(aggregates, old, ledger_of(edited))
+
+
+def test_removed_rows(rows, start):
+    old = ledger_of(rows)
+    aggregates = TransactionAggregates.from_ledger(old, start, realism_parts)
+
+    kept = {k: t for i, (k, t) in enumerate(rows.items()) if i % 5}
+
+    step(aggregates, old, ledger_of(kept))
+
+
+def test_everything_removed(rows, start):
+    old = ledger_of(rows)
+    aggregates = TransactionAggregates.from_ledger(old, start, realism_parts)
+
+    step(aggregates, old, Ledger.empty())
+
+    assert aggregates.totals(realism_columns(Ledger.empty())).count == 0
+    assert aggregates.nbytes() < 2000
+
+
+@pytest.mark.parametrize("days", [10, -5])
+def test_window_start_moves(rows, start, days):
+    ledger = ledger_of(rows)
+    aggregates = TransactionAggregates.from_ledger(ledger, start, realism_parts)
+
+    step(aggregates, ledger, ledger, start + days)
+
+
+def test_mixed_deltas_in_sequence(rows, start):
+    old = ledger_of(rows)
+    aggregates = TransactionAggregates.from_ledger(old, start, realism_parts)
+    current = dict(rows)
+
+    for round_ in range(4):
+        items = list(current)
+        for transaction_id in items[round_::9]:
+            del current[transaction_id]
+        current.update(cleaned(40, 10 + round_, f"r{round_}"))
+
+        new = ledger_of(current)
+        step(aggregates, old, new, start + round_)
+        old = new
+
+
+def test_bookkeeping_does_not_grow_with_rows(start):
+    small = TransactionAggregates.from_ledger(
+        ledger_of(cleaned(200)), start, realism_parts
+    )
+    large = TransactionAggregates.from_ledger(
+        ledger_of(cleaned(20_000)), start, realism_parts
+    )
+
+    # per category and month, not per row
+    assert large.nbytes() < 2 * small.nbytes() + 1000
+
+
+def test_moved_window_bumps_the_version(plaid, user_id, monkeypatch, start):
+    access_token = f"access-{user_id}"
+    session.save_access_token(access_token, user_id)
+
+    before = plaid_service.get_transaction_entry(user_id)
+
+    # no Plaid changes, but the oldest days fall out of the window
+    moved = int(before.columns.day.min()) + 3
+    monkeypatch.setattr(plaid_service, "_window_start_day", lambda: moved)
+
+    entry = plaid_service._fetch_and_cache(user_id, access_token)
+
+    assert entry.version != before.version
+    assert entry.aggregates.start == moved
+    assert entry.columns.day.min() >= moved
+    assert len(entry.columns) < len(before.columns)
+    assert entry.totals.count == len(entry.columns)
+
+    # and a second fetch at the same start keeps it
+    again = plaid_service._fetch_and_cache(user_id, access_token)
+    assert again.version == entry.version
@@ -0,0 +1,114 @@
+# backend/tests/test_auth.py
+#
+# The user id comes from the session, never from the request.
+
+import pytest
+
+import engine.auth as auth
+import engine.session as session
+from engine.auth import issue_session, read_session
+from engine.user_store import DEFAULT_USER_ID, store
+
+
+@pytest.fixture
+def no_demo_user(monkeypatch):
+    monkeypatch.setattr(auth, "AUTH_DEMO_USER", False)
+
+
+@pytest.fixture
+def demo_user(monkeypatch):
+    monkeypatch.setattr(auth, "AUTH_DEMO_USER", True)
+
+
+def test_session_round_trip():
+    assert read_session(issue_session("user-a")) == "user-a"
+
+
+def test_tampered_or_expired_sessions_are_rejected():
+    encoded, expires, signature = issue_session("user-a").split(".")
+    other = issue_session("user-b").split(".")[0]
+
+    assert read_session(f"{other}.{expires}.{signature}") is None
+    assert read_session(f"{encoded}.{int(expires) + 1}.{signature}") is None
+    assert read_session(issue_session("user-a", ttl=-1)) is None
+    assert read_session("not-a-token") is None
+
+
+def test_user_id_parameter_is_ignored(api, no_demo_user, user_id):
+    response = api.get("/api/anomalies", params={"user_id": user_id})
+    assert response.status_code == 401
+
+
+def test_invalid_session_is_401_even_with_demo_user(api):
+    response = api.get(
+        "/api/anomalies", headers={"Authorization": "Bearer forged"}
+    )
+    assert response.status_code == 401
+
+
+def test_session_reads_only_its_own_user(api, plaid, bearer, user_id):
+    session.save_access_token(f"access-{user_id}", user_id)
+
+    own = api.get("/api/anomalies", headers=bearer(user_id))
+    other = api.get("/api/anomalies", headers=bearer("someone-else"))
+
+    assert own.status_code == other.status_code == 200
+    assert store.get(user_id) is not None
+    assert store.get_token("someone-else") is None
+
+
+def test_exchange_links_the_session_user(api, plaid, bearer, user_id):
+    victim = f"{user_id}-victim"
+    session.save_access_token("access-victim", victim)
+
+    response = api.post(
+        "/api/exchange_public_token",
+        params={"user_id": victim},
+        json={"public_token": "public-1"},
+        headers=bearer(user_id),
+    )
+
+    assert response.status_code == 200
+    assert store.get_token(user_id) == "access-fake-public-1"
+    assert store.get_token(victim) == "access-victim"
+
+
+def test_exchange_needs_a_session(api, plaid, no_demo_user):
+    response = api.post(
+        "/api/exchange_public_token", json={"public_token": "public-1"}
+    )
+    assert response.status_code == 401
+
+
+def test_link_token_starts_a_session(api, plaid, bearer, no_demo_user):
+    first = api.get("/api/create_link_token").json()
+    new_user = read_session(first["session_token"])
+
+    assert first["link_token"]
+    assert new_user is not None
+
+    again = api.get("/api/create_link_token", headers=bearer(new_user)).json()
+    assert read_session(again["session_token"]) == new_user
+
+
+@pytest.mark.parametrize("demo", [False, True])
+def test_anonymous_link_tokens_get_different_users(
+    api, plaid, monkeypatch, demo
+):
+    monkeypatch.setattr(auth, "AUTH_DEMO_USER", demo)
+
+    first = api.get("/api/create_link_token").json()
+    second = api.get("/api/create_link_token").json()
+
+    users = {
+        read_session(first["session_token"]),
+        read_session(second["session_token"]),
+    }
+
+    assert len(users) == 2
+    assert None not in users
+    assert DEFAULT_USER_ID not in users
+
+
+def test_demo_user_is_opt_in(api, plaid, demo_user):
+    assert api.get("/api/anomalies").status_code == 200
@@ -0,0 +1,73 @@
+# backend/tests/test_batch.py
+#
+# /api/batch/behavior: operator-only and bounded.
+
+import json
+
+import pytest
+
+import engine.auth as auth
+import main
+
+USERS = [
+    {
+        "user_id": "a",
+        "transactions": [
+            {"date": "2024-01-05", "receiver": "Shop", "amount": 12.5,
+             "category": "Shopping"},
+        ],
+    },
+]
+
+
+@pytest.fixture
+def admin(monkeypatch):
+    monkeypatch.setattr(auth, "ADMIN_TOKEN", "admin-secret")
+    return {"Authorization": "Bearer admin-secret"}
+
+
+def post(api, users, headers=None):
+    return api.post("/api/batch/behavior", json={"users": users}, headers=headers)
+
+
+def test_disabled_without_admin_token(api, bearer, user_id):
+    assert post(api, USERS).status_code == 403
+    assert post(api, USERS, bearer(user_id)).status_code == 403
+
+
+def test_needs_the_admin_token(api, admin, bearer, user_id):
+    assert post(api, USERS).status_code == 401
+    assert post(api, USERS, bearer(user_id)).status_code == 401
+    assert post(api, USERS, {"Authorization": "Bearer wrong"}).status_code == 401
+
+
+def test_scores_users(api, admin):
+    response = post(api, USERS, admin)
+
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["user_id"] for line in lines] == ["a"]
+
+
+def test_too_many_users_is_413(api, admin, monkeypatch):
+    monkeypatch.setattr(main, "MAX_BATCH_USERS", 2)
+
+    assert post(api, USERS * 3, admin).status_code == 413
+
+
+def test_too_many_transactions_is_413(api, admin, monkeypatch):
+    monkeypatch.setattr(main, "MAX_BATCH_TRANSACTIONS", 3)
+    user = {"user_id": "a", "transactions": USERS[0]["transactions"] * 4}
+
+    assert post(api, [user], admin).status_code == 413
+
+
+def test_bad_items_get_an_error_line(api, admin):
+    response = post(api, ["not-a-user", *USERS, 7, None], admin)
+
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+
+    assert len(lines) == 4
+    assert lines[1]["user_id"] == "a"
+    assert all(list(lines[i]) == ["error"] for i in (0, 2, 3))
@@ -0,0 +1,166 @@
+# backend/tests/test_ledger.py
+#
+# Columnar Ledger: same rows and order as the dict ledger it replaced,
+# and cache entries accounted by the bytes they hold.
+
+import random
+
+import pytest
+
+import engine.plaid_service as plaid_service
+from benchmarks.fake_plaid import make_transactions
+from engine.cleaning import clean_transaction
+from engine.columnar import TransactionColumns
+from engine.ledger import Ledger, diff
+from engine.plaid_service import (
+    ExpenseKeyset,
+    add_behavior_realism,
+    realism_columns,
+)
+from engine.user_store import UserStore
+
+
+def cleaned(n, seed=0):
+    rows = {}
+    for i, t in enumerate(make_transactions(n, seed=seed)):
+        row = clean_transaction(t)
+        if row is not None:
+            rows[f"txn-{seed}-{i}"] = row
+    return rows
+
+
+@pytest.fixture
+def rows():
+    return cleaned(400)
+
+
+def test_round_trips_rows(rows):
+    ledger = Ledger.from_items(rows.items())
+
+    assert dict(ledger.items()) == rows
+    assert list(dict(ledger.items())) == list(rows)
+
+
+def test_from_records_matches_from_items(rows):
+    records = [
+        (k, t.date, t.receiver, t.amount, t.category) for k, t in rows.items()
+    ]
+
+    assert dict(Ledger.from_records(records).items()) == rows
+
+
+def test_changes_match_a_dict(rows):
+    rng = random.Random(1)
+    extra = list(cleaned(100, seed=1).values())
+    ids = list(rows) + [f"new-{i}" for i in range(50)]
+
+    expected = dict(rows)
+    ledger = Ledger.from_items(rows.items())
+
+    for _ in range(5):
+        changes = []
+        for _ in range(80):
+            transaction_id = rng.choice(ids)
+            row = None if rng.random() < 0.3 else rng.choice(extra)
+            changes.append((transaction_id, row))
+
+            if row is None:
+                expected.pop(transaction_id, None)
+            else:
+                expected[transaction_id] = row
+
+        ledger = ledger.with_changes(changes)
+
+        # same rows in the same (dict) order
+        assert list(ledger.items()) == list(expected.items())
+
+
+def test_update_and_diff_match_a_dict(rows):
+    old = dict(rows)
+    new = dict(list(rows.items())[50:])
+    new.update(cleaned(30, seed=2))
+    for transaction_id in list(new)[:10]:
+        t = new[transaction_id]
+        new[transaction_id] = clean_transaction({
+            "date": t.date, "name": "Edited", "amount": t.amount + 1,
+            "personal_finance_category": {"primary": "TRAVEL"},
+        })
+
+    old_ledger = Ledger.from_items(old.items())
+    new_ledger = Ledger.from_items(new.items())
+
+    merged = old_ledger.update(new_ledger)
+    assert list(merged.items()) == list({**old, **new}.items())
+
+    upserts, deletes = diff(old_ledger, new_ledger)
+    assert dict(upserts.items()) == {
+        k: t for k, t in new.items() if old.get(k) != t
+    }
+    assert deletes == [k for k in old if k not in new]
+
+    assert diff(new_ledger, new_ledger)[0].ids.size == 0
+
+
+def test_realism_columns_match_the_row_path(rows):
+    ledger = Ledger.from_items(rows.items())
+
+    enhanced = add_behavior_realism(ledger.rows())
+    enhanced.sort(key=lambda t: t["date"], reverse=True)
+
+    columns = realism_columns(ledger)
+    expected = TransactionColumns.from_rows(enhanced)
+
+    assert columns.rows() == expected.rows() == enhanced
+    assert columns.categories == expected.categories
+    assert columns.receivers == expected.receivers
+    assert columns.receiver.dtype == expected.receiver.dtype
+
+
+def test_keyset_pages_in_date_then_id_order(rows):
+    ledger = Ledger.from_items(rows.items())
+    keyset = ExpenseKeyset.from_ledger(ledger)
+
+    start = plaid_service._window_start()
+    keys = sorted(
+        (t.date, k) for k, t in rows.items() if t.amount > 0 and t.date >= start
+    )
+
+    served, before = [], None
+    while True:
+        page, before = keyset.page(before, 7)
+        served.extend(page)
+        if before is None:
+            break
+
+    assert len(served) == len(keys)
+    assert served == [rows[k] for _, k in reversed(keys)]
+
+
+def test_store_counts_bytes_of_the_whole_entry(rows):
+    store = UserStore(max_users=10, max_bytes=10 << 20)
+    ledger = Ledger.from_items(rows.items())
+    columns = realism_columns(ledger)
+
+    entry = store.put("u", columns, ledger)
+    assert store.stats()["bytes"] == entry.size()
+    assert entry.size() >= columns.nbytes() + ledger.nbytes()
+
+    keyset = store.set_keyset(entry, ExpenseKeyset.from_ledger(ledger))
+    assert store.stats()["bytes"] == entry.size()
+    assert entry.size() == columns.nbytes() + ledger.nbytes() + keyset.nbytes()
+
+    store.evict("u")
+    assert store.stats()["bytes"] == 0
+
+
+def test_store_evicts_by_bytes(rows):
+    ledger = Ledger.from_items(rows.items())
+    columns = realism_columns(ledger)
+    size = columns.nbytes() + ledger.nbytes()
+
+    store = UserStore(max_users=10, max_bytes=int(size * 2.5))
+    for user_id in "abc":
+        store.put(user_id, columns, ledger)
+
+    assert store.get("a") is None
+    assert store.stats()["users"] == 2
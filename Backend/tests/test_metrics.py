@@ -0,0 +1,44 @@
+# backend/tests/test_metrics.py
+
+import engine.auth as auth
+import engine.metrics as metrics
+import engine.plaid_service as plaid_service
+import engine.session as session
+
+
+def test_cache_events_and_plaid_calls_are_counted(plaid, user_id):
+    session.save_access_token(f"access-{user_id}", user_id)
+
+    before = plaid_service.cache_stats()
+    calls = metrics.counter("plaid_api_calls_total", "endpoint")
+
+    plaid_service.get_transaction_entry(user_id)   # miss -> Plaid
+    plaid_service.get_transaction_entry(user_id)   # hit
+
+    after = plaid_service.cache_stats()
+    assert after["misses"] == before["misses"] + 1
+    assert after["hits"] == before["hits"] + 1
+
+    synced = metrics.counter("plaid_api_calls_total", "endpoint")
+    assert synced["transactions_sync"] == calls.get("transactions_sync", 0) + 1
+
+    text = metrics.render()
+    assert 'plaid_cache_events_total{event="misses"}' in text
+    assert 'plaid_api_calls_total{endpoint="transactions_sync"}' in text
+
+
+def test_metrics_endpoint_needs_the_admin_token(
+    api, bearer, user_id, monkeypatch
+):
+    assert api.get("/metrics").status_code == 403
+
+    monkeypatch.setattr(auth, "ADMIN_TOKEN", "admin-secret")
+
+    assert api.get("/metrics").status_code == 401
+    assert api.get("/metrics", headers=bearer(user_id)).status_code == 401
+
+    response = api.get(
+        "/metrics", headers={"Authorization": "Bearer admin-secret"}
+    )
+    assert response.status_code == 200
+    assert "http_request_seconds" in response.text
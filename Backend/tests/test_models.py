@@ -0,0 +1,19 @@
+# backend/tests/test_models.py
+#
+# /api/models is an operator route, not a user one.
+
+import engine.auth as auth
+
+
+def test_models_needs_the_admin_token(api, bearer, user_id, monkeypatch):
+    assert api.get("/api/models").status_code == 403
+
+    monkeypatch.setattr(auth, "ADMIN_TOKEN", "admin-secret")
+
+    assert api.get("/api/models").status_code == 401
+    assert api.get("/api/models", headers=bearer(user_id)).status_code == 401
+
+    response = api.get(
+        "/api/models", headers={"Authorization": "Bearer admin-secret"}
+    )
+    assert response.status_code == 200
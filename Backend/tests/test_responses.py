@@ -0,0 +1,58 @@
+# backend/tests/test_responses.py
+#
+# Memoised engine responses (ETag / 304).
+
+import asyncio
+import threading
+
+from starlette.requests import Request
+
+import main
+from engine.snapshot import AnalyticsSnapshot
+
+
+def request(headers=()):
+    return Request({
+        "type": "http",
+        "headers": [(k.encode(), v.encode()) for k, v in headers],
+    })
+
+
+def test_engine_runs_once_off_the_event_loop():
+    threads = []
+
+    def engine(user_id, snapshot):
+        threads.append(threading.current_thread())
+        return {"user": user_id}
+
+    snapshot = AnalyticsSnapshot([], "user-a")
+
+    async def calls():
+        loop_thread = threading.current_thread()
+        first = await main._cached_response(request(), snapshot, engine)
+        second = await main._cached_response(request(), snapshot, engine)
+        return loop_thread, first, second
+
+    loop_thread, first, second = asyncio.run(calls())
+
+    assert len(threads) == 1
+    assert threads[0] is not loop_thread
+    assert first.body == second.body == b'{"user":"user-a"}'
+
+
+def test_matching_etag_is_304():
+
+    def engine(user_id, snapshot):
+        return {"user": user_id}
+
+    snapshot = AnalyticsSnapshot([], "user-a")
+
+    first = asyncio.run(main._cached_response(request(), snapshot, engine))
+    etag = first.headers["etag"]
+
+    again = asyncio.run(main._cached_response(
+        request([("if-none-match", etag)]), snapshot, engine
+    ))
+
+    assert again.status_code == 304
+    assert again.headers["etag"] == etag
@@ -0,0 +1,198 @@
+# backend/tests/test_shared_cache.py
+#
+# SHARED_CACHE=sqlite: file permissions, fetch leases, and one Plaid
+# fetch for a user across worker processes.
+
+import multiprocessing
+import os
+import stat
+import threading
+import time
+
+import pytest
+
+import engine.plaid_service as plaid_service
+import engine.session as session
+import engine.txn_db as txn_db
+from benchmarks.fake_plaid import FakePlaidApi
+from engine import plaid_client
+from engine.cleaning import clean_transaction
+from engine.shared_cache import SQLiteCache, set_backend
+from engine.user_store import store
+
+WORKERS = 4
+
+
+@pytest.fixture
+def shared_db(tmp_path, monkeypatch):
+    """txn_db in a fresh file, SQLiteCache as the backend."""
+
+    monkeypatch.setattr(txn_db, "TXN_DB_PATH", str(tmp_path / "shared.db"))
+    monkeypatch.setattr(txn_db, "_local", threading.local())
+
+    set_backend(SQLiteCache())
+    yield txn_db.TXN_DB_PATH
+    set_backend(None)
+
+
+def test_database_files_are_owner_only(shared_db, user_id):
+    txn_db.save_token(user_id, "access-secret")
+
+    for suffix in ("", "-wal", "-shm"):
+        mode = stat.S_IMODE(os.stat(shared_db + suffix).st_mode)
+        assert mode == 0o600, suffix
+
+
+def test_loose_permissions_are_tightened(shared_db, user_id):
+    txn_db.save_token(user_id, "access-secret")
+    os.chmod(shared_db, 0o644)
+
+    txn_db._local = threading.local()
+    txn_db.load_token(user_id)
+
+    assert stat.S_IMODE(os.stat(shared_db).st_mode) == 0o600
+
+
+def test_lease_is_exclusive_until_it_expires(shared_db, user_id):
+    assert txn_db.acquire_lease(user_id, "worker-a", 0.2)
+
+    # held: others wait, the holder may renew
+    assert not txn_db.acquire_lease(user_id, "worker-b", 0.2)
+    assert txn_db.acquire_lease(user_id, "worker-a", 0.2)
+
+    # only the holder can release
+    txn_db.release_lease(user_id, "worker-b")
+    assert not txn_db.acquire_lease(user_id, "worker-b", 0.2)
+
+    # a crashed holder's lease runs out
+    time.sleep(0.25)
+    assert txn_db.acquire_lease(user_id, "worker-b", 0.2)
+
+
+def test_release_frees_the_lease(shared_db, user_id):
+    assert txn_db.acquire_lease(user_id, "worker-a", 30)
+    txn_db.release_lease(user_id, "worker-a")
+    assert txn_db.acquire_lease(user_id, "worker-b", 30)
+
+
+def _worker(user_id, start, results):
+    # a separate uvicorn worker: own connection, lease owner and client
+    txn_db._local = threading.local()
+    set_backend(SQLiteCache())
+
+    client = FakePlaidApi(transactions_per_user=300, latency_ms=300)
+    plaid_client.set_client(client)
+
+    start.wait()
+    entry = plaid_service.get_transaction_entry(user_id)
+
+    results.put((
+        client.calls.get("transactions_sync", 0),
+        sorted(t for t, _ in entry.ledger.items()),
+    ))
+
+
+def test_one_plaid_fetch_across_workers(shared_db, user_id):
+    session.save_access_token(f"access-{user_id}", user_id)
+
+    context = multiprocessing.get_context("fork")
+    start = context.Barrier(WORKERS)
+    results = context.Queue()
+
+    workers = [
+        context.Process(target=_worker, args=(user_id, start, results))
+        for _ in range(WORKERS)
+    ]
+    for worker in workers:
+        worker.start()
+
+    outcomes = [results.get(timeout=30) for _ in workers]
+
+    for worker in workers:
+        worker.join(timeout=30)
+
+    assert sum(calls for calls, _ in outcomes) == 1
+
+    ledgers = [ledger for _, ledger in outcomes]
+    assert all(ledger == ledgers[0] for ledger in ledgers)
+    assert len(ledgers[0]) > 0
+
+
+def test_no_op_sync_keeps_the_stamp(shared_db, plaid, user_id):
+    access_token = f"access-{user_id}"
+    session.save_access_token(access_token, user_id)
+
+    before = plaid_service.get_transaction_entry(user_id)
+    stamp = txn_db.updated_at(user_id)
+
+    entry = plaid_service._fetch_and_cache(user_id, access_token)
+
+    assert txn_db.updated_at(user_id) == stamp
+    assert entry.stamp == stamp
+    assert entry.version == before.version
+
+    # a real change is written and gets a new version
+    shown = next(
+        t for t in plaid.transactions_for(access_token)
+        if clean_transaction(t) is not None
+    )
+    plaid.remove(access_token, [shown["transaction_id"]])
+    changed = plaid_service._fetch_and_cache(user_id, access_token)
+
+    assert txn_db.updated_at(user_id) > stamp
+    assert changed.version != before.version
+
+
+def test_reload_with_the_same_rows_keeps_the_version(shared_db, plaid, user_id):
+    session.save_access_token(f"access-{user_id}", user_id)
+    before = plaid_service.get_transaction_entry(user_id)
+
+    # another worker saved: new cursor, no row changes
+    time.sleep(0.01)
+    txn_db.save_changes(user_id, {}, [], "other-cursor")
+
+    entry = plaid_service._load_shared(user_id)
+
+    assert entry.cursor == "other-cursor"
+    assert entry.stamp == txn_db.updated_at(user_id)
+    assert entry.version == before.version
+    assert entry.columns is before.columns
+
+
+def _restart(user_id):
+    # a fresh process: nothing in memory, the database is still there
+    store.evict(user_id)
+    txn_db._local = threading.local()
+
+
+def test_recent_disk_copy_is_served_on_cold_start(shared_db, plaid, user_id):
+    session.save_access_token(f"access-{user_id}", user_id)
+    plaid_service.get_transaction_entry(user_id)
+    calls = plaid.calls.get("transactions_sync", 0)
+
+    _restart(user_id)
+    entry = plaid_service.get_transaction_entry(user_id)
+
+    assert entry is not None
+    assert plaid.calls.get("transactions_sync", 0) == calls
+
+
+def test_disk_copy_past_hard_ttl_is_refetched(shared_db, plaid, user_id):
+    session.save_access_token(f"access-{user_id}", user_id)
+    plaid_service.get_transaction_entry(user_id)
+    calls = plaid.calls.get("transactions_sync", 0)
+
+    # saved longer ago than the hard TTL
+    old = time.time() - plaid_service.CACHE_HARD_TTL - 60
+    with txn_db._connect() as conn:
+        conn.execute(
+            "UPDATE sync_state SET updated_at = ? WHERE user_id = ?",
+            (old, user_id),
+        )
+
+    _restart(user_id)
+    entry = plaid_service.get_transaction_entry(user_id)
+
+    # blocked on a fresh fetch instead of serving the old copy
+    assert plaid.calls.get("transactions_sync", 0) == calls + 1
+    assert entry.age() < plaid_service.CACHE_SOFT_TTL
@@ -0,0 +1,52 @@
+# backend/tests/test_simulation.py
+
+import pytest
+
+from engine.simulator import MAX_STEPS
+
+PLAN = {"monthly_contribution": 100, "years": 2, "paths": 100}
+
+
+@pytest.fixture
+def headers(bearer, user_id):
+    return bearer(user_id)
+
+
+def test_simulation(api, headers):
+    response = api.get("/api/simulation", params=PLAN, headers=headers)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body["expected"]) == 2
+    assert len(body["monte_carlo"]["bands"]) == 2
+
+
+@pytest.mark.parametrize("params", [
+    {"annual_return": -1},
+    {"annual_return": -1.5},
+    {"annual_volatility": -0.1},
+    {"monthly_contribution": "nan"},
+    {"monthly_contribution": "inf"},
+    {"initial": "-inf"},
+    {"initial": "nan"},
+    {"annual_return": "nan"},
+    {"years": 0},
+    {"paths": 10},
+])
+def test_invalid_plans_are_rejected(api, headers, params):
+    response = api.get(
+        "/api/simulation", params={**PLAN, **params}, headers=headers
+    )
+    assert response.status_code == 400
+
+
+def test_work_per_call_is_capped(api, headers):
+    paths = 100_000
+    years = MAX_STEPS // (12 * paths) + 1
+
+    response = api.get(
+        "/api/simulation", params={**PLAN, "paths": paths, "years": years},
+        headers=headers,
+    )
+
+    assert response.status_code == 400
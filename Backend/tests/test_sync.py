@@ -0,0 +1,200 @@
+# backend/tests/test_sync.py
+#
+# /transactions/sync deltas applied to the cached ledger.
+
+import pytest
+
+import engine.plaid_service as plaid_service
+import engine.session as session
+from benchmarks.fake_plaid import FakePlaidApi
+from engine.cleaning import clean_transaction
+from engine.user_store import store
+
+
+def link(user_id, access_token=None):
+    access_token = access_token or f"access-{user_id}"
+    session.save_access_token(access_token, user_id)
+    return access_token
+
+
+def sync(user_id, access_token):
+    return plaid_service._fetch_and_cache(user_id, access_token)
+
+
+def ledger_of(entry):
+    return dict(entry.ledger.items())
+
+
+def expected_ledger(plaid, access_token):
+    ledger = {}
+    for t in plaid.transactions_for(access_token):
+        row = clean_transaction(t)
+        if row is not None:
+            ledger[t["transaction_id"]] = row
+    return ledger
+
+
+class RecordingPlaid(FakePlaidApi):
+    """FakePlaidApi that remembers the cursor of every sync call."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.cursors = []
+        self.fail_next = 0
+
+    def transactions_sync(self, request):
+        self.cursors.append(request.get("cursor"))
+
+        if self.fail_next:
+            self.fail_next -= 1
+            raise Exception(
+                "Plaid error: TRANSACTIONS_SYNC_MUTATION_DURING_PAGINATION"
+            )
+
+        return super().transactions_sync(request)
+
+
+@pytest.fixture
+def recording():
+    from engine import plaid_client
+
+    previous = plaid_client._client
+    client = RecordingPlaid(transactions_per_user=200)
+    plaid_client.set_client(client)
+
+    yield client
+
+    plaid_client.set_client(previous)
+
+
+def test_initial_sync_pulls_the_whole_item(plaid, user_id):
+    access_token = link(user_id)
+
+    entry = plaid_service.get_transaction_entry(user_id)
+
+    assert ledger_of(entry) == expected_ledger(plaid, access_token)
+    assert entry.cursor == "200"
+    assert plaid.calls == {"transactions_sync": 1}
+
+
+def test_added_rows_are_appended(plaid, user_id):
+    access_token = link(user_id)
+    before = plaid_service.get_transaction_entry(user_id)
+
+    shown = [
+        t for t in plaid.transactions_for(access_token)
+        if clean_transaction(t) is not None
+    ]
+    new = [
+        {**t, "transaction_id": f"new-{i}"} for i, t in enumerate(shown[:5])
+    ]
+    plaid.add(access_token, new)
+
+    entry = sync(user_id, access_token)
+
+    assert ledger_of(entry) == expected_ledger(plaid, access_token)
+    assert list(ledger_of(entry))[-5:] == [t["transaction_id"] for t in new]
+    assert entry.cursor == "205"
+    assert entry.version != before.version
+
+
+def test_modified_rows_replace_in_place(plaid, user_id):
+    access_token = link(user_id)
+    before = ledger_of(plaid_service.get_transaction_entry(user_id))
+
+    items = plaid.transactions_for(access_token)
+    kept = next(t for t in items if t["transaction_id"] in before)
+    dropped = next(
+        t for t in items
+        if t["transaction_id"] in before and t is not kept
+    )
+
+    plaid.modify(access_token, [
+        {**kept, "amount": kept["amount"] + 1},
+        # moved to a category the UI does not show
+        {**dropped, "personal_finance_category": {"primary": "INCOME"}},
+    ])
+
+    after = ledger_of(sync(user_id, access_token))
+
+    assert after == expected_ledger(plaid, access_token)
+    assert after[kept["transaction_id"]].amount == round(kept["amount"] + 1, 2)
+    assert dropped["transaction_id"] not in after
+
+    # same position as before
+    order = [k for k in before if k != dropped["transaction_id"]]
+    assert list(after) == order
+
+
+def test_removed_rows_are_dropped(plaid, user_id):
+    access_token = link(user_id)
+    before = ledger_of(plaid_service.get_transaction_entry(user_id))
+
+    removed = list(before)[:3]
+    plaid.remove(access_token, removed)
+
+    after = ledger_of(sync(user_id, access_token))
+
+    assert after == expected_ledger(plaid, access_token)
+    assert list(after) == list(before)[3:]
+
+
+def test_no_changes_keeps_the_version(plaid, user_id):
+    access_token = link(user_id)
+    before = plaid_service.get_transaction_entry(user_id)
+
+    entry = sync(user_id, access_token)
+
+    assert entry.version == before.version
+    assert entry.cursor == before.cursor
+
+
+def test_restart_after_mutation_during_pagination(recording, user_id):
+    access_token = link(user_id)
+    plaid_service.get_transaction_entry(user_id)
+
+    recording.remove(access_token, [
+        recording.transactions_for(access_token)[0]["transaction_id"]
+    ])
+    recording.cursors.clear()
+    recording.fail_next = 1
+
+    entry = sync(user_id, access_token)
+
+    # retried from the cursor the ledger is current to
+    assert recording.cursors == ["200", "200"]
+    assert ledger_of(entry) == expected_ledger(recording, access_token)
+    assert entry.cursor == "201"
+
+
+def test_gives_up_after_max_restarts(recording, user_id):
+    access_token = link(user_id)
+    before = plaid_service.get_transaction_entry(user_id)
+    errors = plaid_service.cache_stats()["fetch_errors"]
+
+    recording.add(access_token, [
+        {**recording.transactions_for(access_token)[0],
+         "transaction_id": "late"},
+    ])
+    recording.fail_next = plaid_service.SYNC_MAX_RESTARTS
+
+    entry = sync(user_id, access_token)
+
+    # the cached copy is kept as it was
+    assert entry is before
+    assert "late" not in ledger_of(entry)
+    assert plaid_service.cache_stats()["fetch_errors"] == errors + 1
+
+
+def test_new_item_resets_the_cursor(recording, user_id):
+    link(user_id, "access-old")
+    plaid_service.get_transaction_entry(user_id)
+
+    access_token = link(user_id, "access-new")
+    assert store.get(user_id) is None
+
+    recording.cursors.clear()
+    entry = plaid_service.get_transaction_entry(user_id)
+
+    assert recording.cursors[0] is None
+    assert ledger_of(entry) == expected_ledger(recording, access_token)
@@ -0,0 +1,21 @@
+# backend/tests/test_synthetic.py
+
+import json
+
+import pandas as pd
+
+from engine.synthetic import MANIFEST_NAME, generate
+
+
+def test_parquet_directory_reads_as_one_dataset(tmp_path):
+    manifest = generate(
+        tmp_path, users=3, seed=1, years=0.25, end="2026-01-31",
+        workers=1, users_per_part=2,
+    )
+
+    frame = pd.read_parquet(tmp_path)
+
+    assert len(frame) == manifest["rows"]
+    assert frame["user_id"].nunique() == 3
+    assert len(manifest["parts"]) == 2
+    assert json.loads((tmp_path / MANIFEST_NAME).read_text()) == manifest
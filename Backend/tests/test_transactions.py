@@ -0,0 +1,140 @@
+# backend/tests/test_transactions.py
+#
+# Keyset pages of /api/transactions (JSON and NDJSON).
+
+import base64
+import json
+from datetime import date, timedelta
+
+import pytest
+
+import main
+import engine.session as session
+from engine.cleaning import clean_transaction
+from engine.plaid_service import WINDOW_DAYS
+
+SAME_DAY = 30
+
+
+@pytest.fixture
+def linked(plaid, bearer, user_id, monkeypatch):
+    """User with SAME_DAY expenses on one date; (headers, expected rows)."""
+
+    # the enhancer adds random rows; pages are checked without it
+    monkeypatch.setattr(
+        main, "enhance_transactions", lambda rows: [t.copy() for t in rows]
+    )
+
+    access_token = f"access-{user_id}"
+    session.save_access_token(access_token, user_id)
+
+    template = next(
+        t for t in plaid.transactions_for(access_token)
+        if t["personal_finance_category"]["primary"] == "FOOD_AND_DRINK"
+    )
+    day = date.today() - timedelta(days=3)
+    plaid.add(access_token, [
+        {**template, "transaction_id": f"same-{i:02d}", "date": day,
+         "amount": 10 + i}
+        for i in range(SAME_DAY)
+    ])
+
+    start = str(date.today() - timedelta(days=WINDOW_DAYS))
+    keyed = []
+    for t in plaid.transactions_for(access_token):
+        row = clean_transaction(t)
+        if row is not None and row.amount > 0 and row.date >= start:
+            keyed.append(((row.date, t["transaction_id"]), row))
+    keyed.sort(key=lambda item: item[0], reverse=True)
+
+    return bearer(user_id), [row_key(row) for _, row in keyed]
+
+
+def row_key(t):
+    return t["date"], t["receiver"], t["amount"]
+
+
+def walk(api, headers, limit, fmt="json"):
+    """Every row reached by following next_cursor, and the page count."""
+
+    rows, pages, cursor = [], 0, None
+
+    while True:
+        params = {"limit": limit, "format": fmt}
+        if cursor:
+            params["cursor"] = cursor
+
+        response = api.get("/api/transactions", params=params, headers=headers)
+        assert response.status_code == 200
+        pages += 1
+
+        if fmt == "ndjson":
+            lines = [json.loads(line) for line in response.text.splitlines()]
+            page, cursor = lines[:-1], lines[-1]["next_cursor"]
+        else:
+            body = response.json()
+            page, cursor = body["transactions"], body["next_cursor"]
+
+        assert len(page) <= limit
+        rows.extend(row_key(t) for t in page)
+
+        if cursor is None:
+            return rows, pages
+
+
+@pytest.mark.parametrize("fmt", ["json", "ndjson"])
+@pytest.mark.parametrize("limit", [1, 7, SAME_DAY, 1000])
+def test_pages_cover_every_row_once(api, linked, fmt, limit):
+    headers, expected = linked
+
+    rows, pages = walk(api, headers, limit, fmt)
+
+    # same order, no gaps or repeats, also inside the run of equal dates
+    assert rows == expected
+    assert pages == max(1, -(-len(expected) // limit))
+
+
+def test_ndjson_page_ends_with_cursor_line(api, linked):
+    headers, expected = linked
+
+    response = api.get(
+        "/api/transactions", params={"limit": 5, "format": "ndjson"},
+        headers=headers,
+    )
+    lines = [json.loads(line) for line in response.text.splitlines()]
+
+    assert len(lines) == 6
+    assert list(lines[-1]) == ["next_cursor"]
+    assert lines[-1]["next_cursor"]
+
+
+def test_ndjson_without_limit_streams_rows_only(api, linked):
+    headers, expected = linked
+
+    response = api.get(
+        "/api/transactions", params={"format": "ndjson"}, headers=headers
+    )
+    lines = [json.loads(line) for line in response.text.splitlines()]
+
+    assert [row_key(t) for t in lines] == expected
+
+
+def test_invalid_cursor_is_400(api, linked):
+    headers, _ = linked
+
+    response = api.get(
+        "/api/transactions", params={"cursor": "not-base64!"}, headers=headers
+    )
+
+    assert response.status_code == 400
+
+
+def test_cursor_with_bad_date_is_400(api, linked):
+    headers, _ = linked
+    cursor = base64.urlsafe_b64encode(b'["2024-13-45", "x"]').decode()
+
+    response = api.get(
+        "/api/transactions", params={"cursor": cursor}, headers=headers
+    )
+
+    assert response.status_code == 400
@@ -2,6 +2,8 @@
 
 import { useEffect, useState } from "react"
 
+import { apiFetch } from "@/lib/api"
+
 import { PageWrapper } from "@/components/dashboard/page-wrapper"
 import { SpendingIntelligence } from "@/components/dashboard/spending-intelligence"
 import { ChartCard } from "@/components/dashboard/chart-card"
@@ -72,7 +74,7 @@ export default function BehaviorPage() {
   useEffect(() => {
     const fetchBehavior = async () => {
       try {
-        const res = await fetch("http://127.0.0.1:5000/api/behavior")
+        const res = await apiFetch("/api/behavior")
         const json = await res.json()
 
         console.log("BEHAVIOR DATA:", json)
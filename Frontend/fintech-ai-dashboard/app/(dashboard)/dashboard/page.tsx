@@ -2,6 +2,8 @@
 
 import { useEffect, useState } from "react"
 
+import { apiFetch } from "@/lib/api"
+
 import { PageWrapper } from "@/components/dashboard/page-wrapper"
 import { RetirementScore } from "@/components/dashboard/retirement-score"
 import { WealthProjection } from "@/components/dashboard/wealth-projection"
@@ -16,7 +18,7 @@ export default function DashboardPage() {
   useEffect(() => {
     const fetchDashboard = async () => {
       try {
-        const res = await fetch("http://127.0.0.1:5000/api/dashboard")
+        const res = await apiFetch("/api/dashboard")
         const json = await res.json()
         setData(json)
       } catch (err) {
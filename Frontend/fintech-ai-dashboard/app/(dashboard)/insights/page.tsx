@@ -2,6 +2,8 @@
 
 import { useEffect, useState } from "react"
 
+import { apiFetch } from "@/lib/api"
+
 import { PageWrapper } from "@/components/dashboard/page-wrapper"
 import { InsightCard } from "@/components/dashboard/insight-card"
 
@@ -70,7 +72,7 @@ export default function InsightsPage() {
   useEffect(() => {
     const fetchInsights = async () => {
       try {
-        const res = await fetch("http://127.0.0.1:5000/api/insights")
+        const res = await apiFetch("/api/insights")
         const data: BackendInsightsResponse = await res.json()
 
         // 🔥 Convert backend format → frontend format
@@ -2,6 +2,8 @@
 
 import { useEffect, useState } from "react"
 
+import { apiFetch } from "@/lib/api"
+
 import { PageWrapper } from "@/components/dashboard/page-wrapper"
 import { MicroSavings } from "@/components/dashboard/micro-savings"
 import { ScoreCard } from "@/components/dashboard/score-card"
@@ -80,7 +82,7 @@ export default function MicroSavingsPage() {
   useEffect(() => {
     const fetchData = async () => {
       try {
-        const res = await fetch("http://127.0.0.1:5000/api/microsavings")
+        const res = await apiFetch("/api/microsavings")
         const json = await res.json()
         setData(json)
       } catch (err) {
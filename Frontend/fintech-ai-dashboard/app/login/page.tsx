@@ -3,6 +3,7 @@
 import { useEffect, useState } from "react"
 import { useRouter } from "next/navigation"
 import ParticleBackground from "@/components/ui/particle-background"
+import { apiFetch, saveSession } from "@/lib/api"
 
 export default function LoginPage() {
   const router = useRouter()
@@ -43,11 +44,12 @@ export default function LoginPage() {
       setLoading(true)
 
       // STEP 1 — get link token
-      const response = await fetch(
-        "http://127.0.0.1:5000/api/create_link_token"
-      )
+      const response = await apiFetch("/api/create_link_token")
       const data = await response.json()
 
+      // the backend identifies us by this session from now on
+      saveSession(data.session_token)
+
       // @ts-ignore
       const handler = window.Plaid.create({
         token: data.link_token,
@@ -56,8 +58,8 @@ export default function LoginPage() {
           console.log("Public token:", public_token)
 
           // STEP 2 — exchange token
-          await fetch(
-            "http://127.0.0.1:5000/api/exchange_public_token",
+          await apiFetch(
+            "/api/exchange_public_token",
             {
               method: "POST",
               headers: {
@@ -0,0 +1,21 @@
+const API_URL = "http://127.0.0.1:5000"
+
+const SESSION_KEY = "session_token"
+
+// session issued by /api/create_link_token, sent as a bearer token
+export function saveSession(token: string | undefined) {
+  if (token) {
+    localStorage.setItem(SESSION_KEY, token)
+  }
+}
+
+export function apiFetch(path: string, init: RequestInit = {}) {
+  const headers = new Headers(init.headers)
+
+  const token = localStorage.getItem(SESSION_KEY)
+  if (token) {
+    headers.set("Authorization", `Bearer ${token}`)
+  }
+
+  return fetch(`${API_URL}${path}`, { ...init, headers })
+}